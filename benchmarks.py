@@ -0,0 +1,747 @@
+# benchmarks.py
+"""
+Benchmarks del compilador (sin GUI).
+
+    python benchmarks.py lexico [--sentencias N] [--repeticiones R]
+    python benchmarks.py lexers [--sentencias N] [--repeticiones R]
+    python benchmarks.py incremental [--sentencias N] [--ediciones E]
+    python benchmarks.py gutter [--lineas N] [--segundos S]      (abre la GUI)
+    python benchmarks.py tablas [--sentencias N ...]             (abre la GUI)
+    python benchmarks.py arranque [--repeticiones R]
+    python benchmarks.py streaming [--sentencias N ...]
+    python benchmarks.py triplos [--sentencias N ...]
+    python benchmarks.py ciclos [--ciclos N ...]
+    python benchmarks.py optimizacion [--sentencias N] [archivos ...]
+    python benchmarks.py bucles [--vueltas N]
+    python benchmarks.py registros [--sentencias N] [archivos ...]
+    python benchmarks.py simulador [--vueltas N]
+    python benchmarks.py fases [--tamanos 1KB 1MB ...] [--guardar base.json] [--comparar base.json]
+
+Cada benchmark imprime una tabla corta con los tiempos medidos (el mejor
+de R repeticiones, en milisegundos).
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from cfg import es_temporal
+from compilador import compile_file, compile_source
+from contexto import CompilationContext
+from ensamblador import generar_ensamblador
+from generador import generar_programa, leer_tamano
+from icg import TriploTable
+from incremental import IncrementalCompiler
+from interprete import ejecutar
+from lexer import new_lexer, TokenStream
+from lexer_dfa import new_dfa_lexer, StreamLexer
+from mirilla_asm import optimizar_asm
+from optimizacion import optimizar_dependencias, optimizar_triplos
+from parser import new_parser
+from simulador import simular
+
+
+# ---------------------------
+# Utilidades
+# ---------------------------
+def programa_sintetico(sentencias: int) -> str:
+    """Programa válido de ~`sentencias` sentencias (declaraciones, asignaciones, for, if)."""
+    out = ["cat $1I;", "cats $2R;", "meow $3S;", "cat $4N;"]
+    i = 0
+    while len(out) < sentencias:
+        k = i % 4
+        if k == 0:
+            out.append(f"$1I = ($1I + {i}) * 3 - $4N % 7;")
+        elif k == 1:
+            out.append(f"$2R = $2R * 1.25 + $1I / 2;")
+        elif k == 2:
+            out.append(f'$3S = "cadena {i}"; /* comentario {i} */')
+        else:
+            out.append("for ($4N = 0; $4N < 10; $4N = $4N + 1;) {")
+            out.append("    if ($1I > $4N) { $1I = $1I - 1; } else { $1I = $1I + 2; }")
+            out.append("}")
+        i += 1
+    return "\n".join(out) + "\n"
+
+
+def _mejor(fn, repeticiones: int) -> float:
+    """Mejor tiempo (ms) de `repeticiones` ejecuciones de fn()."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor * 1000.0
+
+
+def _tabla(titulo, filas):
+    print(titulo)
+    ancho = max(len(f[0]) for f in filas)
+    for nombre, valor in filas:
+        print(f"  {nombre:<{ancho}}  {valor}")
+
+
+# ---------------------------
+# Lexeo: dos pasadas vs una pasada
+# ---------------------------
+def bench_lexico(sentencias: int, repeticiones: int):
+    codigo = programa_sintetico(sentencias)
+
+    def solo_lexer():
+        lx = new_lexer(CompilationContext())
+        lx.input(codigo)
+        for _ in lx:
+            pass
+
+    def dos_pasadas():
+        # Pipeline anterior: pasada para la tabla de lexemas + re-lexeo en yacc
+        ctx = CompilationContext()
+        lx = new_lexer(ctx)
+        lx.input(codigo)
+        for tok in lx:
+            ctx.lexeme_table.add_token(tok)
+        lx.lineno = 1
+        new_parser().parse(codigo, lexer=lx)
+
+    def una_pasada():
+        ctx = CompilationContext()
+        lx = new_lexer(ctx)
+        stream = TokenStream(lx, codigo)
+        new_parser().parse(lexer=lx, tokenfunc=stream.token)
+
+    t_lex = _mejor(solo_lexer, repeticiones)
+    t_dos = _mejor(dos_pasadas, repeticiones)
+    t_una = _mejor(una_pasada, repeticiones)
+    _tabla(f"lexico: {len(codigo) / 1024:.0f} KB, {sentencias} sentencias", [
+        ("solo lexer", f"{t_lex:9.1f} ms"),
+        ("dos pasadas (antes)", f"{t_dos:9.1f} ms"),
+        ("una pasada (TokenStream)", f"{t_una:9.1f} ms"),
+        ("ahorro", f"{t_dos - t_una:9.1f} ms ({(t_dos - t_una) / t_dos:.0%})"),
+    ])
+
+
+# ---------------------------
+# Throughput: lexer de PLY vs lexer escrito a mano (MB/s)
+# ---------------------------
+def bench_lexers(sentencias: int, repeticiones: int):
+    codigo = programa_sintetico(sentencias)
+    mb = len(codigo.encode("utf-8")) / 1e6
+
+    def tokens(fabrica):
+        lx = fabrica(CompilationContext())
+        lx.input(codigo)
+        return [(t.type, t.value, t.lineno, t.lexpos) for t in lx]
+
+    if tokens(new_lexer) != tokens(new_dfa_lexer):
+        raise SystemExit("los lexers producen tokens distintos")
+
+    filas = []
+    for nombre, fabrica in (("PLY (lexer.py)", new_lexer), ("a mano (lexer_dfa.py)", new_dfa_lexer)):
+        def lexear():
+            lx = fabrica(CompilationContext())
+            lx.input(codigo)
+            for _ in lx:
+                pass
+        ms = _mejor(lexear, repeticiones)
+        filas.append((nombre, f"{ms:9.1f} ms  {mb / (ms / 1000.0):6.2f} MB/s"))
+    _tabla(f"lexers: {mb:.2f} MB, {sentencias} sentencias (tokens idénticos)", filas)
+
+
+# ---------------------------
+# Re-análisis incremental vs completo (una "tecla" por edición)
+# ---------------------------
+def bench_incremental(sentencias: int, ediciones: int):
+    lineas = programa_sintetico(sentencias).splitlines(keepends=True)
+    inc = IncrementalCompiler()
+    inc.update("".join(lineas))
+
+    tiempos, reparseados = [], 0
+    paso = max(1, len(lineas) // (ediciones + 1))
+    for k in range(ediciones):
+        i = (k + 1) * paso
+        # Inserta un espacio al inicio de la línea (edición de un carácter)
+        lineas[i] = " " + lineas[i]
+        codigo = "".join(lineas)
+        t0 = time.perf_counter()
+        inc.update(codigo)
+        tiempos.append((time.perf_counter() - t0) * 1000.0)
+        reparseados += inc.last_reparsed
+
+    t_full = _mejor(lambda: compile_source(codigo), 1)
+    tiempos.sort()
+    _tabla(f"incremental: {len(lineas)} líneas, {ediciones} ediciones", [
+        ("completo (compile_source)", f"{t_full:9.1f} ms"),
+        ("incremental (mediana)", f"{tiempos[len(tiempos) // 2]:9.1f} ms"),
+        ("incremental (peor)", f"{tiempos[-1]:9.1f} ms"),
+        ("bloques re-parseados/edición", f"{reparseados / ediciones:9.1f}"),
+    ])
+
+
+# ---------------------------
+# GUI inactiva: gutter por sondeo (antes) vs por eventos
+# ---------------------------
+def bench_gutter(lineas: int, segundos: float):
+    import main as gui      # construye la ventana (sin mainloop)
+    root, editor, gutter = gui.root, gui.editor, gui.gutter
+    editor.insert("1.0", "".join(f"$1I = $1I + {i};\n" for i in range(lineas)))
+    editor.see(f"{lineas // 2}.0")
+    root.update()
+
+    def redibujo_completo():
+        # LineNumbers.redraw anterior: borra y recrea todos los items
+        gutter.delete("all")
+        i = editor.index("@0,0")
+        while True:
+            dline = editor.dlineinfo(i)
+            if dline is None:
+                break
+            gutter.create_text(44, dline[1], anchor="ne", text=i.split(".")[0],
+                               font=("Consolas", 10), fill="#111827")
+            i = editor.index(f"{i}+1line")
+
+    job = None
+
+    def sondeo():
+        nonlocal job
+        redibujo_completo()
+        job = root.after(120, sondeo)
+
+    def cpu_inactiva():
+        t0 = time.process_time()
+        root.after(int(segundos * 1000), root.quit)
+        root.mainloop()
+        return (time.process_time() - t0) / segundos
+
+    cpu_eventos = cpu_inactiva()
+    sondeo()
+    cpu_sondeo = cpu_inactiva()
+    root.after_cancel(job)
+    root.destroy()
+
+    _tabla(f"gutter: {lineas} líneas, {segundos:.0f} s sin interacción", [
+        ("sondeo cada 120 ms (antes)", f"{cpu_sondeo:6.1%} CPU"),
+        ("por eventos", f"{cpu_eventos:6.1%} CPU"),
+    ])
+
+
+# ---------------------------
+# GUI: pintado y scroll de la tabla de triplos según su tamaño
+# ---------------------------
+def bench_tablas(tamanos):
+    import main as gui      # construye la ventana (sin mainloop)
+    from tkinter import ttk
+    root = gui.root
+    gui.notebook.select(gui.tab_tri)
+    root.update()
+
+    filas = []
+    for sentencias in tamanos:
+        res = compile_source(programa_sintetico(sentencias))
+        n = len(res.triplos.triplos)
+
+        def insertar_todo():
+            # Poblado anterior: un tri_table.insert por fila
+            tv = ttk.Treeview(root, columns=gui.tri_headers_ui, show="headings")
+            for i, row in enumerate(gui._iter_truth_rows(res.triplos.to_rows())):
+                values, tags = gui._fila_triplo(i, row)
+                tv.insert('', 'end', values=values, tags=tags)
+            root.update()
+            tv.destroy()
+
+        def primera_pantalla():
+            gui._analizar_codigo("", res)
+            root.update()
+
+        def scroll():
+            for k in range(50):
+                gui.tri_rows.yview("moveto", k / 50)
+                root.update()
+
+        t_antes = _mejor(insertar_todo, 1)
+        t_virtual = _mejor(primera_pantalla, 3)
+        t_scroll = _mejor(scroll, 3) / 50
+        filas.append((f"{n} triplos", f"antes {t_antes:8.1f} ms | virtual {t_virtual:7.1f} ms | "
+                                      f"scroll {t_scroll:5.2f} ms/paso"))
+    root.destroy()
+    _tabla("tablas: poblar y desplazar la tabla de triplos", filas)
+
+
+# ---------------------------
+# Arranque en frío: import -> primera compilación (CLI y GUI)
+# ---------------------------
+_ARRANQUE_CLI = """
+import time; t0 = time.perf_counter()
+from compilador import compile_source
+compile_source("cat $1A; $1A = 1 + 2;")
+print((time.perf_counter() - t0) * 1000)
+"""
+
+_ARRANQUE_GUI = """
+import time; t0 = time.perf_counter()
+import main
+main.root.update()
+from compilador import compile_source
+main._analizar_codigo("", compile_source("cat $1A; $1A = 1 + 2;"))
+main.root.update()
+print((time.perf_counter() - t0) * 1000)
+main.root.destroy()
+"""
+
+
+def _arranque(script, carpeta, repeticiones):
+    """Mejor tiempo (ms) de `script` en un intérprete nuevo, o None si falla."""
+    mejor = None
+    for _ in range(repeticiones):
+        r = subprocess.run([sys.executable, "-c", script], cwd=carpeta,
+                           capture_output=True, text=True)
+        if r.returncode != 0:
+            return None
+        ms = float(r.stdout.split()[-1])
+        mejor = ms if mejor is None else min(mejor, ms)
+    return mejor
+
+
+def bench_arranque(repeticiones: int):
+    aqui = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as sin_tablas:
+        # Copia del código SIN lextab.py/parsetab.py: PLY arma las tablas al importar
+        for nombre in os.listdir(aqui):
+            if nombre.endswith(".py") and nombre not in ("lextab.py", "parsetab.py"):
+                shutil.copy(os.path.join(aqui, nombre), sin_tablas)
+
+        filas = []
+        for titulo, script in (("CLI (compile_source)", _ARRANQUE_CLI),
+                               ("GUI (ventana + Analizar)", _ARRANQUE_GUI)):
+            con = _arranque(script, aqui, repeticiones)
+            sin = _arranque(script, sin_tablas, repeticiones)
+            if con is None or sin is None:
+                filas.append((titulo, "no disponible (¿sin display?)"))
+            else:
+                filas.append((titulo, f"tablas precompiladas {con:7.1f} ms | sin tablas {sin:7.1f} ms"))
+    _tabla("arranque: import -> primera compilación", filas)
+
+
+# ---------------------------
+# Archivos grandes: texto completo vs lectura en streaming (memoria pico)
+# ---------------------------
+def _pico(fn) -> float:
+    """Pico de memoria (MB) de una ejecución de fn()."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def bench_streaming(tamanos):
+    filas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "programa.txt")
+        for sentencias in tamanos:
+            with open(ruta, "w", encoding="utf-8") as fh:
+                fh.write(programa_sintetico(sentencias))
+            mb = os.path.getsize(ruta) / 1e6
+
+            def lexeo_completo():
+                with open(ruta, encoding="utf-8") as fh:
+                    codigo = fh.read()
+                TokenStream(new_dfa_lexer(CompilationContext()), codigo)
+
+            def lexeo_streaming():
+                ctx = CompilationContext()
+                with open(ruta, encoding="utf-8") as fh:
+                    for tok in StreamLexer(ctx, fh):
+                        ctx.lexeme_table.add_token(tok)
+
+            def compilar_completo():
+                with open(ruta, encoding="utf-8") as fh:
+                    compile_source(fh.read(), lexico="dfa")
+
+            for nombre, fn in (("lexeo: read + TokenStream", lexeo_completo),
+                               ("lexeo: StreamLexer", lexeo_streaming),
+                               ("compilar: compile_source", compilar_completo),
+                               ("compilar: compile_file", lambda: compile_file(ruta))):
+                # El tiempo se mide aparte: tracemalloc lo infla varias veces
+                ms = _mejor(fn, 1)
+                pico = _pico(fn)
+                filas.append((f"{mb:6.2f} MB  {nombre}", f"{ms:9.1f} ms  pico {pico:8.1f} MB"))
+    _tabla("streaming: memoria pico (tracemalloc) y tiempo", filas)
+
+
+# ---------------------------
+# Memoria de la tabla de triplos: lista de objetos vs columnas
+# ---------------------------
+def bench_triplos(tamanos):
+    filas = []
+    for sentencias in tamanos:
+        tabla = compile_source(programa_sintetico(sentencias), lexico="dfa").triplos
+        n = len(tabla.triplos)
+
+        # Antes: una lista de objetos Triplo (los strings de operandos son
+        # los mismos objetos en ambos casos y no se cuentan)
+        lista = list(tabla.triplos)
+        objetos = _pico(lambda: list(tabla.triplos))
+        columnas = _pico(lambda: TriploTable.from_triplos(lista))
+        filas.append((f"{n:>8} triplos  lista de Triplo", f"{objetos * 1e6 / n:7.1f} bytes/triplo"))
+        filas.append((f"{n:>8} triplos  TriploTable (columnas)", f"{columnas * 1e6 / n:7.1f} bytes/triplo"
+                      f"  ({tabla.nbytes() / n:.0f} en arrays, {len(tabla._pool)} operandos distintos,"
+                      f" {tabla._t} temporales)"))
+    _tabla("triplos: memoria por triplo (tracemalloc)", filas)
+
+
+# ---------------------------
+# Acomodo de los for: tiempo por ciclo (secuenciales y anidados)
+# ---------------------------
+def programa_ciclos(ciclos: int, anidados: bool) -> str:
+    """`ciclos` for seguidos o anidados, cada uno con 8 asignaciones."""
+    cabecera = "for ($1I = 0; $1I < 10; $1I = $1I + 1;) {\n"
+    cuerpo = "$2S = $2S + $1I * 2 - 1;\n" * 8
+    decl = "cat $1I;\ncat $2S;\n"
+    if anidados:
+        return decl + cabecera * ciclos + cuerpo + "}\n" * ciclos
+    return decl + (cabecera + cuerpo + "}\n") * ciclos
+
+
+def bench_ciclos(tamanos):
+    filas = []
+    for anidados in (False, True):
+        for ciclos in tamanos:
+            codigo = programa_ciclos(ciclos, anidados)
+            ms = _mejor(lambda: compile_source(codigo, lexico="dfa"), 3)
+            tipo = "anidados" if anidados else "seguidos"
+            filas.append((f"{ciclos:>6} for {tipo}", f"{ms:9.1f} ms  {ms * 1000 / ciclos:7.1f} µs/ciclo"))
+    _tabla("ciclos: compilación completa (µs/ciclo constante = tiempo lineal)", filas)
+
+
+# ---------------------------
+# Optimización de triplos: cuánto se ahorra
+# ---------------------------
+def _corpus(archivos, sentencias):
+    """(nombre, código) de los programas de ejemplo del repo + uno sintético."""
+    aqui = os.path.dirname(os.path.abspath(__file__))
+    for ruta in archivos or [os.path.join(aqui, n) for n in ("test.txt", "test_correcciones.txt")]:
+        with open(ruta, encoding="utf-8") as fh:
+            yield os.path.basename(ruta), fh.read()
+    yield f"sintético ({sentencias})", programa_sintetico(sentencias)
+
+
+def bench_optimizacion(sentencias: int, archivos):
+    filas = []
+    tot = [0, 0, 0, 0]
+    for nombre, codigo in _corpus(archivos, sentencias):
+        antes = compile_source(codigo, lexico="dfa")
+        ms = _mejor(lambda: compile_source(codigo, lexico="dfa", optimizar=True), 1)
+        despues = compile_source(codigo, lexico="dfa", optimizar=True)
+        n = (len(antes.triplos.triplos), len(despues.triplos.triplos), len(antes.asm), len(despues.asm))
+        tot = [a + b for a, b in zip(tot, n)]
+        filas.append((nombre, _ahorro(*n) + f"  ({ms:.1f} ms con -O)"))
+    filas.append(("total", _ahorro(*tot)))
+    _tabla("optimizacion: triplos y líneas de ensamblador (sin -O -> con -O)", filas)
+
+    # Escala: técnica B sobre el texto (O(líneas × expresiones)) vs los
+    # pases sobre triplos (casi lineales)
+    filas = []
+    for n in (sentencias // 4, sentencias, sentencias * 4):
+        codigo = programa_sintetico(n)
+        tabla = compile_source(codigo, lexico="dfa").triplos
+        t_texto = _mejor(lambda: optimizar_dependencias(codigo), 1)
+        t_ir = _mejor(lambda: optimizar_triplos(tabla), 1)
+        filas.append((f"{n:>6} sentencias", f"técnica B (texto) {t_texto:9.1f} ms | triplos {t_ir:9.1f} ms"
+                      f"  ({t_ir * 1000 / len(tabla.triplos):.1f} µs/triplo)"))
+    _tabla("optimizacion: tiempo según el tamaño", filas)
+
+
+# ---------------------------
+# Ciclos: triplos ejecutados con y sin -O
+# ---------------------------
+def programa_bucles(vueltas: int) -> str:
+    """Dos for anidados con invariantes y MUL sobre las variables de control."""
+    return (
+        "cat $1I;\ncat $2J;\ncat $3S;\ncat $4K;\ncat $5B;\n"
+        "$4K = 7;\n"
+        f"for ($1I = 0; $1I < {vueltas}; $1I = $1I + 1;) {{\n"
+        "$5B = $1I * 8 + $4K * 3;\n"
+        f"for ($2J = 0; $2J < {vueltas}; $2J = $2J + 1;) {{\n"
+        "$3S = $3S + $5B + $2J * 4 - $4K * $4K;\n"
+        "}\n}\n"
+    )
+
+
+def bench_bucles(vueltas: int):
+    programas = [
+        (f"{vueltas}x{vueltas} anidados", programa_bucles(vueltas)),
+        ("50 for seguidos", programa_ciclos(50, anidados=False)),
+        ("3 for anidados", programa_ciclos(3, anidados=True)),
+    ]
+    filas = []
+    for nombre, codigo in programas:
+        antes = compile_source(codigo, lexico="dfa")
+        despues = compile_source(codigo, lexico="dfa", optimizar=True)
+        tipos = dict(antes.symbols)
+        ej0 = ejecutar(antes.triplos.triplos, tipos)
+        ej1 = ejecutar(despues.triplos.triplos, tipos)
+        e0, e1 = ej0.instrucciones, ej1.instrucciones
+        m0, m1 = ej0.por_op.get("MUL", 0), ej1.por_op.get("MUL", 0)
+        filas.append((nombre, f"triplos ejecutados {e0:>9} -> {e1:<9} (-{1 - e1 / max(e0, 1):.0%})"
+                              f"  MUL {m0:>7} -> {m1:<5}"
+                              f"  {ej0.segundos * 1000:7.1f} -> {ej1.segundos * 1000:.1f} ms"))
+    _tabla("bucles: triplos ejecutados sin -O -> con -O (invariantes, reducción de fuerza)", filas)
+
+
+# ---------------------------
+# Registros: accesos a memoria con y sin asignación
+# ---------------------------
+def _accesos(asm):
+    """(cargas, guardados) a memoria: operandos que son variables o tN."""
+    cargas = guardados = 0
+    for linea in asm:
+        if linea.startswith(";") or linea.endswith(":"):
+            continue
+        inst, _, resto = linea.partition(" ")
+        ops = [o.strip() for o in resto.split(",")] if resto else []
+        for k, o in enumerate(ops):
+            if o[:1] == "$" or es_temporal(o):
+                if k == 0 and inst == "MOV":
+                    guardados += 1
+                else:
+                    cargas += 1
+    return cargas, guardados
+
+
+def bench_registros(sentencias: int, archivos):
+    filas = []
+    tot = [0, 0, 0, 0, 0, 0]
+    for nombre, codigo in _corpus(archivos, sentencias):
+        triplos = compile_source(codigo, lexico="dfa", optimizar=True).triplos.triplos
+        sin = generar_ensamblador(triplos)
+        ms = _mejor(lambda: generar_ensamblador(triplos, registros=True), 1)
+        con = generar_ensamblador(triplos, registros=True)
+        (c0, g0), (c1, g1) = _accesos(sin), _accesos(con)
+        n = (c0, c1, g0, g1, len(sin), len(con))
+        tot = [a + b for a, b in zip(tot, n)]
+        filas.append((nombre, _accesos_fila(*n) + f"  ({ms:.1f} ms)"))
+    filas.append(("total", _accesos_fila(*tot)))
+    _tabla("registros: accesos a memoria con -O (temporales en memoria -> en registros)", filas)
+
+
+def _accesos_fila(c0, c1, g0, g1, a0, a1):
+    return (f"cargas {c0:>6} -> {c1:<6} (-{(c0 - c1) / max(c0, 1):.0%})"
+            f"  guardados {g0:>6} -> {g1:<6} (-{(g0 - g1) / max(g0, 1):.0%})"
+            f"  asm {a0:>6} -> {a1:<6}")
+
+
+# ---------------------------
+# Simulador: ciclos 8086 del ensamblador generado
+# ---------------------------
+def bench_simulador(vueltas: int):
+    programas = [
+        (f"{vueltas}x{vueltas} anidados", programa_bucles(vueltas)),
+        ("50 for seguidos", programa_ciclos(50, anidados=False)),
+        ("3 for anidados", programa_ciclos(3, anidados=True)),
+    ]
+    filas = []
+    for nombre, codigo in programas:
+        sin = compile_source(codigo, lexico="dfa")
+        con = compile_source(codigo, lexico="dfa", optimizar=True)
+        sin_mirilla = generar_ensamblador(con.triplos.triplos, registros=True)
+        ciclos = [simular(asm).ciclos for asm in (sin.asm, sin_mirilla, optimizar_asm(sin_mirilla)[0])]
+        c0 = ciclos[0]
+        filas.append((nombre, f"sin -O {c0:>9} | -O sin mirilla {ciclos[1]:>9} (-{1 - ciclos[1] / c0:.0%})"
+                              f" | -O {ciclos[2]:>9} (-{1 - ciclos[2] / c0:.0%})"))
+    _tabla("simulador: ciclos 8086 estimados del ensamblador", filas)
+
+
+# ---------------------------
+# Fases: tiempo por fase sobre programas generados, con línea base en JSON
+# ---------------------------
+def _tiempos_fases(codigo: str) -> dict:
+    """ms de cada fase de compile_source (-O, lexer dfa) en una compilación."""
+    marcas = []
+    compile_source(codigo, lexico="dfa", optimizar=True,
+                   progreso=lambda fase: marcas.append((fase, time.perf_counter())))
+    fin = time.perf_counter()
+    tiempos = {}
+    for (fase, t0), (_, t1) in zip(marcas, marcas[1:] + [(None, fin)]):
+        tiempos[fase] = (t1 - t0) * 1000.0
+    return tiempos
+
+
+def bench_fases(tamanos, repeticiones: int, generador: dict, guardar=None, comparar=None,
+                umbral: float = 0.2, minimo_ms: float = 1.0) -> int:
+    """
+    Mide cada fase (mejor de `repeticiones`) para cada tamaño. Con
+    `comparar`, marca REGRESIÓN cuando una fase tarda más de (1 + umbral)
+    veces lo de la línea base y la diferencia pasa de minimo_ms; devuelve
+    cuántas hubo.
+    """
+    resultados = {}
+    filas = []
+    for texto in tamanos:
+        codigo = generar_programa(bytes_objetivo=leer_tamano(texto), **generador)
+        kb = len(codigo.encode("utf-8")) / 1000.0
+        mejor = {}
+        for _ in range(repeticiones):
+            for fase, ms in _tiempos_fases(codigo).items():
+                mejor[fase] = min(mejor.get(fase, float("inf")), ms)
+        total = sum(mejor.values())
+        resultados[texto] = {"bytes": len(codigo.encode("utf-8")), "fases_ms": mejor,
+                             "total_ms": total, "us_por_kb": total * 1000.0 / kb}
+        detalle = "  ".join(f"{fase} {ms:9.1f}" for fase, ms in mejor.items())
+        filas.append((texto, f"{detalle}  | total {total:9.1f} ms ({total * 1000.0 / kb:.0f} us/KB)"))
+    _tabla("fases: ms por fase de compile_source (-O, lexer dfa)", filas)
+
+    base = {
+        "version": 1,
+        "python": platform.python_version(),
+        "generador": generador,
+        "repeticiones": repeticiones,
+        "resultados": resultados,
+    }
+    if guardar:
+        with open(guardar, "w", encoding="utf-8") as fh:
+            json.dump(base, fh, indent=2, ensure_ascii=False)
+        print(f"línea base guardada en {guardar}")
+
+    regresiones = 0
+    if comparar:
+        with open(comparar, encoding="utf-8") as fh:
+            anterior = json.load(fh)
+        if anterior.get("generador") != generador:
+            print("aviso: la línea base se generó con otros parámetros del generador")
+        filas = []
+        for texto, actual in resultados.items():
+            previo = anterior.get("resultados", {}).get(texto)
+            if previo is None:
+                continue
+            for fase, ms in actual["fases_ms"].items():
+                ms0 = previo["fases_ms"].get(fase)
+                if ms0 is None:
+                    continue
+                cambio = (ms - ms0) / max(ms0, 1e-9)
+                marca = ""
+                if ms > ms0 * (1 + umbral) and ms - ms0 > minimo_ms:
+                    marca = "  REGRESIÓN"
+                    regresiones += 1
+                filas.append((f"{texto} {fase}", f"{ms0:9.1f} -> {ms:9.1f} ms ({cambio:+.0%}){marca}"))
+        if filas:
+            _tabla(f"comparación con {comparar} (umbral +{umbral:.0%})", filas)
+        print(f"{regresiones} regresiones")
+    return regresiones
+
+
+def _ahorro(tri_antes, tri_despues, asm_antes, asm_despues):
+    return (f"triplos {tri_antes:>7} -> {tri_despues:<7} (-{1 - tri_despues / max(tri_antes, 1):.0%})"
+            f"  asm {asm_antes:>7} -> {asm_despues:<7} (-{1 - asm_despues / max(asm_antes, 1):.0%})")
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python benchmarks.py", description=__doc__.strip().splitlines()[0])
+    sub = ap.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("lexico", help="una pasada de lexeo vs dos pasadas")
+    p.add_argument("--sentencias", type=int, default=20000)
+    p.add_argument("--repeticiones", type=int, default=3)
+
+    p = sub.add_parser("lexers", help="MB/s del lexer de PLY vs el escrito a mano")
+    p.add_argument("--sentencias", type=int, default=20000)
+    p.add_argument("--repeticiones", type=int, default=3)
+
+    p = sub.add_parser("incremental", help="re-análisis incremental vs compilación completa")
+    p.add_argument("--sentencias", type=int, default=2000)
+    p.add_argument("--ediciones", type=int, default=50)
+
+    p = sub.add_parser("gutter", help="CPU con la GUI inactiva (números de línea)")
+    p.add_argument("--lineas", type=int, default=50000)
+    p.add_argument("--segundos", type=float, default=5.0)
+
+    p = sub.add_parser("tablas", help="pintado/scroll de la tabla de triplos (lista virtual)")
+    p.add_argument("--sentencias", type=int, nargs="+", default=[500, 5000, 20000])
+
+    p = sub.add_parser("arranque", help="tiempo de import a primera compilación (CLI y GUI)")
+    p.add_argument("--repeticiones", type=int, default=5)
+
+    p = sub.add_parser("streaming", help="memoria pico: archivo completo vs lectura por bloques")
+    p.add_argument("--sentencias", type=int, nargs="+", default=[2000, 20000, 50000])
+
+    p = sub.add_parser("triplos", help="bytes por triplo: lista de objetos vs columnas")
+    p.add_argument("--sentencias", type=int, nargs="+", default=[2000, 20000])
+
+    p = sub.add_parser("ciclos", help="tiempo de compilación de N for seguidos/anidados")
+    p.add_argument("--ciclos", type=int, nargs="+", default=[250, 500, 1000, 2000])
+
+    p = sub.add_parser("bucles", help="triplos ejecutados en ciclos sin -O y con -O")
+    p.add_argument("--vueltas", type=int, default=100)
+
+    p = sub.add_parser("simulador", help="ciclos 8086 del ensamblador sin -O y con -O")
+    p.add_argument("--vueltas", type=int, default=100)
+
+    p = sub.add_parser("optimizacion", help="triplos/asm ahorrados por -O sobre los ejemplos")
+    p.add_argument("--sentencias", type=int, default=2000)
+    p.add_argument("archivos", nargs="*", help="programas a medir (por defecto test.txt y test_correcciones.txt)")
+
+    p = sub.add_parser("registros", help="cargas/guardados en memoria sin y con registros")
+    p.add_argument("--sentencias", type=int, default=2000)
+    p.add_argument("archivos", nargs="*", help="programas a medir (por defecto test.txt y test_correcciones.txt)")
+
+    p = sub.add_parser("fases", help="ms por fase sobre programas generados (línea base JSON)")
+    p.add_argument("--tamanos", nargs="+", default=["1KB", "10KB", "100KB", "1MB"],
+                   help="tamaños de los programas (hasta 100MB; los grandes piden mucha memoria)")
+    p.add_argument("--repeticiones", type=int, default=3)
+    p.add_argument("--declaraciones", type=int, default=8)
+    p.add_argument("--profundidad", type=int, default=3, help="profundidad de las expresiones")
+    p.add_argument("--anidamiento", type=int, default=2, help="for/if anidados")
+    p.add_argument("--errores", type=float, default=0.0, help="densidad de errores (0..1)")
+    p.add_argument("--semilla", type=int, default=0)
+    p.add_argument("--guardar", help="escribe los tiempos como línea base JSON")
+    p.add_argument("--comparar", help="compara con una línea base JSON (sale con 1 si hay regresiones)")
+    p.add_argument("--umbral", type=float, default=0.2, help="aumento relativo que cuenta como regresión")
+    p.add_argument("--minimo-ms", type=float, default=1.0, help="ignora diferencias menores a esto")
+
+    args = ap.parse_args(argv)
+    if args.bench == "lexico":
+        bench_lexico(args.sentencias, args.repeticiones)
+    elif args.bench == "lexers":
+        bench_lexers(args.sentencias, args.repeticiones)
+    elif args.bench == "incremental":
+        bench_incremental(args.sentencias, args.ediciones)
+    elif args.bench == "gutter":
+        bench_gutter(args.lineas, args.segundos)
+    elif args.bench == "tablas":
+        bench_tablas(args.sentencias)
+    elif args.bench == "arranque":
+        bench_arranque(args.repeticiones)
+    elif args.bench == "streaming":
+        bench_streaming(args.sentencias)
+    elif args.bench == "triplos":
+        bench_triplos(args.sentencias)
+    elif args.bench == "ciclos":
+        bench_ciclos(args.ciclos)
+    elif args.bench == "optimizacion":
+        bench_optimizacion(args.sentencias, args.archivos)
+    elif args.bench == "bucles":
+        bench_bucles(args.vueltas)
+    elif args.bench == "simulador":
+        bench_simulador(args.vueltas)
+    elif args.bench == "registros":
+        bench_registros(args.sentencias, args.archivos)
+    elif args.bench == "fases":
+        generador = {"declaraciones": args.declaraciones, "profundidad": args.profundidad,
+                     "anidamiento": args.anidamiento, "densidad_errores": args.errores,
+                     "semilla": args.semilla}
+        if bench_fases(args.tamanos, args.repeticiones, generador, args.guardar, args.comparar,
+                       args.umbral, args.minimo_ms):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
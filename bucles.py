@@ -0,0 +1,336 @@
+# bucles.py
+"""
+Optimización de ciclos sobre los triplos (la usa optimizacion.optimizar_triplos).
+
+Los ciclos naturales salen de la forma que deja p_ciclo_for:
+
+    ... init ...                         <- pre-encabezado (bloque anterior)
+    LABEL L_for_beginN                   <- encabezado
+    cond -> t ; IF_FALSE_GOTO t -> L_for_endN
+    cuerpo ; incremento
+    GOTO L_for_beginN                    <- arista de regreso
+    LABEL L_for_endN
+
+El ciclo es el encabezado más los bloques desde los que se llega a la
+arista de regreso sin pasar por él. Se procesan del más interno al más
+externo: lo que se saca de un ciclo interno queda en su pre-encabezado,
+que es parte del externo, y puede volver a salir.
+
+  - Código invariante: ADD/SUB/MUL/NEG cuyos operandos no se escriben
+    dentro del ciclo se calculan una sola vez en el pre-encabezado, en un
+    temporal nuevo; en el ciclo queda una copia (:= tN -> x) que la
+    mirilla propaga. DIV y MOD no se sacan (en el 8086 pueden fallar y el
+    ciclo podría no ejecutarlas nunca) ni las comparaciones (su código
+    solo deja las banderas).
+
+  - Reducción de fuerza: si la condición es i < N (o i <= N) y la única
+    escritura de i en el ciclo es el incremento ADD i, c -> i al final,
+    MUL i, k -> x se cambia por un valor j = i * k que se calcula en el
+    pre-encabezado y al que se suma c * k después de cada incremento.
+    Como el código de MUL es MUL BL (AL * BL), solo se hace si i y k
+    caben en un byte en todo el cuerpo: i empieza en una constante >= 0,
+    N <= 256 (<= 255 con <=) y k en 0..255. j es la propia x cuando x es
+    una variable que solo escribe esa MUL y no está viva ni al entrar al
+    ciclo ni al salir (los valores finales de las variables cuentan como
+    vivos); si no, un temporal nuevo y x queda como copia.
+"""
+from typing import Optional
+
+from cfg import construir_cfg, destino, es_nombre, es_temporal, vivas
+from icg import Triplo
+
+_INVARIANTES = frozenset(("ADD", "SUB", "MUL", "NEG"))
+_SALTOS = frozenset(("GOTO", "IF_FALSE_GOTO", "HALT"))
+
+
+def _entero(valor) -> Optional[int]:
+    """Valor de un literal entero, o None."""
+    if valor and (valor.isdigit() or (valor[0] == "-" and valor[1:].isdigit())):
+        return int(valor)
+    return None
+
+
+def _es_encabezado(bloque) -> bool:
+    t = bloque.triplos[0]
+    return t.op == "LABEL" and str(t.arg1).startswith("L_for_begin")
+
+
+class Ciclo:
+    """
+    Un for: encabezado y bloque de regreso (ids de bloque), los bloques que
+    son suyos y no de un ciclo interno, los ciclos internos directos, el
+    ciclo que lo contiene y (al optimizarlo) cuántas veces se escribe cada
+    nombre en todo el ciclo.
+    """
+    __slots__ = ("encabezado", "regreso", "bloques", "internos", "padre",
+                 "profundidad", "escrituras")
+
+    def __init__(self, encabezado, regreso):
+        self.encabezado = encabezado
+        self.regreso = regreso
+        self.bloques = []
+        self.internos = []
+        self.padre = None
+        self.profundidad = 0
+        self.escrituras = None
+
+    def __repr__(self):
+        return f"<Ciclo B{self.encabezado}..B{self.regreso}: {len(self.bloques)} bloques propios>"
+
+
+def ciclos_naturales(bloques):
+    """
+    Ciclos de los for, del más interno al más externo. Cada ciclo interno
+    ya calculado se recorre como un solo nodo (de su encabezado se salta a
+    sus predecesores de fuera), así los anidados no se recorren de nuevo.
+    """
+    pares = [(h, b.id) for b in bloques for h in b.sucesores
+             if h <= b.id and _es_encabezado(bloques[h])]
+    pares.sort(key=lambda p: p[1] - p[0])
+
+    dueno = {}          # bloque -> encabezado del ciclo más externo ya armado que lo contiene
+    por_encabezado = {}
+
+    def raiz(x):
+        camino = []
+        while x in dueno and dueno[x] != x:
+            camino.append(x)
+            x = dueno[x]
+        for y in camino:
+            dueno[y] = x
+        return x
+
+    ciclos = []
+    for h, regreso in pares:
+        if h in por_encabezado:
+            continue                    # un solo regreso por for
+        ciclo = Ciclo(h, regreso)
+        visto = {h}
+        pila = [regreso]
+        while pila:
+            x = raiz(pila.pop())
+            if x in visto:
+                continue
+            visto.add(x)
+            interno = por_encabezado.get(x)
+            if interno is not None:
+                ciclo.internos.append(interno)
+                pila.extend(p for p in bloques[x].predecesores if raiz(p) != x)
+            else:
+                ciclo.bloques.append(x)
+                pila.extend(bloques[x].predecesores)
+        ciclo.bloques.append(h)
+        ciclo.bloques.sort()
+        for x in ciclo.bloques:
+            dueno[x] = h
+        for interno in ciclo.internos:
+            dueno[interno.encabezado] = h
+            interno.padre = ciclo
+        por_encabezado[h] = ciclo
+        ciclos.append(ciclo)
+    for ciclo in reversed(ciclos):
+        if ciclo.padre is not None:
+            ciclo.profundidad = ciclo.padre.profundidad + 1
+    return ciclos
+
+
+def _ciclo_de(ciclos):
+    """Función bloque -> ¿está dentro de este ciclo? (contando los internos)."""
+    propio = {b: c for c in ciclos for b in c.bloques}
+
+    def dentro(x, ciclo):
+        c = propio.get(x)
+        while c is not None and c.profundidad > ciclo.profundidad:
+            c = c.padre
+        return c is ciclo
+    return dentro
+
+
+def _pre_encabezado(bloques, ciclo, dentro):
+    """Bloque que cae al encabezado desde fuera del ciclo (o None si no hay uno solo)."""
+    h = ciclo.encabezado
+    pre = h - 1
+    if pre < 0 or dentro(pre, ciclo) or bloques[pre].triplos[-1].op in _SALTOS:
+        return None
+    if any(p != pre and not dentro(p, ciclo) for p in bloques[h].predecesores):
+        return None
+    return pre
+
+
+def _contar_escrituras(bloques, ciclo):
+    """ciclo.escrituras: las de sus bloques propios más las de los internos."""
+    escrituras = None
+    for interno in ciclo.internos:              # se reusa el dict más grande
+        if escrituras is None or len(interno.escrituras) > len(escrituras):
+            escrituras = interno.escrituras
+    escrituras = {} if escrituras is None else escrituras
+    for interno in ciclo.internos:
+        if interno.escrituras is not escrituras:
+            for x, n in interno.escrituras.items():
+                escrituras[x] = escrituras.get(x, 0) + n
+        interno.escrituras = None
+    for b in ciclo.bloques:
+        for t in bloques[b].triplos:
+            d = destino(t)
+            if d is not None:
+                escrituras[d] = escrituras.get(d, 0) + 1
+    ciclo.escrituras = escrituras
+
+
+class _Temporales:
+    """Nombres de temporales nuevos (después del mayor que ya exista)."""
+
+    def __init__(self, triplos):
+        n = 0
+        for t in triplos:
+            for x in (t.arg1, t.arg2, t.res):
+                if es_temporal(x):
+                    n = max(n, int(x[1:]))
+        self.n = n
+
+    def nuevo(self) -> str:
+        self.n += 1
+        return f"t{self.n}"
+
+
+def sacar_invariantes(bloques, ciclo, pre, temporales) -> int:
+    """
+    LICM de un ciclo (en el lugar). Solo se revisan sus bloques propios: en
+    los internos ya no queda nada invariante (lo que lo era ya está en sus
+    pre-encabezados, que son bloques propios de este). Devuelve cuántos
+    triplos salieron.
+    """
+    escrituras = ciclo.escrituras
+    sacados = []
+    for i in ciclo.bloques:
+        renombre = {}       # temporal del bloque -> temporal que salió del ciclo
+        for t in bloques[i].triplos:
+            if t.op in _INVARIANTES:
+                a1 = renombre.get(t.arg1, t.arg1)
+                a2 = renombre.get(t.arg2, t.arg2)
+                if a1 not in escrituras and (a2 is None or a2 not in escrituras):
+                    tn = temporales.nuevo()
+                    sacados.append(Triplo(t.idx, t.op, a1, a2, tn))
+                    t.op, t.arg1, t.arg2 = ":=", tn, None
+                    if es_temporal(t.res):
+                        renombre[t.res] = tn
+                        continue
+            d = destino(t)
+            if d is not None:
+                renombre.pop(d, None)
+    bloques[pre].triplos.extend(sacados)
+    return len(sacados)
+
+
+def reducir_fuerza(bloques, ciclo, pre, temporales, dentro, vivas_ent, bits, usadas) -> int:
+    """
+    Reducción de fuerza de MUL i, k en un ciclo (en el lugar). vivas_ent y
+    bits: liveness de cfg.vivas (máscara por bloque, nombre -> bit).
+    Devuelve cuántas MUL se reemplazaron.
+    """
+    h, regreso, escrituras = ciclo.encabezado, ciclo.regreso, ciclo.escrituras
+
+    # Condición del encabezado: LT/LTE i, N -> t ; IF_FALSE_GOTO t
+    enc = bloques[h].triplos
+    salto = enc[-1]
+    if salto.op != "IF_FALSE_GOTO":
+        return 0
+    comp = next((t for t in reversed(enc[:-1]) if destino(t) == salto.arg1), None)
+    if comp is None or comp.op not in ("LT", "LTE") or not es_nombre(comp.arg1):
+        return 0
+    i = comp.arg1
+    n = _entero(comp.arg2)
+    if n is None or n > (256 if comp.op == "LT" else 255):
+        return 0
+
+    # Única escritura de i en el ciclo: ADD i, c -> i en el bloque de regreso
+    if escrituras.get(i) != 1:
+        return 0
+    k_inc = next((k for k, t in enumerate(bloques[regreso].triplos) if destino(t) == i), None)
+    if k_inc is None:
+        return 0
+    t_inc = bloques[regreso].triplos[k_inc]
+    c = _entero(t_inc.arg2)
+    if t_inc.op != "ADD" or t_inc.arg1 != i or c is None or c <= 0:
+        return 0
+
+    # Valor inicial: última escritura de i en el pre-encabezado
+    ini = next((t for t in reversed(bloques[pre].triplos) if destino(t) == i), None)
+    if ini is None or ini.op != ":=" or _entero(ini.arg1) is None or _entero(ini.arg1) < 0:
+        return 0
+
+    # Nombres vivos al entrar o al salir del ciclo (sin break, solo se sale
+    # desde los bloques propios)
+    vivo = vivas_ent[h]
+    for b in ciclo.bloques:
+        for s in bloques[b].sucesores:
+            if not dentro(s, ciclo):
+                vivo |= vivas_ent[s]
+
+    valores = {}            # k -> j (nombre que vale i * k)
+    reducidas = 0
+    for b in ciclo.bloques:
+        if b == h:
+            continue
+        triplos = bloques[b].triplos
+        quitar = False
+        for pos, t in enumerate(triplos):
+            if b == regreso and pos >= k_inc:
+                break
+            if t.op != "MUL":
+                continue
+            if t.arg1 == i:
+                k = _entero(t.arg2)
+            elif t.arg2 == i:
+                k = _entero(t.arg1)
+            else:
+                continue
+            if k is None or not 0 <= k <= 0xFF:
+                continue
+            x = t.res
+            propia = (x[0] == "$" and x not in usadas and k not in valores
+                      and escrituras.get(x) == 1 and not vivo & bits.get(x, 0))
+            if propia:
+                usadas.add(x)
+                valores[k] = x
+                triplos[pos] = None     # x se mantiene al día sola
+                quitar = True
+            else:
+                j = valores.get(k)
+                if j is None:
+                    j = valores[k] = temporales.nuevo()
+                t.op, t.arg1, t.arg2 = ":=", j, None
+            reducidas += 1
+        if quitar:
+            bloques[b].triplos = [t for t in triplos if t is not None]
+
+    if valores:
+        for k, j in valores.items():
+            bloques[pre].triplos.append(Triplo(t_inc.idx, "MUL", i, str(k), j))
+            escrituras[j] = escrituras.get(j, 0) + 1
+        pasos = [Triplo(t_inc.idx, "ADD", j, str(c * k), j) for k, j in valores.items()]
+        regreso_t = bloques[regreso].triplos
+        k_inc = next(k for k, t in enumerate(regreso_t) if t is t_inc)
+        regreso_t[k_inc + 1:k_inc + 1] = pasos
+    return reducidas
+
+
+def optimizar_ciclos(triplos):
+    """LICM y reducción de fuerza en todos los for (lista nueva)."""
+    bloques = construir_cfg(triplos)
+    ciclos = ciclos_naturales(bloques)
+    if not ciclos:
+        return triplos
+    dentro = _ciclo_de(ciclos)
+    temporales = _Temporales(triplos)
+    vivas_ent, _, nombres = vivas(bloques, al_terminar=True)
+    bits = {x: 1 << k for k, x in enumerate(nombres)}
+    usadas = set()
+    for ciclo in ciclos:
+        _contar_escrituras(bloques, ciclo)
+        pre = _pre_encabezado(bloques, ciclo, dentro)
+        if pre is None:
+            continue
+        sacar_invariantes(bloques, ciclo, pre, temporales)
+        reducir_fuerza(bloques, ciclo, pre, temporales, dentro, vivas_ent, bits, usadas)
+    return [t for b in bloques for t in b.triplos]
@@ -0,0 +1,290 @@
+# cfg.py
+"""
+Grafo de flujo de control (CFG) sobre los triplos y análisis de flujo de
+datos.
+
+    bloques = construir_cfg(triplos)
+    for b in bloques:
+        b.triplos, b.sucesores, b.predecesores   # índices de bloques
+
+Un bloque básico empieza en un LABEL (o después de un salto) y termina en
+GOTO, IF_FALSE_GOTO o HALT. El bloque 0 es la entrada.
+
+Flujo de datos: resolver() es un worklist genérico (hacia adelante o hacia
+atrás, unión o intersección) sobre conjuntos representados como enteros
+(bit k = elemento k del universo), así unir/intersecar/restar un conjunto
+entero es una sola operación. Encima de él:
+
+    entrada, salida, nombres = vivas(bloques)            # liveness
+    entrada, salida, defs = definiciones_que_llegan(bloques)
+    elementos(entrada[i], nombres)                       # máscara -> lista
+
+a_dot(bloques) exporta el grafo en formato DOT (Graphviz):
+
+    python -m compilador programa.txt --cfg programa.dot
+    dot -Tpng programa.dot -o programa.png
+"""
+from typing import List
+
+_FIN_DE_BLOQUE = frozenset(("GOTO", "IF_FALSE_GOTO", "HALT"))
+
+# Operaciones sin efectos: solo escriben res a partir de arg1/arg2
+PURAS = frozenset((":=", "ADD", "SUB", "MUL", "DIV", "MOD", "NEG",
+                   "GT", "GTE", "LT", "LTE", "EQ", "NEQ"))
+
+
+def es_temporal(valor) -> bool:
+    """True para los temporales del parser (t1, t2, ...)."""
+    return bool(valor) and valor[0] == "t" and valor[1:].isdigit()
+
+
+def es_nombre(valor) -> bool:
+    """True para variables ($1A) y temporales; False para literales."""
+    return bool(valor) and (valor[0] == "$" or es_temporal(valor))
+
+
+def lecturas(t):
+    """Operandos que lee el triplo (las etiquetas no cuentan)."""
+    op = t.op
+    if op in PURAS:
+        return (t.arg1, t.arg2) if t.arg2 is not None else (t.arg1,)
+    if op == "IF_FALSE_GOTO" or op == "PRINT":
+        return (t.arg1,)
+    return ()
+
+
+def destino(t):
+    """Operando que escribe el triplo, o None."""
+    if t.op in PURAS or t.op == "READ":
+        return t.res
+    return None
+
+
+class Bloque:
+    __slots__ = ("id", "triplos", "sucesores", "predecesores")
+
+    def __init__(self, id_, triplos):
+        self.id = id_
+        self.triplos = triplos
+        self.sucesores: List[int] = []
+        self.predecesores: List[int] = []
+
+    def __repr__(self):
+        return f"<Bloque B{self.id}: {len(self.triplos)} triplos -> {self.sucesores}>"
+
+
+def bloques_basicos(triplos):
+    """Parte la lista de triplos en bloques básicos (listas)."""
+    bloques, actual = [], []
+    for t in triplos:
+        if t.op == "LABEL" and actual:
+            bloques.append(actual)
+            actual = []
+        actual.append(t)
+        if t.op in _FIN_DE_BLOQUE:
+            bloques.append(actual)
+            actual = []
+    if actual:
+        bloques.append(actual)
+    return bloques
+
+
+def construir_cfg(triplos) -> List[Bloque]:
+    """Bloques básicos con sus aristas (saltos y caída al siguiente bloque)."""
+    bloques = [Bloque(i, ts) for i, ts in enumerate(bloques_basicos(triplos))]
+    etiquetas = {b.triplos[0].arg1: b.id for b in bloques if b.triplos[0].op == "LABEL"}
+
+    for b in bloques:
+        ultimo = b.triplos[-1]
+        op = ultimo.op
+        if op == "GOTO":
+            destinos = [etiquetas.get(ultimo.arg1)]
+        elif op == "IF_FALSE_GOTO":
+            destinos = [b.id + 1, etiquetas.get(ultimo.res)]
+        elif op == "HALT":
+            destinos = []
+        else:
+            destinos = [b.id + 1]
+        for d in destinos:
+            if d is not None and d < len(bloques) and d not in b.sucesores:
+                b.sucesores.append(d)
+                bloques[d].predecesores.append(b.id)
+    return bloques
+
+
+# ---------------------------------------------------------------------------
+# Flujo de datos
+# ---------------------------------------------------------------------------
+def resolver(bloques, gen, kill, adelante=True, interseccion=False, todos=0, frontera=0):
+    """
+    Punto fijo de  sal[b] = gen[b] | (ent[b] & ~kill[b])  con
+    ent[b] = unión (o intersección) de sal[p] de los vecinos p (predecesores
+    si adelante, sucesores si no). Los bloques sin vecinos (la entrada, o
+    las salidas hacia atrás) reciben `frontera`. `todos` es el universo
+    completo: valor inicial cuando se interseca.
+
+    Devuelve (entrada, salida) en el sentido del programa: hacia atrás,
+    entrada[b] es lo que vale al inicio del bloque.
+    """
+    n = len(bloques)
+    if adelante:
+        vecinos = [b.predecesores for b in bloques]
+        avisar = [b.sucesores for b in bloques]
+        orden = range(n - 1, -1, -1)        # se saca del final: 0, 1, 2...
+    else:
+        vecinos = [b.sucesores for b in bloques]
+        avisar = [b.predecesores for b in bloques]
+        orden = range(n)                    # n-1, n-2, ...
+
+    ent = [frontera] * n
+    sal = [todos if interseccion else 0] * n
+    pendientes = list(orden)
+    en_cola = [True] * n
+    while pendientes:
+        i = pendientes.pop()
+        en_cola[i] = False
+        vs = vecinos[i]
+        if not vs or (adelante and i == 0):
+            e = frontera
+        elif interseccion:
+            e = todos
+            for v in vs:
+                e &= sal[v]
+        else:
+            e = 0
+            for v in vs:
+                e |= sal[v]
+        ent[i] = e
+        nueva = gen[i] | (e & ~kill[i])
+        if nueva != sal[i]:
+            sal[i] = nueva
+            for s in avisar[i]:
+                if not en_cola[s]:
+                    en_cola[s] = True
+                    pendientes.append(s)
+    return (ent, sal) if adelante else (sal, ent)
+
+
+def elementos(mascara, universo):
+    """Elementos del universo cuyos bits están en la máscara."""
+    res = []
+    while mascara:
+        bajo = mascara & -mascara           # bit encendido más bajo
+        res.append(universo[bajo.bit_length() - 1])
+        mascara ^= bajo
+    return res
+
+
+def vivas(bloques, al_terminar=False):
+    """
+    Liveness: nombres (variables y temporales) que se leen más adelante
+    antes de volver a escribirse. Devuelve (entrada, salida, nombres).
+
+    al_terminar=True: las variables siguen vivas al terminar el programa
+    (su valor final cuenta como resultado), no solo si se vuelven a leer.
+    """
+    bit = {}
+    nombres = []
+
+    def b_(x):
+        k = bit.get(x)
+        if k is None:
+            k = bit[x] = 1 << len(nombres)
+            nombres.append(x)
+        return k
+
+    gen, kill = [], []
+    for bloque in bloques:
+        usa = define = 0
+        for t in bloque.triplos:
+            for x in lecturas(t):
+                if es_nombre(x):
+                    k = b_(x)
+                    if not define & k:
+                        usa |= k
+            d = destino(t)
+            if d is not None:
+                define |= b_(d)
+        gen.append(usa)
+        kill.append(define)
+    final = 0
+    if al_terminar:
+        for k, x in enumerate(nombres):
+            if x[0] == "$":
+                final |= 1 << k
+    entrada, salida = resolver(bloques, gen, kill, adelante=False, frontera=final)
+    return entrada, salida, nombres
+
+
+def definiciones_que_llegan(bloques):
+    """
+    Reaching definitions: triplos que escriben un nombre y cuyo valor puede
+    llegar a cada punto sin otra escritura de por medio. Devuelve (entrada,
+    salida, definiciones); el bit k es definiciones[k] (un Triplo).
+    """
+    definiciones = []
+    por_nombre = {}         # nombre -> máscara de sus definiciones
+    por_bloque = []
+    for bloque in bloques:
+        propias = []
+        for t in bloque.triplos:
+            d = destino(t)
+            if d is not None:
+                k = 1 << len(definiciones)
+                definiciones.append(t)
+                por_nombre[d] = por_nombre.get(d, 0) | k
+                propias.append((d, k))
+        por_bloque.append(propias)
+
+    gen, kill = [], []
+    for propias in por_bloque:
+        g = k = 0
+        for d, bit in propias:
+            todas = por_nombre[d]
+            g = (g & ~todas) | bit
+            k |= todas
+        gen.append(g)
+        kill.append(k)
+    entrada, salida = resolver(bloques, gen, kill)
+    return entrada, salida, definiciones
+
+
+# ---------------------------------------------------------------------------
+# Exportar a DOT
+# ---------------------------------------------------------------------------
+def _texto(t) -> str:
+    partes = [a for a in (t.arg1, t.arg2) if a is not None]
+    texto = f"{t.idx}: {t.op} {', '.join(partes)}"
+    if t.res is not None and t.res != "-" and t.op != "HALT":
+        texto += f" -> {t.res}"
+    return texto
+
+
+def _escapar(s: str) -> str:
+    return s.replace("\\", "\\\\").replace('"', '\\"').replace("{", "\\{").replace("}", "\\}")
+
+
+def a_dot(bloques, nombre="cfg", vivas_entrada=None) -> str:
+    """
+    El CFG en formato DOT: un nodo por bloque con sus triplos y las aristas
+    de salto (las de IF_FALSE_GOTO marcadas V/F). Con vivas_entrada (lista
+    de listas de nombres por bloque) también se muestran las vivas.
+    """
+    lineas = [f"digraph {nombre} {{", '  node [shape=box, fontname="monospace"];']
+    for b in bloques:
+        filas = [f"B{b.id}"]
+        if vivas_entrada is not None:
+            filas.append("vivas: " + " ".join(vivas_entrada[b.id]))
+        filas.extend(_texto(t) for t in b.triplos)
+        etiqueta = "".join(_escapar(f) + "\\l" for f in filas)
+        lineas.append(f'  B{b.id} [label="{etiqueta}"];')
+    for b in bloques:
+        condicional = b.triplos[-1].op == "IF_FALSE_GOTO"
+        for s in b.sucesores:
+            if condicional:
+                marca = "V" if s == b.id + 1 else "F"
+                lineas.append(f'  B{b.id} -> B{s} [label="{marca}"];')
+            else:
+                lineas.append(f"  B{b.id} -> B{s};")
+    lineas.append("}")
+    return "\n".join(lineas)
@@ -0,0 +1,370 @@
+# compilador.py
+"""
+API de compilación sin interfaz gráfica.
+
+Ejecuta el mismo pipeline que el botón "Analizar" de la GUI (léxico,
+sintáctico/semántico, triplos y ensamblador) pero sin importar tkinter,
+de modo que puede usarse como librería o desde la línea de comandos:
+
+    python -m compilador programa.txt
+    python -m compilador programa.txt --formato json
+    python -m compilador enorme.txt --streaming
+    python -m compilador programa.txt -O          # con triplos optimizados
+    python -m compilador programa.txt --cfg g.dot # además escribe el CFG (DOT)
+    python -m compilador programa.txt --ejecutar  # además ejecuta los triplos
+    python -m compilador programa.txt --simular   # además simula el ensamblador (ciclos 8086)
+    type programa.txt | python -m compilador -
+"""
+import sys
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from lexer import new_lexer, TokenStream
+from lexer_dfa import new_dfa_lexer, StreamLexer
+from parser import new_parser
+from contexto import CompilationContext
+from icg import TriploTable
+from ensamblador import generar_ensamblador
+
+if TYPE_CHECKING:
+    from mirilla_asm import ReporteMirilla
+
+
+# ---------------------------
+# Resultado de una compilación
+# ---------------------------
+@dataclass
+class CompilationResult:
+    lexemes: List[Tuple[str, str]] = field(default_factory=list)             # (Lexema, Tipo)
+    symbols: List[Tuple[str, str]] = field(default_factory=list)             # (Lexema, Tipo)
+    errors: List[Tuple[str, str, int, str]] = field(default_factory=list)    # (Token, Lexema, Renglón, Descripción)
+    triplos: TriploTable = field(default_factory=TriploTable)
+    asm: List[str] = field(default_factory=list)
+    mirilla: Optional["ReporteMirilla"] = None   # solo con optimizar=True
+
+    @property
+    def ok(self) -> bool:
+        """True si la compilación no registró errores."""
+        return not self.errors
+
+    def to_dict(self):
+        return {
+            "lexemes": [list(r) for r in self.lexemes],
+            "symbols": [list(r) for r in self.symbols],
+            "errors": [list(r) for r in self.errors],
+            "triplos": list(self.triplos.to_rows()),
+            "asm": list(self.asm),
+            "mirilla": None if self.mirilla is None else {
+                "antes": self.mirilla.antes,
+                "despues": self.mirilla.despues,
+                "reglas": dict(self.mirilla.reglas),
+            },
+        }
+
+
+# ---------------------------
+# Pipeline
+# ---------------------------
+# Fases que se reportan a `progreso` (en orden; "optimizacion" solo si se pide)
+FASES = ("lexico", "sintactico", "triplos", "optimizacion", "ensamblador")
+
+# Lexers disponibles: el de PLY (lexer.py) y el escrito a mano (lexer_dfa.py)
+LEXICOS = {"ply": new_lexer, "dfa": new_dfa_lexer}
+
+# Cada cuántos tokens el parser revisa si se pidió cancelar
+_CANCEL_CADA = 1024
+
+
+class CompilationCancelled(Exception):
+    """Se pidió cancelar la compilación (ver `cancelar` en compile_source)."""
+
+
+def _revisar_cancelacion(cancelar):
+    if cancelar is not None and cancelar.is_set():
+        raise CompilationCancelled()
+
+
+def _token_cancelable(tokenfunc, cancelar):
+    """tokenfunc para yacc que aborta el parseo si `cancelar` se activa."""
+    n = 0
+
+    def token():
+        nonlocal n
+        n += 1
+        if n % _CANCEL_CADA == 0:
+            _revisar_cancelacion(cancelar)
+        return tokenfunc()
+    return token
+
+
+def compile_source(codigo: str, ctx: CompilationContext = None,
+                   progreso=None, cancelar=None, lexico: str = "ply",
+                   optimizar: bool = False) -> CompilationResult:
+    """
+    Compila un programa completo y devuelve un CompilationResult con:
+    lexemas, símbolos, errores, triplos y ensamblador.
+
+    Cada llamada usa su propio CompilationContext (y su propio lexer/parser),
+    por lo que es seguro compilar varios programas a la vez desde hilos.
+
+    progreso: callable(fase) que se llama al iniciar cada fase de FASES.
+    cancelar: threading.Event; si se activa, la compilación se interrumpe
+              (entre fases y durante el parseo) con CompilationCancelled.
+    lexico:   "ply" (por defecto) o "dfa"; ambos producen los mismos tokens.
+    optimizar: si es True, los triplos pasan por optimizacion.optimizar_triplos
+              antes de generar el ensamblador, este guarda los temporales
+              en registros (registros.py) y pasa por la mirilla de
+              mirilla_asm.py (el reporte queda en CompilationResult.mirilla).
+    """
+    fase = _fases(progreso, cancelar)
+    if ctx is None:
+        ctx = CompilationContext()
+    else:
+        ctx.clear()
+    lex_inst = LEXICOS[lexico](ctx)
+    parser = new_parser(ctx)
+
+    # PASO 1: tokenizar una sola vez (llena la tabla de lexemas)
+    fase("lexico")
+    revisar = partial(_revisar_cancelacion, cancelar) if cancelar is not None else None
+    stream = TokenStream(lex_inst, codigo, revisar)
+
+    # PASO 2: parsear sobre los mismos tokens (símbolos/errores + triplos,
+    # que se emiten durante el parseo)
+    fase("sintactico")
+    tokenfunc = stream.token
+    if cancelar is not None:
+        tokenfunc = _token_cancelable(tokenfunc, cancelar)
+    parser.parse(lexer=lex_inst, tokenfunc=tokenfunc)
+
+    return _terminar(ctx, fase, optimizar)
+
+
+def compile_file(ruta: str, ctx: CompilationContext = None, progreso=None,
+                 cancelar=None, encoding: str = "utf-8",
+                 optimizar: bool = False) -> CompilationResult:
+    """
+    Como compile_source(open(ruta).read()) pero sin cargar el archivo ni la
+    lista de tokens en memoria: el archivo se lee por bloques (StreamLexer)
+    y los tokens llegan al parser a medida que se reconocen.
+
+    Para conservar la numeración ES# (léxicos primero, luego semánticos) se
+    lee el archivo dos veces: la 1ª pasada solo lexea (tabla de lexemas y
+    errores léxicos) y la 2ª vuelve a lexear alimentando al parser.
+    """
+    fase = _fases(progreso, cancelar)
+    if ctx is None:
+        ctx = CompilationContext()
+    else:
+        ctx.clear()
+
+    # PASO 1: lexeo en streaming (tabla de lexemas + errores léxicos)
+    fase("lexico")
+    lexeme_table = ctx.lexeme_table
+    with open(ruta, encoding=encoding) as fh:
+        for n, tok in enumerate(StreamLexer(ctx, fh), 1):
+            lexeme_table.add_token(tok)
+            if n % _CANCEL_CADA == 0:
+                _revisar_cancelacion(cancelar)
+
+    # PASO 2: parseo sobre una 2ª lectura (sus errores léxicos ya se
+    # registraron: van a un contexto descartable)
+    fase("sintactico")
+    with open(ruta, encoding=encoding) as fh:
+        tokenfunc = StreamLexer(CompilationContext(), fh).token
+        if cancelar is not None:
+            tokenfunc = _token_cancelable(tokenfunc, cancelar)
+        # El parser toma el contexto de p.lexer.ctx
+        new_parser(ctx).parse(lexer=new_dfa_lexer(ctx), tokenfunc=tokenfunc)
+
+    return _terminar(ctx, fase, optimizar)
+
+
+def _fases(progreso, cancelar):
+    """fase(nombre): revisa la cancelación y reporta el inicio de la fase."""
+    def fase(nombre):
+        _revisar_cancelacion(cancelar)
+        if progreso is not None:
+            progreso(nombre)
+    return fase
+
+
+def _terminar(ctx, fase, optimizar=False) -> CompilationResult:
+    """Pasos comunes después del parseo: tipos de IDs, optimización y ensamblador."""
+    # PASO 3: completar tipo de IDs en la tabla de lexemas
+    fase("triplos")
+    for lexema, tipo in ctx.symbol_table.rows():
+        ctx.lexeme_table.set_type_if_id(lexema, tipo)
+
+    # PASO 3b (opcional): optimización sobre los triplos
+    triplos = ctx.trip
+    if optimizar:
+        fase("optimizacion")
+        from optimizacion import optimizar_triplos
+        triplos = optimizar_triplos(triplos, ctx.symbol_table.symbols)
+
+    # PASO 4: ensamblador desde los triplos (con -O, temporales en registros
+    # y mirilla sobre las instrucciones)
+    fase("ensamblador")
+    asm = generar_ensamblador(triplos.triplos, registros=optimizar)
+    mirilla = None
+    if optimizar:
+        from mirilla_asm import optimizar_asm
+        asm, mirilla = optimizar_asm(asm)
+
+    return CompilationResult(
+        lexemes=ctx.lexeme_table.rows(),
+        symbols=ctx.symbol_table.rows(),
+        errors=ctx.error_table.rows(),
+        triplos=triplos,
+        asm=asm,
+        mirilla=mirilla,
+    )
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def _formato_texto(res: CompilationResult) -> str:
+    out = ["== Lexemas =="]
+    out += [f"{lex}\t{tipo}" for lex, tipo in res.lexemes]
+    out.append("")
+    out.append("== Errores ==")
+    if res.errors:
+        out += [f"{tok}\t{lex}\t{ren}\t{desc}" for tok, lex, ren, desc in res.errors]
+    else:
+        out.append("(sin errores)")
+    out.append("")
+    out.append("== Triplos ==")
+    out.append(res.triplos.pretty())
+    out.append("")
+    out.append("== Ensamblador ==")
+    out += res.asm
+    if res.mirilla is not None:
+        out.append("")
+        out.append("== Mirilla (ensamblador) ==")
+        out.append(str(res.mirilla))
+    return "\n".join(out)
+
+
+def _formato_ejecucion(ej) -> str:
+    if isinstance(ej, Exception):
+        return f"== Ejecución ==\nerror: {ej}"
+    out = ["== Ejecución =="]
+    out += [f"{nombre}\t{valor!r}" for nombre, valor in ej.variables.items()]
+    out += [f"PRINT\t{valor!r}" for valor in ej.salida]
+    ops = ", ".join(f"{op} {n}" for op, n in sorted(ej.por_op.items(), key=lambda kv: -kv[1]))
+    out.append(f"{ej.instrucciones} triplos ejecutados en {ej.segundos * 1000:.2f} ms ({ops})")
+    return "\n".join(out)
+
+
+def _formato_simulacion(sim) -> str:
+    if isinstance(sim, Exception):
+        return f"== Simulación 8086 ==\nno se puede simular: {sim}"
+    out = ["== Simulación 8086 =="]
+    out += [f"{nombre}\t{valor}" for nombre, valor in sim.variables.items()]
+    ins = ", ".join(f"{i} {n}" for i, n in sorted(sim.por_instruccion.items(), key=lambda kv: -kv[1]))
+    out.append(f"{sim.ciclos} ciclos, {sim.instrucciones} instrucciones ({ins})")
+    return "\n".join(out)
+
+
+def main(argv=None) -> int:
+    import argparse
+    import json
+
+    ap = argparse.ArgumentParser(
+        prog="python -m compilador",
+        description="Compila un programa (cat/cats/meow, for, if) sin abrir la GUI.",
+    )
+    ap.add_argument("archivo", help="ruta del programa fuente ('-' para leer de stdin)")
+    ap.add_argument("--formato", choices=("texto", "json"), default="texto",
+                    help="formato de salida (por defecto: texto)")
+    ap.add_argument("-o", "--salida", help="escribe el resultado en un archivo en lugar de stdout")
+    ap.add_argument("--lexico", choices=tuple(LEXICOS), default="ply",
+                    help="lexer a usar: PLY o el escrito a mano (mismos tokens)")
+    ap.add_argument("--streaming", action="store_true",
+                    help="lee el archivo por bloques sin cargarlo entero (archivos grandes)")
+    ap.add_argument("-O", "--optimizar", action="store_true",
+                    help="optimiza los triplos y el ensamblador (registros, mirilla)")
+    ap.add_argument("--cfg", metavar="ARCHIVO.dot",
+                    help="escribe el grafo de flujo de control de los triplos en formato DOT")
+    ap.add_argument("--ejecutar", action="store_true",
+                    help="ejecuta los triplos (interprete.py) y muestra variables, conteos y tiempo")
+    ap.add_argument("--simular", action="store_true",
+                    help="simula el ensamblador en un 8086 (simulador.py) y muestra los ciclos estimados")
+    args = ap.parse_args(argv)
+
+    if args.streaming and args.archivo != "-":
+        res = compile_file(args.archivo, optimizar=args.optimizar)
+    else:
+        if args.archivo == "-":
+            codigo = sys.stdin.read()
+        else:
+            with open(args.archivo, encoding="utf-8") as fh:
+                codigo = fh.read()
+        res = compile_source(codigo, lexico=args.lexico, optimizar=args.optimizar)
+
+    if args.cfg:
+        from cfg import a_dot, construir_cfg
+        with open(args.cfg, "w", encoding="utf-8") as fh:
+            fh.write(a_dot(construir_cfg(list(res.triplos.triplos))) + "\n")
+
+    ejecucion = None
+    if args.ejecutar:
+        from interprete import ErrorEjecucion, ejecutar
+        try:
+            ejecucion = ejecutar(res.triplos.triplos, dict(res.symbols))
+        except ErrorEjecucion as e:
+            ejecucion = e
+    simulacion = None
+    if args.simular:
+        from simulador import ErrorSimulacion, simular
+        try:
+            simulacion = simular(res.asm)
+        except ErrorSimulacion as e:
+            simulacion = e
+
+    if args.formato == "json":
+        datos = res.to_dict()
+        if isinstance(ejecucion, Exception):
+            datos["ejecucion"] = {"error": str(ejecucion)}
+        elif ejecucion is not None:
+            datos["ejecucion"] = {
+                "variables": ejecucion.variables,
+                "instrucciones": ejecucion.instrucciones,
+                "por_op": ejecucion.por_op,
+                "segundos": ejecucion.segundos,
+                "salida": ejecucion.salida,
+            }
+        if isinstance(simulacion, Exception):
+            datos["simulacion"] = {"error": str(simulacion)}
+        elif simulacion is not None:
+            datos["simulacion"] = {
+                "variables": simulacion.variables,
+                "registros": simulacion.registros,
+                "instrucciones": simulacion.instrucciones,
+                "ciclos": simulacion.ciclos,
+                "por_instruccion": simulacion.por_instruccion,
+                "segundos": simulacion.segundos,
+            }
+        texto = json.dumps(datos, ensure_ascii=False, indent=2)
+    else:
+        texto = _formato_texto(res)
+        if ejecucion is not None:
+            texto += "\n\n" + _formato_ejecucion(ejecucion)
+        if simulacion is not None:
+            texto += "\n\n" + _formato_simulacion(simulacion)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as fh:
+            fh.write(texto + "\n")
+    else:
+        print(texto)
+
+    # Código de salida != 0 si hubo errores (útil en scripts / CI)
+    return 0 if res.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
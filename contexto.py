@@ -0,0 +1,42 @@
+# contexto.py
+"""
+Contexto de compilación.
+
+Agrupa todo el estado mutable de UNA compilación (tablas de símbolos,
+errores y lexemas, tabla de triplos y pila de for). El lexer lo lleva en
+`lexer.ctx` y las acciones del parser lo obtienen con `p.lexer.ctx`, así que
+varias compilaciones pueden correr a la vez (hilos, asyncio) sin pisarse.
+"""
+from tables import SymbolTable, ErrorTable, LexemeTable
+from tables import symbol_table, error_table, lexeme_table
+from icg import TriploTable
+
+
+class CompilationContext:
+    def __init__(self, symbol_table=None, error_table=None, lexeme_table=None, trip=None):
+        self.symbol_table = symbol_table if symbol_table is not None else SymbolTable()
+        self.error_table = error_table if error_table is not None else ErrorTable()
+        self.lexeme_table = lexeme_table if lexeme_table is not None else LexemeTable()
+        self.trip = trip if trip is not None else TriploTable()
+        self.for_stack = []
+        self.syntax_errors = 0  # errores sintácticos (no van a la tabla de errores)
+
+    def syntax_error(self, tok):
+        """errorfunc del parser de esta compilación (ver parser.new_parser)."""
+        self.syntax_errors += 1
+
+    def clear(self):
+        self.symbol_table.clear()
+        self.error_table.clear()
+        self.lexeme_table.clear()
+        self.trip.clear()
+        self.for_stack.clear()
+        self.syntax_errors = 0
+
+
+# ---------------------------
+# Contexto por defecto
+#   - usa las instancias globales de tables.py (compatibilidad con
+#     código que todavía importa symbol_table/error_table/lexeme_table)
+# ---------------------------
+default_context = CompilationContext(symbol_table, error_table, lexeme_table)
@@ -16,9 +16,8 @@ if exist "venv\Scripts\activate.bat" (
   exit /b 1
 )
 
-rem Limpia cache de PLY para evitar tablas viejas
-del /q parsetab.py 2>nul
-for /d %%D in (__pycache__) do rd /s /q "%%D" 2>nul
+rem Las tablas de PLY (lextab.py / parsetab.py) vienen precompiladas: no se borran.
+rem Si cambias la gramatica: python generar_tablas.py
 
 rem Verifica Python
 python -c "import sys; print('Python', sys.version)" || (
@@ -1,15 +1,48 @@
 from typing import List
 from icg import Triplo
 
+# cfg.py y registros.py se importan solo si hacen falta (comparaciones,
+# registros=True): compilar sin -O no los carga
 
-def generar_ensamblador(triplos: List[Triplo]) -> List[str]:
+# Registros que se prestan a los temporales (registros.py); AX queda como
+# acumulador
+REGISTROS = ("BX", "CX", "DX", "SI", "DI")
+
+
+def es_registro(valor) -> bool:
+    return valor in REGISTROS
+
+
+# Comparación -> (salto si se cumple, salto si no se cumple); con signo
+_SALTOS = {
+    "GT": ("JG", "JLE"), "GTE": ("JGE", "JL"),
+    "LT": ("JL", "JGE"), "LTE": ("JLE", "JG"),
+    "EQ": ("JE", "JNE"), "NEQ": ("JNE", "JE"),
+}
+
+
+def generar_ensamblador(triplos: List[Triplo], registros: bool = False) -> List[str]:
     """
     Traduce la lista de Triplos a código ensamblador 8086 (pseudo-ASM),
     siguiendo tus reglas. NO agrega encabezados ni labels extra.
+
+    registros=True: los temporales van en BX/CX/DX/SI/DI (registros.py) en
+    lugar de memoria. Un operando que ya está en un registro se usa directo
+    en vez de pasar por AX.
+
+    Una comparación seguida del IF_FALSE_GOTO que la consume se traduce a
+    un solo CMP y el salto inverso (GT -> JLE, EQ -> JNE...). El booleano
+    (1/0) solo se escribe si alguien más lo lee.
     """
+    triplos = list(triplos)
+    fusionadas, guardadas = _comparaciones(triplos)
+    if registros:
+        from registros import asignar_registros
+        triplos = asignar_registros(triplos)
     asm: List[str] = []
+    etiquetas = 0
 
-    for t in triplos:
+    for pos, t in enumerate(triplos):
         op = t.op
         a1 = t.arg1 if t.arg1 is not None else "0"
         a2 = t.arg2 if t.arg2 is not None else "0"
@@ -17,31 +50,49 @@ def generar_ensamblador(triplos: List[Triplo]) -> List[str]:
 
         # -------- ASIGNACIÓN: res = a1 --------
         if op in (":=", "="):
-            asm.append(f"MOV AX, {a1}")
-            if res:
-                asm.append(f"MOV {res}, AX")
+            if es_registro(res) or (res and es_registro(a1)):
+                if a1 != res:
+                    asm.append(f"MOV {res}, {a1}")
+            else:
+                asm.append(f"MOV AX, {a1}")
+                if res:
+                    asm.append(f"MOV {res}, AX")
 
         # -------- SUMA: res = a1 + a2 --------
         elif op == "ADD":
-            asm.append(f"MOV AX, {a1}")
-            asm.append(f"ADD AX, {a2}")
-            if res:
-                asm.append(f"MOV {res}, AX")
+            if es_registro(res) and a2 != res:
+                # directo en el registro destino
+                if a1 != res:
+                    asm.append(f"MOV {res}, {a1}")
+                asm.append(f"ADD {res}, {a2}")
+            else:
+                asm.append(f"MOV AX, {a1}")
+                asm.append(f"ADD AX, {a2}")
+                if res:
+                    asm.append(f"MOV {res}, AX")
 
         # -------- RESTA: res = a1 - a2 --------
         elif op == "SUB":
-            asm.append(f"MOV AX, {a1}")
-            asm.append(f"SUB AX, {a2}")
-            if res:
-                asm.append(f"MOV {res}, AX")
+            if es_registro(res) and a2 != res:
+                # directo en el registro destino
+                if a1 != res:
+                    asm.append(f"MOV {res}, {a1}")
+                asm.append(f"SUB {res}, {a2}")
+            else:
+                asm.append(f"MOV AX, {a1}")
+                asm.append(f"SUB AX, {a2}")
+                if res:
+                    asm.append(f"MOV {res}, AX")
 
         # -------- MULTIPLICACIÓN --------
         # MOV AL, a1
         # MOV BL, a2
         # MUL BL  ; resultado en AX
+        # (un operando en registro se copia entero: AL/BL son su byte bajo;
+        # SI y DI no tienen registro de 8 bits)
         elif op == "MUL":
-            asm.append(f"MOV AL, {a1}")
-            asm.append(f"MOV BL, {a2}")
+            asm.append(f"MOV AX, {a1}" if es_registro(a1) else f"MOV AL, {a1}")
+            _cargar_bl(asm, a2)
             asm.append("MUL BL")
             if res:
                 asm.append(f"MOV {res}, AX")
@@ -50,33 +101,62 @@ def generar_ensamblador(triplos: List[Triplo]) -> List[str]:
         # MOV AX, a1
         # MOV BL, a2
         # DIV BL  ; AL = cociente, AH = residuo
+        # (el resultado se guarda extendido a 16 bits, AH = 0: guardar solo
+        # AL dejaría en la palabra el byte alto que tenía antes)
         elif op == "DIV":
             asm.append(f"MOV AX, {a1}")
-            asm.append(f"MOV BL, {a2}")
+            _cargar_bl(asm, a2)
             asm.append("DIV BL")
             if res:
-                asm.append(f"MOV {res}, AL")
+                asm.append("MOV AH, 0")
+                asm.append(f"MOV {res}, AX")
 
         # -------- MÓDULO --------
         elif op == "MOD":
             asm.append(f"MOV AX, {a1}")
-            asm.append(f"MOV BL, {a2}")
+            _cargar_bl(asm, a2)
             asm.append("DIV BL")
             if res:
-                asm.append(f"MOV {res}, AH")
+                asm.append("MOV AL, AH")
+                asm.append("MOV AH, 0")
+                asm.append(f"MOV {res}, AX")
 
         # -------- COMPARACIONES --------
-        elif op in {"GT", "GTE", "LT", "LTE", "EQ", "NEQ"}:
+        # MOV AX, a1
+        # CMP AX, a2
+        # (si el resultado se guarda: MOV AX, 1 / Jcc L / MOV AX, 0 / L:;
+        # MOV no toca las banderas, así que el salto fusionado puede ir después)
+        elif op in _SALTOS:
             asm.append(f"; CMP {a1} {op} {a2}")
-            asm.append(f"MOV AX, {a1}")
-            asm.append(f"CMP AX, {a2}")
+            if es_registro(a1):
+                asm.append(f"CMP {a1}, {a2}")
+            else:
+                asm.append(f"MOV AX, {a1}")
+                asm.append(f"CMP AX, {a2}")
+            if pos in guardadas and res:
+                etiquetas += 1
+                fin = f"L_cmp{etiquetas}"
+                reg = res if es_registro(res) else "AX"
+                asm.append(f"MOV {reg}, 1")
+                asm.append(f"{_SALTOS[op][0]} {fin}")
+                asm.append(f"MOV {reg}, 0")
+                asm.append(f"{fin}:")
+                if reg != res:
+                    asm.append(f"MOV {res}, AX")
 
         # -------- IF_FALSE_GOTO --------
+        elif op == "IF_FALSE_GOTO" and pos - 1 in fusionadas:
+            # las banderas ya quedaron del CMP anterior
+            asm.append(f"{_SALTOS[triplos[pos - 1].op][1]} {res or a1}")
+
         elif op == "IF_FALSE_GOTO":
             cond = a1
             label = res or a1
-            asm.append(f"MOV AX, {cond}")
-            asm.append("CMP AX, 0")
+            if es_registro(cond):
+                asm.append(f"CMP {cond}, 0")
+            else:
+                asm.append(f"MOV AX, {cond}")
+                asm.append("CMP AX, 0")
             asm.append(f"JE {label}")
 
         # -------- GOTO --------
@@ -102,3 +182,51 @@ def generar_ensamblador(triplos: List[Triplo]) -> List[str]:
             asm.append(f"; Operador no soportado aún: {op}")
 
     return asm
+
+
+def _comparaciones(triplos):
+    """
+    (fusionadas, guardadas): posiciones de las comparaciones que van
+    seguidas del IF_FALSE_GOTO que las lee, y de las que tienen que escribir
+    su resultado porque se lee en otro lado (liveness de cfg.py).
+    """
+    fusionadas, guardadas = set(), set()
+    if not any(t.op in _SALTOS for t in triplos):
+        return fusionadas, guardadas
+    from cfg import construir_cfg, destino, elementos, es_nombre, lecturas, vivas
+    bloques = construir_cfg(triplos)
+    _, salida, nombres = vivas(bloques, al_terminar=True)
+    fin = 0
+    for b in bloques:
+        ts = b.triplos
+        fin += len(ts)
+        vivos = set(elementos(salida[b.id], nombres))
+        tras_salto = False      # la condición del IF_FALSE_GOTO sigue viva después
+        for k in range(len(ts) - 1, -1, -1):
+            t = ts[k]
+            if t.op in _SALTOS:
+                pos = fin - len(ts) + k
+                siguiente = ts[k + 1] if k + 1 < len(ts) else None
+                if siguiente is not None and siguiente.op == "IF_FALSE_GOTO" and siguiente.arg1 == t.res:
+                    fusionadas.add(pos)
+                    if tras_salto:
+                        guardadas.add(pos)
+                elif t.res in vivos:
+                    guardadas.add(pos)
+            if t.op == "IF_FALSE_GOTO":
+                tras_salto = t.arg1 in vivos
+            d = destino(t)
+            if d is not None:
+                vivos.discard(d)
+            for x in lecturas(t):
+                if es_nombre(x):
+                    vivos.add(x)
+    return fusionadas, guardadas
+
+
+def _cargar_bl(asm: List[str], valor: str) -> None:
+    """Divisor/multiplicador en BL (si viene en un registro, se copia entero a BX)."""
+    if not es_registro(valor):
+        asm.append(f"MOV BL, {valor}")
+    elif valor != "BX":
+        asm.append(f"MOV BX, {valor}")
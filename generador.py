@@ -0,0 +1,216 @@
+# generador.py
+"""
+Generador de programas sintéticos válidos (cat/cats/meow, for, if) para
+benchmarks y pruebas.
+
+    from generador import generar_programa
+    codigo = generar_programa(bytes_objetivo=1_000_000)         # ~1 MB
+    codigo = generar_programa(asignaciones=500, profundidad=4, anidamiento=3)
+
+    python generador.py --bytes 10MB -o grande.txt
+    python generador.py --asignaciones 200 --errores 0.05
+
+Parámetros:
+  declaraciones     variables declaradas (mitad cat, un cuarto cats, un
+                    cuarto meow; más un contador cat por nivel de for)
+  asignaciones      cuántas asignaciones generar (si no se da bytes_objetivo)
+  bytes_objetivo    generar sentencias hasta llegar a ese tamaño
+  profundidad       profundidad máxima de las expresiones
+  anidamiento       profundidad máxima de for/if anidados
+  densidad_errores  fracción de sentencias con un error semántico
+                    (variable indefinida o tipos incompatibles)
+  tipos             tipos de las variables; ("cat",) da programas que se
+                    pueden simular en el 8086 (simulador.py)
+  literales         los literales enteros van de 0 a literales - 1 (con 256
+                    los productos pasan de 32767)
+  divisiones        con False no hay / ni % en las expresiones (con valores
+                    grandes, DIV BL se desborda y el 8086 para con INT 0)
+  mezclas           fracción de sentencias "b = k; x = a / b; y = a / b;"
+                    con x cats e y cat: la misma división en los dos tipos
+  semilla           mismo número, mismo programa
+
+Sin errores inyectados el programa compila sin errores. Está pensado para
+medir el compilador, no para ejecutarse: los for tienen pocas vueltas y /
+y % solo dividen entre literales distintos de cero, pero los valores de
+las variables pueden crecer sin límite.
+"""
+import argparse
+import random
+import sys
+
+_LETRAS = "ABCDEFGHJKMNPQRSTUVWXYZ"
+
+
+class Generador:
+    def __init__(self, declaraciones=8, profundidad=3, anidamiento=2,
+                 densidad_errores=0.0, semilla=0, tipos=("cat", "cats", "meow"),
+                 literales=100, mezclas=0.0, divisiones=True):
+        self.r = random.Random(semilla)
+        self.literales = max(1, literales)
+        self.divisiones = divisiones
+        self.mezclas = mezclas
+        self.profundidad = max(1, profundidad)
+        self.anidamiento = max(0, anidamiento)
+        self.densidad_errores = densidad_errores
+        declaraciones = max(3, declaraciones)
+        n_cats = max(1, declaraciones // 4) if "cats" in tipos else 0
+        n_meow = max(1, declaraciones // 4) if "meow" in tipos else 0
+        n_cat = declaraciones - n_cats - n_meow
+        k = 0
+        self.variables = {"cat": [], "cats": [], "meow": []}
+        for tipo, n in (("cat", n_cat), ("cats", n_cats), ("meow", n_meow)):
+            for _ in range(n):
+                k += 1
+                self.variables[tipo].append(f"${k}{_LETRAS[k % len(_LETRAS)]}")
+        self.contadores = []
+        for _ in range(self.anidamiento):
+            k += 1
+            self.contadores.append(f"${k}I")
+        self.indefinida = f"${k + 1}Z"      # nunca se declara
+        self._asignables = [x for x in ("cat", "cat", "cats", "meow") if self.variables[x]]
+
+    # -- expresiones -------------------------------------------------------
+    def _hoja(self, tipo):
+        r = self.r
+        if tipo == "meow":
+            if r.random() < 0.5 or not self.variables["meow"]:
+                return f'"texto {r.randrange(1000)}"'
+            return r.choice(self.variables["meow"])
+        if tipo == "cats" and r.random() < 0.6:
+            if r.random() < 0.4:
+                return f"{r.randrange(100)}.{r.randrange(1, 100)}"
+            return r.choice(self.variables["cats"])
+        if r.random() < 0.4:
+            return str(r.randrange(self.literales))
+        return r.choice(self.variables["cat"])
+
+    def expresion(self, tipo, profundidad=None):
+        r = self.r
+        if profundidad is None:
+            profundidad = r.randrange(1, self.profundidad + 1)
+        if profundidad <= 1 or r.random() < 0.25:
+            return self._hoja(tipo)
+        if tipo == "meow":
+            return f"{self.expresion(tipo, profundidad - 1)} + {self._hoja(tipo)}"
+        izq = self.expresion(tipo, profundidad - 1)
+        k = r.random()
+        if k < 0.15 and self.divisiones:
+            # / y % entre un literal distinto de cero (% solo con cat)
+            op = "%" if tipo == "cat" and r.random() < 0.5 else "/"
+            texto = f"{izq} {op} {r.randrange(1, 10)}"
+        else:
+            op = r.choice("+-*") if k < 0.85 else "+"
+            texto = f"{izq} {op} {self.expresion(tipo, profundidad - 1)}"
+        return f"({texto})" if r.random() < 0.2 else texto
+
+    def condicion(self):
+        op = self.r.choice((">", "<", ">=", "<=", "==", "!="))
+        return f"{self.expresion('cat', 2)} {op} {self.expresion('cat', 2)}"
+
+    # -- sentencias --------------------------------------------------------
+    def asignacion(self):
+        r = self.r
+        if r.random() < self.densidad_errores:
+            if r.random() < 0.5:
+                return f"{self.indefinida} = {self.expresion('cat')};"
+            return f"{r.choice(self.variables['cat'])} = {self._hoja('meow')};"
+        if self.mezclas and len(self.variables["cat"]) > 1 and r.random() < self.mezclas:
+            return self.division_repetida()
+        tipo = r.choice(self._asignables)
+        return f"{r.choice(self.variables[tipo])} = {self.expresion(tipo)};"
+
+    def division_repetida(self):
+        # La misma división guardada en una cats y en una cat (una cuenta
+        # como una asignación): 3 / 1 es 3.0 en x pero 3 en y
+        r = self.r
+        a, b = r.sample(self.variables["cat"], 2)
+        x = r.choice(self.variables["cats"] or self.variables["cat"])
+        y = r.choice(self.variables["cat"])
+        return f"{b} = {r.randrange(1, 10)}; {x} = {a} / {b}; {y} = {a} / {b};"
+
+    def sentencias(self, salida, nivel, presupuesto):
+        """Agrega sentencias a `salida`; devuelve cuántas asignaciones emitió."""
+        r = self.r
+        sangria = "    " * nivel
+        emitidas = 0
+        while emitidas < presupuesto:
+            k = r.random()
+            if nivel < self.anidamiento and k < 0.12:
+                i = self.contadores[nivel]
+                salida.append(f"{sangria}for ({i} = 0; {i} < {r.randrange(1, 4)}; {i} = {i} + 1;) {{")
+                emitidas += self.sentencias(salida, nivel + 1, r.randrange(1, 4))
+                salida.append(f"{sangria}}}")
+            elif nivel < self.anidamiento and k < 0.24:
+                salida.append(f"{sangria}if ({self.condicion()}) {{")
+                emitidas += self.sentencias(salida, nivel + 1, r.randrange(1, 4))
+                if r.random() < 0.5:
+                    salida.append(f"{sangria}}} else {{")
+                    emitidas += self.sentencias(salida, nivel + 1, r.randrange(1, 4))
+                salida.append(f"{sangria}}}")
+            else:
+                salida.append(sangria + self.asignacion())
+                emitidas += 1
+        return emitidas
+
+    def programa(self, asignaciones=100, bytes_objetivo=None) -> str:
+        lineas = [f"{tipo} {x};" for tipo, xs in self.variables.items() for x in xs]
+        lineas += [f"cat {i};" for i in self.contadores]
+        if bytes_objetivo is None:
+            self.sentencias(lineas, 0, asignaciones)
+        else:
+            tamano = sum(len(x) + 1 for x in lineas)
+            while tamano < bytes_objetivo:
+                n = len(lineas)
+                self.sentencias(lineas, 0, 1)
+                tamano += sum(len(x) + 1 for x in lineas[n:])
+        return "\n".join(lineas) + "\n"
+
+
+def generar_programa(asignaciones=100, bytes_objetivo=None, declaraciones=8, profundidad=3,
+                     anidamiento=2, densidad_errores=0.0, semilla=0,
+                     tipos=("cat", "cats", "meow"), literales=100, mezclas=0.0,
+                     divisiones=True) -> str:
+    """Programa sintético (ver el docstring del módulo para los parámetros)."""
+    gen = Generador(declaraciones, profundidad, anidamiento, densidad_errores, semilla, tipos,
+                    literales, mezclas, divisiones)
+    return gen.programa(asignaciones, bytes_objetivo)
+
+
+def leer_tamano(texto) -> int:
+    """'1KB', '10MB', '512' -> bytes."""
+    texto = str(texto).strip().upper()
+    for sufijo, factor in (("KB", 1000), ("MB", 1000 ** 2), ("GB", 1000 ** 3), ("B", 1)):
+        if texto.endswith(sufijo):
+            return int(float(texto[:-len(sufijo)]) * factor)
+    return int(texto)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python generador.py", description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--bytes", type=leer_tamano, help="tamaño aproximado (p.ej. 100KB, 10MB)")
+    ap.add_argument("--asignaciones", type=int, default=100)
+    ap.add_argument("--declaraciones", type=int, default=8)
+    ap.add_argument("--profundidad", type=int, default=3, help="profundidad de las expresiones")
+    ap.add_argument("--anidamiento", type=int, default=2, help="for/if anidados")
+    ap.add_argument("--errores", type=float, default=0.0, help="densidad de errores (0..1)")
+    ap.add_argument("--semilla", type=int, default=0)
+    ap.add_argument("--tipos", nargs="+", default=["cat", "cats", "meow"], choices=["cat", "cats", "meow"])
+    ap.add_argument("--literales", type=int, default=100, help="tope (exclusivo) de los literales enteros")
+    ap.add_argument("--mezclas", type=float, default=0.0, help="fracción de divisiones repetidas cat/cats")
+    ap.add_argument("--sin-divisiones", action="store_true", help="expresiones sin / ni %%")
+    ap.add_argument("-o", "--salida", help="archivo de salida (por defecto stdout)")
+    args = ap.parse_args(argv)
+
+    codigo = generar_programa(args.asignaciones, args.bytes, args.declaraciones, args.profundidad,
+                              args.anidamiento, args.errores, args.semilla, tuple(args.tipos),
+                              args.literales, args.mezclas, not args.sin_divisiones)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as fh:
+            fh.write(codigo)
+    else:
+        sys.stdout.write(codigo)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# generar_tablas.py
+"""
+Regenera las tablas precompiladas de PLY que se distribuyen con el código:
+
+    lextab.py    tablas del lexer  (lexer.py)
+    parsetab.py  tablas LALR       (parser.py)
+
+    python generar_tablas.py              # regenera ambas
+    python generar_tablas.py --verificar  # código de salida 1 si están desactualizadas
+
+lexer.py y parser.py las cargan sin validar las reglas ni la gramática, así
+que hay que correr este script (y commitear los dos archivos) cada vez que
+cambien los tokens o las producciones.
+"""
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+
+import ply.yacc as yacc
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+TABLAS = ("lextab", "parsetab")
+
+
+def _cargar_tabla(nombre, carpeta=AQUI):
+    """Contenido (variables) de una tabla generada, o None si no existe."""
+    ruta = os.path.join(carpeta, nombre + ".py")
+    if not os.path.exists(ruta):
+        return None
+    datos = {}
+    with open(ruta, encoding="utf-8") as fh:
+        exec(compile(fh.read(), ruta, "exec"), datos)
+    return {k: v for k, v in datos.items() if k.startswith("_")}
+
+
+def desactualizadas():
+    """Nombres de las tablas que no corresponden al lexer/gramática actuales."""
+    import lexer
+    import parser
+
+    malas = []
+
+    # lextab: se compara con un lexer construido desde las reglas. lex.lex()
+    # se evalúa en los globals de lexer.py para respetar el orden de
+    # definición (con module=... PLY las recorre en orden alfabético).
+    actual = _cargar_tabla("lextab")
+    lx = eval("lex.lex()", vars(lexer))
+    with tempfile.TemporaryDirectory() as tmp:
+        lx.writetab("lextab", tmp)
+        nueva = _cargar_tabla("lextab", tmp)
+    if actual != nueva:
+        malas.append("lextab")
+
+    # parsetab: firma de la gramática (la misma que usa PLY)
+    actual = _cargar_tabla("parsetab")
+    pinfo = yacc.ParserReflect(vars(parser))
+    pinfo.get_all()
+    if actual is None or actual.get("_lr_signature") != pinfo.signature():
+        malas.append("parsetab")
+    return malas
+
+
+def generar():
+    # Sin tablas previas, lexer.py/parser.py se arman en memoria al importarse
+    for nombre in TABLAS:
+        ruta = os.path.join(AQUI, nombre + ".py")
+        if os.path.exists(ruta):
+            os.remove(ruta)
+        sys.modules.pop(nombre, None)
+    importlib.invalidate_caches()
+
+    import lexer
+    import parser
+
+    lexer.lexer.writetab("lextab", AQUI)
+    yacc.yacc(module=parser, debug=False, write_tables=True, outputdir=AQUI)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python generar_tablas.py", description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--verificar", action="store_true",
+                    help="no escribe nada; falla si las tablas están desactualizadas")
+    args = ap.parse_args(argv)
+
+    if args.verificar:
+        malas = desactualizadas()
+        for nombre in malas:
+            print(f"{nombre}.py está desactualizada: corre python generar_tablas.py")
+        return 1 if malas else 0
+
+    generar()
+    print("Tablas regeneradas: " + ", ".join(f"{n}.py" for n in TABLAS))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,10 @@
 # icg.py
+import heapq
+from array import array
+from collections.abc import Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 @dataclass
 class Triplo:
@@ -10,21 +14,225 @@ class Triplo:
     arg2: Optional[str]   # fuente 2 (interno)
     res: Optional[str]    # destino (interno)
 
+
+# ---------------------------
+# Opcodes internados (un byte por triplo)
+# ---------------------------
+# Todos los que existen, en orden fijo. La tabla no cambia nunca: se
+# comparte entre compilaciones (y entre hilos) sin candado.
+OPCODES = (
+    ":=", "ADD", "SUB", "MUL", "DIV", "MOD", "NEG",
+    "GT", "GTE", "LT", "LTE", "EQ", "NEQ",
+    "IF_FALSE_GOTO", "GOTO", "LABEL", "PRINT", "READ", "ERROR", "HALT",
+)
+_OPCODE = {op: i for i, op in enumerate(OPCODES)}
+
+
+def opcode(op: str) -> int:
+    """Número (0..255) de un opcode; ValueError si no está en OPCODES."""
+    n = _OPCODE.get(op)
+    if n is None:
+        raise ValueError(f"opcode desconocido: {op!r} (agrégalo a icg.OPCODES)")
+    return n
+
+
+class _Trozo:
+    """Tramo de la tabla: columnas propias + siguiente tramo (lista enlazada)."""
+    __slots__ = ("cols", "sig")
+
+    def __init__(self):
+        self.cols = (array("I"), array("B"), array("I"), array("I"), array("I"))
+        self.sig = None
+
+
+class TriploView(Sequence):
+    """
+    Vista de solo lectura de una TriploTable como secuencia de Triplo.
+    Los objetos Triplo se crean al acceder (no se guardan): t.rows[i],
+    t.rows[a:b] (lista) o iterando.
+    """
+    __slots__ = ("_t",)
+
+    def __init__(self, tabla: "TriploTable"):
+        self._t = tabla
+
+    def __len__(self):
+        self._t._compactar()
+        return len(self._t._op)
+
+    def __getitem__(self, i):
+        t = self._t
+        t._compactar()
+        if isinstance(i, slice):
+            return [t._triplo(k) for k in range(*i.indices(len(t._op)))]
+        if i < 0:
+            i += len(t._op)
+        if not 0 <= i < len(t._op):
+            raise IndexError("índice de triplo fuera de rango")
+        return t._triplo(i)
+
+    def __iter__(self):
+        t = self._t
+        t._compactar()
+        pool = t._pool.__getitem__
+        return map(Triplo, t._idx, map(OPCODES.__getitem__, t._op),
+                   map(pool, t._a1), map(pool, t._a2), map(pool, t._res))
+
+    def __repr__(self):
+        return f"<TriploView de {len(self)} triplos>"
+
+
+class FilasView(Sequence):
+    """Vista perezosa de TriploTable.to_rows(): cada dict se arma al pedirlo."""
+    __slots__ = ("_t",)
+
+    def __init__(self, tabla: "TriploTable"):
+        self._t = tabla
+
+    def __len__(self):
+        self._t._compactar()
+        return len(self._t._op)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._t._fila(k) for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("índice de fila fuera de rango")
+        return self._t._fila(i)
+
+    def __iter__(self):
+        fila = self._t._fila
+        return (fila(k) for k in range(len(self)))
+
+
 class TriploTable:
+    """
+    Tabla de triplos guardada por columnas ("struct of arrays"):
+
+        _idx          array('I')  número de triplo (#)
+        _op           array('B')  opcode internado (ver OPCODES)
+        _a1/_a2/_res  array('I')  índice en el pool de operandos (0 = None)
+
+    Cada operando distinto (temporal, ID, constante, etiqueta) se guarda una
+    sola vez en _pool. rows/triplos y to_rows() son vistas que arman los
+    Triplo/dicts solo cuando se leen.
+
+    Mientras se parsea, las columnas pueden estar repartidas en varios
+    trozos enlazados (ver marca/en/mover_al_final): así el parser acomoda
+    for e if sin copiar lo ya emitido. Al leer la tabla se unen en uno.
+    """
+
     def __init__(self):
-        self.rows: List[Triplo] = []
+        self._cabeza = self._cola = _Trozo()
+        self._enlazar(self._cola)
+        self._pool: List[Optional[str]] = [None]
+        self._pool_id = {}
         self._i = 0
-        self._t = 0
+        self._t = 0  # temporales distintos creados (t1..t{_t})
         self._l = 0  # Contador para etiquetas
+        self._libres: List[int] = []  # montículo de temporales libres (números)
+        self._libres_set = set()
         self._buffer: List[Triplo] = []  # Buffer para reordenar triplos
         self._buffering = False  # Flag para saber si estamos en modo buffer
 
+    # -------- trozos (reordenar sin copiar) --------
+    def _enlazar(self, trozo: "_Trozo"):
+        """add() escribe en las columnas de este trozo."""
+        self._idx, self._op, self._a1, self._a2, self._res = trozo.cols
+
+    def _compactar(self):
+        """Une todos los trozos en uno solo (antes de leer la tabla)."""
+        if self._cabeza is self._cola:
+            return
+        unico = _Trozo()
+        trozo = self._cabeza
+        while trozo is not None:
+            for col, parte in zip(unico.cols, trozo.cols):
+                col.extend(parte)
+            trozo = trozo.sig
+        self._cabeza = self._cola = unico
+        self._enlazar(unico)
+
+    def marca(self) -> "_Trozo":
+        """
+        Deja un hueco (vacío) en la posición actual y devuelve su trozo.
+        Más adelante se puede emitir en él (con en(hueco)) o mover lo que se
+        emitió después (mover_al_final), ambos en O(1). Las marcas valen
+        hasta la siguiente lectura de la tabla (rows, to_rows, len...).
+        """
+        hueco = _Trozo()
+        self._cola.sig = hueco
+        hueco.sig = self._cola = _Trozo()
+        self._enlazar(self._cola)
+        return hueco
+
+    @contextmanager
+    def en(self, hueco: "_Trozo"):
+        """Los add() dentro del with se emiten en el hueco (no al final)."""
+        self._enlazar(hueco)
+        try:
+            yield
+        finally:
+            self._enlazar(self._cola)
+
+    def mover_al_final(self, desde: "_Trozo", hasta: "_Trozo"):
+        """
+        Mueve al final lo emitido entre las marcas `desde` y `hasta`
+        (incluido el hueco `hasta`) sin copiar triplos.
+        """
+        primero = desde.sig
+        if hasta is self._cola:
+            return
+        desde.sig = hasta.sig
+        self._cola.sig = primero
+        hasta.sig = None
+        self._cola = hasta
+        self._enlazar(hasta)
+
+    # -------- almacenamiento --------
+    def _operando(self, valor) -> int:
+        """Índice en el pool del operando (lo interna si es nuevo)."""
+        if valor is None:
+            return 0
+        if valor.__class__ is not str:
+            valor = str(valor)
+        n = self._pool_id.get(valor)
+        if n is None:
+            n = self._pool_id[valor] = len(self._pool)
+            self._pool.append(valor)
+        return n
+
+    def _append(self, idx, op, arg1, arg2, res):
+        n = _OPCODE.get(op)
+        if n is None:
+            n = opcode(str(op))
+        self._idx.append(idx)
+        self._op.append(n)
+        self._a1.append(self._operando(arg1))
+        self._a2.append(self._operando(arg2))
+        self._res.append(self._operando(res))
+
+    def _triplo(self, k: int) -> Triplo:
+        pool = self._pool
+        return Triplo(self._idx[k], OPCODES[self._op[k]],
+                      pool[self._a1[k]], pool[self._a2[k]], pool[self._res[k]])
+
     # -------- generación básica --------
     def _next_idx(self) -> int:
         self._i += 1
         return self._i
 
     def new_temp(self) -> str:
+        """
+        Temporal para un resultado intermedio: el libre de menor número, o
+        uno nuevo si no hay libres.
+        """
+        if self._libres:
+            n = heapq.heappop(self._libres)
+            self._libres_set.discard(n)
+            return f"t{n}"
         self._t += 1
         return f"t{self._t}"
 
@@ -37,11 +245,22 @@ class TriploTable:
 
     def free_temp(self, temp_name: str):
         """
-        Devuelve un temporal (tX) a la pila para ser reutilizado.
-        Por ahora es un placeholder para compatibilidad con parser.py
+        Devuelve un temporal (tX) a la lista de libres para ser reutilizado.
+        El parser lo llama justo después de emitir el ÚLTIMO uso del
+        temporal (el triplo que lo consume), así que el siguiente new_temp
+        puede pisarlo. Ignora lo que no es un temporal (IDs, constantes) y
+        los temporales que ya estaban libres.
         """
-        # No hace nada en esta versión simplificada
-        pass
+        if not temp_name or temp_name[0] != "t" or not temp_name[1:].isdigit():
+            return
+        n = int(temp_name[1:])
+        if n <= self._t and n not in self._libres_set:
+            self._libres_set.add(n)
+            heapq.heappush(self._libres, n)
+
+    def temps_ocupados(self) -> int:
+        """Temporales tomados con new_temp y aún no liberados."""
+        return self._t - len(self._libres)
 
     def add(self, op: str, arg1=None, arg2=None, res=None, note=None):
         """
@@ -53,41 +272,48 @@ class TriploTable:
           note: ignorado (ya no hay columna NOTE), se acepta por compatibilidad
         """
         idx = self._next_idx()
-        triplo = Triplo(
-            idx,
-            str(op),
-            str(arg1) if arg1 is not None else None,
-            str(arg2) if arg2 is not None else None,
-            str(res) if res is not None else None,
-        )
-        
+
         # Si estamos en modo buffering, guardar en el buffer
         if self._buffering:
-            self._buffer.append(triplo)
+            self._buffer.append(Triplo(
+                idx,
+                str(op),
+                str(arg1) if arg1 is not None else None,
+                str(arg2) if arg2 is not None else None,
+                str(res) if res is not None else None,
+            ))
         else:
-            self.rows.append(triplo)
-        
+            self._append(idx, op, arg1, arg2, res)
+
         return res
-    
+
     def start_buffering(self):
         """Inicia el modo buffer para guardar triplos temporalmente"""
         self._buffering = True
         self._buffer.clear()
-    
+
     def end_buffering(self):
         """Termina el modo buffer y retorna los triplos guardados"""
         self._buffering = False
         buffered = self._buffer.copy()
         self._buffer.clear()
         return buffered
-    
-    def insert_triplos(self, triplos: List[Triplo]):
+
+    def insert_triplos(self, triplos: Iterable[Triplo]):
         """Inserta una lista de triplos en la tabla"""
-        self.rows.extend(triplos)
-    
+        for t in triplos:
+            self._append(t.idx, t.op, t.arg1, t.arg2, t.res)
+
+    def truncate(self, n: int):
+        """Descarta los triplos desde la posición n (inclusive)."""
+        self._compactar()
+        for col in (self._idx, self._op, self._a1, self._a2, self._res):
+            del col[n:]
+
     def mark_position(self) -> int:
         """Marca la posición actual en la tabla de triplos"""
-        return len(self.rows)
+        self._compactar()
+        return len(self._op)
 
     def error(self, lexeme: str = None, message: str = None):
         """
@@ -113,45 +339,50 @@ class TriploTable:
           - PRINT: DO = valor (arg1),    DF = ""
           - ERROR: DO = "", DF = ""   (requisito del compilador)
         IF_FALSE_GOTO queda por defecto como DO = res (etiqueta), DF = condición (arg1).
+
+        Devuelve una vista perezosa (FilasView): los dicts se arman al leerlos.
         """
-        rows = []
-        for r in self.rows:
-            op = r.op
-            DO = r.res or ""
-            
-            # --- LÓGICA DE DF MODIFICADA (PARA COINCIDIR CON PDF) ---
-            
-            # Caso 1: Acumulador (Ej: ADD, t1, 5, t1)
-            #   DO (r.res) es 't1'. r.arg1 es 't1'.
-            #   No queremos "t1, 5", solo queremos "5".
-            if r.res is not None and r.res == r.arg1 and r.arg2 is not None:
-                DF = r.arg2 or ""
-            
-            # Caso 2: Binario estándar (no usado en tu parser, pero bueno tenerlo)
-            elif r.arg1 and r.arg2:
-                DF = f"{r.arg1}, {r.arg2}"
-            
-            # Caso 3: Unario (Ej: :=, 7, None, t1) o (:=, t1, None, $1ITA)
-            else:
-                DF = r.arg1 or r.arg2 or ""
-            # --- FIN DE LÓGICA MODIFICADA ---
-
-            if op == "GOTO":
-                DO, DF = (r.arg1 or ""), ""
-            elif op == "LABEL":
-                DO, DF = (r.arg1 or ""), ""
-            elif op == "PRINT":
-                DO, DF = (r.arg1 or ""), ""
-            elif op == "ERROR":
-                DO, DF = "", ""
-
-            rows.append({
-                "#": r.idx,
-                "OP": op,
-                "DO": DO,
-                "DF": DF,
-            })
-        return rows
+        return FilasView(self)
+
+    def _fila(self, k: int):
+        """Fila k de to_rows() ({"#", "OP", "DO", "DF"})."""
+        pool = self._pool
+        op = OPCODES[self._op[k]]
+        arg1, arg2, res = pool[self._a1[k]], pool[self._a2[k]], pool[self._res[k]]
+        DO = res or ""
+
+        # --- LÓGICA DE DF MODIFICADA (PARA COINCIDIR CON PDF) ---
+
+        # Caso 1: Acumulador (Ej: ADD, t1, 5, t1)
+        #   DO (res) es 't1'. arg1 es 't1'.
+        #   No queremos "t1, 5", solo queremos "5".
+        if res is not None and res == arg1 and arg2 is not None:
+            DF = arg2 or ""
+
+        # Caso 2: Binario estándar (no usado en tu parser, pero bueno tenerlo)
+        elif arg1 and arg2:
+            DF = f"{arg1}, {arg2}"
+
+        # Caso 3: Unario (Ej: :=, 7, None, t1) o (:=, t1, None, $1ITA)
+        else:
+            DF = arg1 or arg2 or ""
+        # --- FIN DE LÓGICA MODIFICADA ---
+
+        if op == "GOTO":
+            DO, DF = (arg1 or ""), ""
+        elif op == "LABEL":
+            DO, DF = (arg1 or ""), ""
+        elif op == "PRINT":
+            DO, DF = (arg1 or ""), ""
+        elif op == "ERROR":
+            DO, DF = "", ""
+
+        return {
+            "#": self._idx[k],
+            "OP": op,
+            "DO": DO,
+            "DF": DF,
+        }
 
     # -------- salida consola (opcional) --------
     def pretty(self) -> str:
@@ -167,15 +398,44 @@ class TriploTable:
 
     # -------- util --------
     def clear(self):
-        self.rows.clear()
+        self._cabeza = self._cola = _Trozo()
+        self._enlazar(self._cola)
+        self._pool[1:] = []
+        self._pool_id.clear()
         self._i = 0
         self._t = 0
         self._l = 0  # Resetear contador de etiquetas
+        self._libres.clear()
+        self._libres_set.clear()
         self._buffer.clear()
         self._buffering = False
 
+    def nbytes(self) -> int:
+        """Bytes de las columnas (sin contar el pool de operandos)."""
+        self._compactar()
+        return sum(col.itemsize * len(col)
+                   for col in (self._idx, self._op, self._a1, self._a2, self._res))
+
+    @property
+    def rows(self) -> TriploView:
+        """Triplos en orden (vista; los Triplo se arman al leerlos)."""
+        return TriploView(self)
+
+    @rows.setter
+    def rows(self, triplos: Iterable[Triplo]):
+        triplos = list(triplos)     # puede ser una vista de esta misma tabla
+        self.truncate(0)
+        self.insert_triplos(triplos)
+
     @property
-    def triplos(self):
+    def triplos(self) -> TriploView:
         """Alias para compatibilidad con código existente"""
         return self.rows
 
+    @classmethod
+    def from_triplos(cls, triplos: Iterable[Triplo]) -> "TriploTable":
+        """Crea una tabla independiente con una copia de la lista de triplos."""
+        tabla = cls()
+        tabla.insert_triplos(triplos)
+        tabla._i = max(tabla._idx, default=0)
+        return tabla
@@ -0,0 +1,333 @@
+# incremental.py
+"""
+Re-análisis incremental del buffer del editor.
+
+El programa se parte en BLOQUES: grupos de líneas completas que contienen
+sentencias de nivel superior completas (terminan en ';' o '}' con todos los
+paréntesis/llaves cerrados y nada más que espacios o '//' hasta el fin de
+línea). Cada bloque se compila por separado y su resultado se guarda con
+números RELATIVOS (renglón, ES#, etiquetas, #), de modo que al editar:
+
+  1. Se comparan las líneas nuevas con las anteriores (prefijo/sufijo común).
+  2. Solo se re-lexean las líneas del medio (más el bloque previo, por si
+     la edición empieza con 'else') y se vuelven a partir en bloques.
+  3. Un bloque se re-parsea solo si cambió su texto o el tipo de alguno de
+     los identificadores que usa (lo único que lee de la tabla de símbolos).
+  4. Se ensambla el resultado renumerando renglones, ES#, etiquetas y
+     triplos de cada bloque. Los temporales no se renumeran: al terminar
+     una sentencia todos quedan libres, así que cada bloque los toma desde
+     t1 igual que en la compilación completa.
+
+El resultado es el mismo que daría compile_source sobre el texto completo.
+Si algún bloque tiene errores sintácticos (la recuperación de yacc puede
+cruzar sentencias) o termina con temporales ocupados, se recurre a
+compile_source completo.
+"""
+import os
+from functools import partial
+
+from compilador import CompilationResult, compile_source
+from contexto import CompilationContext
+from ensamblador import generar_ensamblador
+from icg import Triplo
+from lexer import new_lexer
+from parser import new_parser
+
+
+# ---------------------------
+# Resultado (relativo) de un bloque
+# ---------------------------
+class _ChunkResult:
+    __slots__ = ("symbols", "lexemes", "lex_errors", "n_lex", "sem_errors", "n_codes",
+                 "triplos", "n_emitted", "n_temps", "temps_ocupados", "n_labels", "syntax_errors")
+
+
+class _Chunk:
+    """Bloque de líneas [start, end) del buffer (índices 0-based)."""
+    __slots__ = ("start", "end", "tokens", "lex_errors", "ids",
+                 "deps", "res", "emitted_key", "emitted")
+
+    def __init__(self, start, end, tokens, lex_errors):
+        self.start = start
+        self.end = end
+        self.tokens = tokens            # LexToken con lineno relativo al bloque
+        self.lex_errors = lex_errors    # [(lexema, renglón relativo), ...]
+        self.ids = sorted({t.value for t in tokens if t.type == 'ID'})
+        self.deps = None                # tipos de self.ids con los que se compiló
+        self.res = None                 # _ChunkResult
+        self.emitted_key = None         # (base #, base L) de self.emitted
+        self.emitted = None             # triplos ya renumerados
+
+
+def _code_number(code: str) -> int:
+    return int(code[2:])                # "ES12" -> 12
+
+
+def _shift_name(valor, label_base):
+    """Renumera las etiquetas (L_xxxN) de un operando."""
+    if not valor:
+        return valor
+    if label_base and valor[0] == 'L' and valor.startswith('L_'):
+        i = len(valor)
+        while valor[i - 1].isdigit():
+            i -= 1
+        return f"{valor[:i]}{int(valor[i:]) + label_base}"
+    return valor
+
+
+# ---------------------------
+# Compilador incremental
+# ---------------------------
+class IncrementalCompiler:
+    def __init__(self):
+        self._lines = []        # líneas (con '\n') del último texto analizado
+        self._chunks = []       # bloques en orden
+        self.last_reparsed = 0  # bloques re-parseados en la última actualización
+        self.last_relexed = 0   # líneas re-lexeadas en la última actualización
+
+    def reset(self):
+        self._lines = []
+        self._chunks = []
+
+    # -------- API --------
+    def update(self, codigo: str, progreso=None, cancelar=None) -> CompilationResult:
+        """
+        Analiza el nuevo contenido del buffer reutilizando lo que no cambió.
+        progreso/cancelar se pasan a compile_source si hay que recompilar todo.
+        """
+        lines = codigo.splitlines(keepends=True)
+        self._rechunk(lines)
+        self._lines = lines
+        return self._assemble(progreso, cancelar)
+
+    # -------- 1-2: re-lexeo de la zona cambiada --------
+    def _rechunk(self, lines):
+        old, chunks = self._lines, self._chunks
+        if lines == old and chunks:
+            self.last_relexed = 0
+            return
+        if not chunks:
+            self.last_relexed = len(lines)
+            self._chunks = self._split(lines, 0, len(lines))
+            return
+
+        p = len(os.path.commonprefix([old, lines]))
+        s = len(os.path.commonprefix([old[p:][::-1], lines[p:][::-1]]))
+        delta = len(lines) - len(old)
+
+        # Bloques intactos antes del cambio (menos el último con tokens, por 'else')
+        i = 0
+        while i < len(chunks) and chunks[i].end <= p:
+            i += 1
+        while i > 0:
+            i -= 1
+            if chunks[i].tokens:
+                break
+        # Bloques intactos después del cambio
+        j = len(chunks)
+        while j > i and chunks[j - 1].start >= len(old) - s:
+            j -= 1
+
+        head, tail = chunks[:i], chunks[j:]
+        start = head[-1].end if head else 0
+        while True:
+            end = tail[0].start + delta if tail else len(lines)
+            middle = self._split(lines, start, end)
+            if middle is not None:
+                break
+            # La zona no cerró: se absorbe el siguiente bloque (o todo el resto
+            # si quedó un '/*' abierto) y se reintenta
+            tail = [] if self._open_comment else tail[1:]
+
+        self.last_relexed = end - start
+        for ch in tail:
+            ch.start += delta
+            ch.end += delta
+        self._chunks = head + middle + tail
+
+    def _split(self, lines, start, end):
+        """
+        Lexea las líneas [start, end) y las parte en bloques. Devuelve None si
+        la zona termina con una sentencia abierta y aún quedan líneas después.
+        """
+        self._open_comment = False
+        if start >= end:
+            return []
+        abierta = end < len(lines)
+        texto = "".join(lines[start:end])
+        ctx = CompilationContext()
+        lx = new_lexer(ctx)
+        lx.input(texto)
+        tokens = list(lx)
+        lex_errors = [(e[1], e[2]) for e in ctx.error_table.rows()]
+
+        # '/*' sin cerrar: en el texto completo podría cerrar más adelante
+        for a, b in zip(tokens, tokens[1:]):
+            if a.type == 'DIV' and b.type == 'MULT' and b.lexpos == a.lexpos + 1:
+                self._open_comment = True
+                if abierta:
+                    return None
+                break
+
+        # Fronteras: (índice del último token, renglón relativo) de cada bloque
+        fronteras = []
+        depth = 0
+        n = len(tokens)
+        for k, tok in enumerate(tokens):
+            ty = tok.type
+            if ty in ('LPAREN', 'LBRACE'):
+                depth += 1
+                continue
+            if ty in ('RPAREN', 'RBRACE'):
+                depth -= 1
+                if ty == 'RPAREN' or depth:
+                    continue
+            elif ty != 'PUNTOYCOMA' or depth:
+                continue
+            if k + 1 < n:
+                nxt = tokens[k + 1]
+                if nxt.type == 'ELSE' or nxt.lineno == tok.lineno:
+                    continue
+            fin = texto.find('\n', tok.lexpos)
+            resto = texto[tok.lexpos + 1:fin if fin >= 0 else len(texto)].strip()
+            if resto and not resto.startswith('//'):
+                continue
+            fronteras.append((k, tok.lineno))
+
+        ultimo = fronteras[-1][0] if fronteras else -1
+        if ultimo < n - 1 and abierta:
+            return None
+
+        chunks = []
+        t0, l0 = 0, 1                       # primer token / primer renglón relativo
+        for k, renglon in fronteras:
+            chunks.append(self._make_chunk(start, tokens, t0, k + 1, l0, renglon, lex_errors))
+            t0, l0 = k + 1, renglon + 1
+        total = end - start
+        if t0 < n or l0 <= total:
+            # Resto sin frontera (o solo espacios/comentarios/errores léxicos)
+            chunks.append(self._make_chunk(start, tokens, t0, n, l0, total, lex_errors))
+        return chunks
+
+    @staticmethod
+    def _make_chunk(start, tokens, t0, t1, l0, l1, lex_errors):
+        """Bloque con los tokens [t0, t1) que ocupan los renglones relativos [l0, l1]."""
+        off = l0 - 1
+        toks = tokens[t0:t1]
+        for tok in toks:
+            tok.lineno -= off
+        errs = [(lex, ren - off) for lex, ren in lex_errors if l0 <= ren <= l1]
+        return _Chunk(start + l0 - 1, start + l1, toks, errs)
+
+    # -------- 3: compilación de un bloque --------
+    @staticmethod
+    def _compile_chunk(chunk, symbols):
+        ctx = CompilationContext()
+        for name in chunk.ids:
+            tipo = symbols.get(name)
+            if tipo is not None:
+                ctx.symbol_table.add(name, tipo)
+        previos = set(ctx.symbol_table.symbols)
+
+        for lexema, renglon in chunk.lex_errors:
+            ctx.error_table.add(None, lexema, renglon, "No válido")
+        n_lex = ctx.error_table.counter
+        for tok in chunk.tokens:
+            ctx.lexeme_table.add_token(tok)
+
+        new_parser(ctx).parse(lexer=new_lexer(ctx), tokenfunc=partial(next, iter(chunk.tokens), None))
+
+        res = _ChunkResult()
+        res.symbols = [(k, v) for k, v in ctx.symbol_table.rows() if k not in previos]
+        res.lexemes = list(ctx.lexeme_table.items.items())
+        res.lex_errors, res.sem_errors = [], []
+        for e in ctx.error_table.errors:
+            n = _code_number(e['Token'])
+            dest = res.lex_errors if n <= n_lex else res.sem_errors
+            dest.append((n, e['Lexema'], e['Renglón'], e['Descripción']))
+        res.n_lex = n_lex
+        res.n_codes = ctx.error_table.counter
+        rows = ctx.trip.triplos
+        if rows and rows[-1].op == 'HALT':
+            rows = rows[:-1]
+        res.triplos = [(r.idx, r.op, r.arg1, r.arg2, r.res) for r in rows]
+        res.n_emitted = ctx.trip._i - 1
+        res.n_temps = ctx.trip._t
+        res.temps_ocupados = ctx.trip.temps_ocupados()
+        res.n_labels = ctx.trip._l
+        res.syntax_errors = ctx.syntax_errors
+        return res
+
+    # -------- 4: ensamblado --------
+    def _assemble(self, progreso=None, cancelar=None) -> CompilationResult:
+        ctx = CompilationContext()
+        symbols = ctx.symbol_table.symbols
+        lexemes = ctx.lexeme_table
+        trip = ctx.trip
+        lex_errors, sem_errors = [], []
+        n_lex_total = 0
+        idx_base = label_base = n_temps = 0
+        self.last_reparsed = 0
+
+        for ch in self._chunks:
+            deps = tuple(symbols.get(name) for name in ch.ids)
+            if ch.res is None or ch.deps != deps:
+                ch.res = self._compile_chunk(ch, symbols)
+                ch.deps = deps
+                ch.emitted_key = None
+                self.last_reparsed += 1
+            res = ch.res
+            if res.syntax_errors or res.temps_ocupados:
+                self.last_reparsed = len(self._chunks)
+                return compile_source("".join(self._lines), progreso=progreso, cancelar=cancelar)
+
+            for name, tipo in res.symbols:
+                symbols[name] = tipo
+            for lex, tipo in res.lexemes:
+                lexemes.add(lex, tipo)
+
+            off = ch.start
+            lex_errors.extend((n_lex_total + n, lex, ren + off, desc)
+                              for n, lex, ren, desc in res.lex_errors)
+            sem_errors.append((res, off))
+            n_lex_total += res.n_lex
+
+            key = (idx_base, label_base)
+            if ch.emitted_key != key:
+                ch.emitted = [
+                    Triplo(idx + idx_base, op,
+                           _shift_name(a1, label_base),
+                           _shift_name(a2, label_base),
+                           _shift_name(r, label_base))
+                    for idx, op, a1, a2, r in res.triplos
+                ]
+                ch.emitted_key = key
+            trip.insert_triplos(ch.emitted)
+            idx_base += res.n_emitted
+            n_temps = max(n_temps, res.n_temps)
+            label_base += res.n_labels
+
+        # Errores: primero todos los léxicos, luego los semánticos (como compile_source)
+        errors = ctx.error_table
+        for n, lex, ren, desc in lex_errors:
+            errors.add(f"ES{n}", lex, ren, desc)
+        base = n_lex_total
+        for res, off in sem_errors:
+            for n, lex, ren, desc in res.sem_errors:
+                errors.add(f"ES{base + n - res.n_lex}", lex, ren + off, desc)
+            base += res.n_codes - res.n_lex
+        errors.counter = base
+
+        trip._i, trip._t, trip._l = idx_base, n_temps, label_base
+        trip.add('HALT', res='...')
+
+        for lexema, tipo in ctx.symbol_table.rows():
+            lexemes.set_type_if_id(lexema, tipo)
+
+        return CompilationResult(
+            lexemes=lexemes.rows(),
+            symbols=ctx.symbol_table.rows(),
+            errors=errors.rows(),
+            triplos=trip,
+            asm=generar_ensamblador(trip.triplos),
+        )
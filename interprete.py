@@ -0,0 +1,300 @@
+# interprete.py
+"""
+Máquina virtual de triplos: ejecuta lo que produce el compilador.
+
+    res = compile_source(codigo)
+    ej = ejecutar(res.triplos.triplos, dict(res.symbols))
+    ej.variables        # {"$1A": 7, "$2B": 2.5, ...}
+    ej.instrucciones    # triplos ejecutados (sin contar LABEL)
+    ej.por_op           # {"ADD": 120, "IF_FALSE_GOTO": 11, ...}
+    ej.segundos         # tiempo de pared de la ejecución
+
+    python -m compilador programa.txt --ejecutar
+
+Antes de ejecutar, los triplos se decodifican una vez (Programa):
+
+  - cada nombre y cada literal ocupa una casilla de una lista `mem` (los
+    literales se cargan ya convertidos: 5, 2.5, "hola"), así un operando es
+    siempre mem[i];
+  - cada triplo se convierte en una función sin argumentos que hace su
+    operación y devuelve el índice del siguiente; el ciclo principal es
+    solo `pc = codigo[pc]()`;
+  - las etiquetas se resuelven a índices y los LABEL/ERROR desaparecen del
+    código.
+
+Valores (los tipos del lenguaje):
+  cat   int. / entre dos cat trunca hacia cero y % toma el signo del
+        dividendo (como IDIV). Sin desbordamiento: es el valor del programa,
+        no el de los registros de 16 bits del ensamblador.
+  cats  float; si interviene un cats la operación es real. Guardar un cat
+        en una variable cats lo convierte (widening, como en el parser),
+        sea con := o con una operación que la tiene de destino.
+  meow  str; + concatena y se pueden comparar con == y !=.
+Las comparaciones dan 1 o 0. Las variables empiezan en 0, 0.0 o "".
+"""
+import operator
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+_INICIAL = {"cat": 0, "cats": 0.0, "meow": ""}
+_NO_EJECUTABLES = frozenset(("LABEL", "ERROR"))
+
+
+class ErrorEjecucion(Exception):
+    """Error al ejecutar (división entre cero, tipos, límite de pasos...)."""
+
+
+@dataclass
+class Ejecucion:
+    variables: Dict[str, object] = field(default_factory=dict)
+    instrucciones: int = 0
+    por_op: Dict[str, int] = field(default_factory=dict)
+    segundos: float = 0.0
+    salida: List[object] = field(default_factory=list)      # valores de PRINT
+
+
+def _literal(texto):
+    """Valor de un literal ("hola", 5, 2.5) o None si es un nombre."""
+    if texto[0] == '"':
+        return texto[1:-1]
+    if texto[0].isdigit() or texto[0] == "-":
+        try:
+            return int(texto)
+        except ValueError:
+            pass
+        try:
+            return float(texto)
+        except ValueError:
+            pass
+    return None
+
+
+def _div(x, y):
+    if x.__class__ is int and y.__class__ is int:
+        q = abs(x) // abs(y)
+        return q if (x < 0) == (y < 0) else -q
+    return x / y
+
+
+def _mod(x, y):
+    if x.__class__ is not int or y.__class__ is not int:
+        raise TypeError("% requiere enteros (cat)")
+    r = abs(x) % abs(y)
+    return r if x >= 0 else -r
+
+
+class Programa:
+    """Triplos decodificados, listos para ejecutarse (una o varias veces)."""
+
+    def __init__(self, triplos, tipos=None):
+        triplos = list(triplos)
+        tipos = tipos or {}
+        self._casilla: Dict[str, int] = {}
+        self._inicial: List[object] = []
+        self._tipos = tipos
+        for nombre in tipos:
+            self._nombre(nombre)
+
+        # Etiqueta -> índice de la primera instrucción después de ella
+        destinos = {}
+        n = 0
+        for t in triplos:
+            if t.op == "LABEL":
+                destinos[t.arg1] = n
+            elif t.op not in _NO_EJECUTABLES:
+                n += 1
+
+        self.mem: List[object] = []         # se llena al terminar (las funciones la capturan)
+        self._entrada = [iter(())]
+        self._salida: List[object] = []
+        self.ops: List[str] = []            # op de cada instrucción
+        self.idx: List[int] = []            # triplo de origen
+        self.codigo = []
+        for t in triplos:
+            if t.op in _NO_EJECUTABLES:
+                continue
+            sig = len(self.codigo) + 1
+            self.codigo.append(self._decodificar(t, sig, n, destinos))
+            self.ops.append(t.op)
+            self.idx.append(t.idx)
+        self.mem.extend(self._inicial)
+
+    # -- casillas --------------------------------------------------------
+    def _nombre(self, x) -> int:
+        i = self._casilla.get(x)
+        if i is None:
+            i = self._casilla[x] = len(self._inicial)
+            valor = _literal(x)
+            if valor is None:
+                valor = _INICIAL.get(self._tipos.get(x), 0)
+            self._inicial.append(valor)
+        return i
+
+    def _decodificar(self, t, sig, fin, destinos):
+        op = t.op
+        mem = self.mem
+
+        def destino(etiqueta):
+            if etiqueta not in destinos:
+                raise ErrorEjecucion(f"triplo {t.idx}: etiqueta {etiqueta} no definida")
+            return destinos[etiqueta]
+
+        if op == ":=":
+            a, r = self._nombre(t.arg1), self._nombre(t.res)
+            if self._tipos.get(t.res) == "cats":
+                def f():
+                    v = mem[a]
+                    mem[r] = float(v) if v.__class__ is int else v
+                    return sig
+            else:
+                def f():
+                    mem[r] = mem[a]
+                    return sig
+        elif op == "ADD":
+            a, b, r = self._nombre(t.arg1), self._nombre(t.arg2), self._nombre(t.res)
+
+            def f():
+                mem[r] = mem[a] + mem[b]
+                return sig
+        elif op == "SUB":
+            a, b, r = self._nombre(t.arg1), self._nombre(t.arg2), self._nombre(t.res)
+
+            def f():
+                mem[r] = mem[a] - mem[b]
+                return sig
+        elif op == "MUL":
+            a, b, r = self._nombre(t.arg1), self._nombre(t.arg2), self._nombre(t.res)
+
+            def f():
+                x, y = mem[a], mem[b]
+                if x.__class__ is str or y.__class__ is str:
+                    raise TypeError("* con meow")
+                mem[r] = x * y
+                return sig
+        elif op == "DIV":
+            a, b, r = self._nombre(t.arg1), self._nombre(t.arg2), self._nombre(t.res)
+
+            def f():
+                mem[r] = _div(mem[a], mem[b])
+                return sig
+        elif op == "MOD":
+            a, b, r = self._nombre(t.arg1), self._nombre(t.arg2), self._nombre(t.res)
+
+            def f():
+                mem[r] = _mod(mem[a], mem[b])
+                return sig
+        elif op == "NEG":
+            a, r = self._nombre(t.arg1), self._nombre(t.res)
+
+            def f():
+                mem[r] = -mem[a]
+                return sig
+        elif op in _COMPARAR:
+            a, b, r = self._nombre(t.arg1), self._nombre(t.arg2), self._nombre(t.res)
+            f = _COMPARAR[op](mem, a, b, r, sig)
+        elif op == "IF_FALSE_GOTO":
+            a, salto = self._nombre(t.arg1), destino(t.res)
+
+            def f():
+                return sig if mem[a] else salto
+        elif op == "GOTO":
+            salto = destino(t.arg1)
+
+            def f():
+                return salto
+        elif op == "HALT":
+            def f():
+                return fin
+        elif op == "PRINT":
+            a, salida = self._nombre(t.arg1), self._salida
+
+            def f():
+                salida.append(mem[a])
+                return sig
+        elif op == "READ":
+            r, entrada = self._nombre(t.res), self._entrada
+
+            def f():
+                mem[r] = next(entrada[0], 0)
+                return sig
+        else:
+            raise ErrorEjecucion(f"triplo {t.idx}: operador no soportado {op}")
+        if op in _OPERACIONES and self._tipos.get(t.res) == "cats":
+            # -O escribe operaciones directo en la variable (OP a, b -> $x
+            # en vez de pasar por := ): también se convierten
+            f = _a_real(f, mem, self._nombre(t.res))
+        return f
+
+    # -- ejecución -------------------------------------------------------
+    def ejecutar(self, entrada=(), limite=None) -> Ejecucion:
+        """
+        Ejecuta desde el principio. entrada: valores para READ. limite:
+        máximo de instrucciones (ErrorEjecucion si se pasa; para ciclos
+        infinitos).
+        """
+        mem = self.mem
+        mem[:] = self._inicial
+        self._entrada[0] = iter(entrada)
+        del self._salida[:]
+        codigo = self.codigo
+        fin = len(codigo)
+        veces = [0] * (fin + 1)
+        pc = 0
+        inicio = time.perf_counter()
+        try:
+            if limite is None:
+                while pc < fin:
+                    veces[pc] += 1
+                    pc = codigo[pc]()
+            else:
+                pasos = 0
+                while pc < fin:
+                    veces[pc] += 1
+                    pasos += 1
+                    if pasos > limite:
+                        raise ErrorEjecucion(f"se pasó el límite de {limite} instrucciones")
+                    pc = codigo[pc]()
+        except (TypeError, ZeroDivisionError, ValueError, OverflowError) as e:
+            raise ErrorEjecucion(f"triplo {self.idx[pc]} ({self.ops[pc]}): {e}") from e
+        segundos = time.perf_counter() - inicio
+
+        por_op: Dict[str, int] = {}
+        for op, k in zip(self.ops, veces):
+            if k:
+                por_op[op] = por_op.get(op, 0) + k
+        variables = {x: mem[i] for x, i in self._casilla.items() if x[0] == "$"}
+        return Ejecucion(variables, sum(veces), por_op, segundos, list(self._salida))
+
+
+def _comparacion(operacion):
+    def fabrica(mem, a, b, r, sig):
+        def f():
+            mem[r] = 1 if operacion(mem[a], mem[b]) else 0
+            return sig
+        return f
+    return fabrica
+
+
+_COMPARAR = {
+    "GT": _comparacion(operator.gt), "GTE": _comparacion(operator.ge),
+    "LT": _comparacion(operator.lt), "LTE": _comparacion(operator.le),
+    "EQ": _comparacion(operator.eq), "NEQ": _comparacion(operator.ne),
+}
+_OPERACIONES = frozenset(("ADD", "SUB", "MUL", "DIV", "MOD", "NEG")) | frozenset(_COMPARAR)
+
+
+def _a_real(f, mem, r):
+    """f, pero el resultado que deja en mem[r] pasa a float si es int (cat -> cats)."""
+    def g():
+        sig = f()
+        v = mem[r]
+        if v.__class__ is int:
+            mem[r] = float(v)
+        return sig
+    return g
+
+
+def ejecutar(triplos, tipos=None, entrada=(), limite=None) -> Ejecucion:
+    """Decodifica y ejecuta una vez (ver Programa para ejecutar varias)."""
+    return Programa(triplos, tipos).ejecutar(entrada, limite)
@@ -1,6 +1,9 @@
 #lexer.py
+import importlib.util
+from functools import partial
+from itertools import islice
 import ply.lex as lex
-from tables import error_table  # Para registrar "No válido" en la tabla de errores
+from contexto import default_context  # t_error registra "No válido" en ctx.error_table
 
 tokens = (
     'ID', 'BADID', 'ENTERO', 'REAL', 'CADENA',
@@ -116,12 +119,72 @@ def t_error(t):
     m = re.match(r'[^ \t\n;{}(),]+', t.value)
     if m:
         lexema = m.group(0)
-        error_table.add(None, lexema, t.lineno, "No válido")
+        t.lexer.ctx.error_table.add(None, lexema, t.lineno, "No válido")
         t.lexer.skip(len(lexema))
     else:
         # Caso aislado (carácter suelto)
-        error_table.add(None, t.value[0], t.lineno, "No válido")
+        t.lexer.ctx.error_table.add(None, t.value[0], t.lineno, "No válido")
         t.lexer.skip(1)
 
-lexer = lex.lex()
- 
\ No newline at end of file
+# Tablas precompiladas (lextab.py, ver generar_tablas.py): se cargan sin
+# volver a inspeccionar/validar las reglas. Si no están, el lexer se arma en
+# memoria (lex.lex sin optimize nunca escribe archivos junto al código).
+if importlib.util.find_spec("lextab") is not None:
+    lexer = lex.lex(optimize=True, lextab="lextab")
+else:
+    lexer = lex.lex()
+lexer.ctx = default_context
+
+def new_lexer(ctx):
+    """
+    Lexer independiente (clon del global) ligado a un CompilationContext.
+    Cada compilación usa el suyo, así no comparten lineno/lexpos ni tablas.
+    """
+    lx = lexer.clone()
+    lx.ctx = ctx
+    lx.lineno = 1
+    return lx
+ 
+
+# ---------- Flujo de tokens (una sola pasada) ----------
+class TokenStream:
+    """
+    Tokeniza el código UNA sola vez y lo comparte entre la tabla de lexemas
+    y el parser:
+
+        stream = TokenStream(lx, codigo)      # lexea y llena ctx.lexeme_table
+        parser.parse(lexer=lx, tokenfunc=stream.token)
+
+    Todo el lexeo ocurre en el constructor (igual que la antigua primera
+    pasada), así los errores léxicos quedan en la tabla antes que los
+    semánticos y la numeración ES# no cambia.
+
+    revisar: callable opcional que se llama cada REVISAR_CADA tokens durante
+    el lexeo (compile_source lo usa para poder cancelar).
+    """
+    REVISAR_CADA = 1024
+
+    def __init__(self, lexer, codigo, revisar=None):
+        self.lexer = lexer
+        lexer.input(codigo)
+        if revisar is None:
+            self.tokens = list(lexer)
+        else:
+            self.tokens = []
+            it = iter(lexer)
+            while True:
+                parte = list(islice(it, self.REVISAR_CADA))
+                if not parte:
+                    break
+                self.tokens.extend(parte)
+                revisar()
+
+        lexeme_table = lexer.ctx.lexeme_table
+        for tok in self.tokens:
+            lexeme_table.add_token(tok)
+
+        # Adaptador para yacc: devuelve el siguiente token o None al final
+        self.token = partial(next, iter(self.tokens), None)
+
+    def __len__(self):
+        return len(self.tokens)
@@ -0,0 +1,319 @@
+# lexer_dfa.py
+"""
+Lexer escrito a mano, alternativa a la expresión maestra de PLY (lexer.py).
+
+PLY arma UNA expresión regular con todas las reglas (t_comment_line | ... |
+t_ID | operadores) y en cada posición las prueba en orden hasta que una
+encaja. Aquí el primer carácter decide, con una tabla, qué regla puede
+aplicar (como la primera transición de un AFD) y esa regla se reconoce de
+una sola pasada, sin reintentar las demás:
+
+    espacio/tab/NBSP  -> ignorar         '\\n'   -> salto(s) de línea
+    '/'               -> // , /* */ o DIV
+    letra de keyword  -> TIPO/FOR/IF/ELSE/WHILE/DO (con límite de palabra)
+    dígito            -> REAL, ENTERO o BADID
+    '"'               -> CADENA          '$'    -> ID
+    operador/signo    -> tabla de operadores (2 caracteres antes que 1)
+    cualquier otro    -> error léxico (mismo agrupamiento que t_error)
+
+Produce exactamente los mismos tokens (tipo, valor, renglón, lexpos) y los
+mismos errores "No válido" que lexer.py, incluidas sus rarezas: por ejemplo
+el lookahead de t_ENTERO (\\d+(?![A-Z$])) hace que "12A" sea ENTERO 1 +
+BADID 2A, y \\d acepta dígitos Unicode.
+
+    lx = new_dfa_lexer(ctx)     # misma interfaz que lexer.new_lexer(ctx)
+    lx.input(codigo)
+    for tok in lx: ...
+"""
+import re
+
+from ply.lex import LexToken
+
+# ---------------------------
+# Tablas
+# ---------------------------
+_IGNORAR = " \t\u00a0"                     # t_ignore (incluye NBSP)
+_MAYUSC_O_PESO = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ$")  # lookahead (?![A-Z$])
+
+# Operadores: primero los de 2 caracteres (PLY ordena las reglas-cadena por largo)
+_OPERADORES_2 = {
+    ">=": "MAYORIGUAL", "<=": "MENORIGUAL", "==": "IGUAL", "!=": "DIF",
+    "&&": "AND", "||": "OR",
+}
+_OPERADORES_1 = {
+    ">": "MAYOR", "<": "MENOR", "=": "ASIGNACION", "+": "MAS", "-": "MENOS",
+    "*": "MULT", "/": "DIV", "%": "MOD", "(": "LPAREN", ")": "RPAREN",
+    "{": "LBRACE", "}": "RBRACE", ",": "COMA", ";": "PUNTOYCOMA",
+}
+
+# Palabras reservadas por letra inicial, en el orden de lexer.py
+_RESERVADAS = {
+    "c": (("cats", "TIPO"), ("cat", "TIPO")),
+    "m": (("meow", "TIPO"),),
+    "f": (("for", "FOR"),),
+    "i": (("if", "IF"),),
+    "e": (("else", "ELSE"),),
+    "w": (("while", "WHILE"),),
+    "d": (("do", "DO"),),
+}
+
+# Clases de carácter (primera transición)
+(_C_IGNORAR, _C_NL, _C_BARRA, _C_LETRA, _C_DIGITO, _C_COMILLA, _C_PESO,
+ _C_OPERADOR, _C_ERROR) = range(9)
+
+_CLASE = {}
+for _c in _IGNORAR:
+    _CLASE[_c] = _C_IGNORAR
+for _c in _OPERADORES_1:
+    _CLASE[_c] = _C_OPERADOR
+for _c in "!&|":
+    _CLASE[_c] = _C_OPERADOR
+for _c in _RESERVADAS:
+    _CLASE[_c] = _C_LETRA
+_CLASE["\n"] = _C_NL
+_CLASE["/"] = _C_BARRA
+_CLASE['"'] = _C_COMILLA
+_CLASE["$"] = _C_PESO
+# Dígitos: \d de Python (cualquier dígito decimal Unicode) -> c.isdecimal() en token()
+
+# Corridas de caracteres (cada una se recorre una sola vez)
+_DIGITOS = re.compile(r"\d+")
+_ALNUM = re.compile(r"[0-9A-Z]*")
+_ID = re.compile(r"\$[0-9]+[A-Z][0-9A-Z]*")
+_HASTA_NL = re.compile(r"[^\n]*")
+_NLS = re.compile(r"\n+")
+_COMENTARIO = re.compile(r"/\*[^*]*\*+([^/*][^*]*\*+)*/")
+_CADENA = re.compile(r'"([^\\\n]|(\\.))*?"')
+_PALABRA = re.compile(r"\w")
+_ERROR = re.compile(r"[^ \t\n;{}(),]+")        # agrupamiento de t_error
+
+
+def _tok(tipo, valor, lineno, lexpos):
+    t = LexToken()
+    t.type = tipo
+    t.value = valor
+    t.lineno = lineno
+    t.lexpos = lexpos
+    return t
+
+
+# ---------------------------
+# Lexer
+# ---------------------------
+class DFALexer:
+    """Misma interfaz que el lexer de PLY que usan TokenStream y el parser."""
+
+    # True si lexdata puede continuar (StreamLexer): un '/*' sin cerrar se
+    # deja pendiente en lugar de reconocerse como DIV
+    _mas_texto = False
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.lexdata = ""
+        self.lexpos = 0
+        self.lexlen = 0
+        self.lineno = 1
+
+    def clone(self):
+        c = DFALexer(self.ctx)
+        c.lineno = self.lineno
+        return c
+
+    def input(self, s):
+        self.lexdata = s
+        self.lexpos = 0
+        self.lexlen = len(s)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        t = self.token()
+        if t is None:
+            raise StopIteration
+        return t
+
+    next = __next__
+
+    def _error(self, pos):
+        lexema = _ERROR.match(self.lexdata, pos).group(0)
+        self.ctx.error_table.add(None, lexema, self.lineno, "No válido")
+        return pos + len(lexema)
+
+    def token(self):
+        s = self.lexdata
+        n = self.lexlen
+        pos = self.lexpos
+        while pos < n:
+            c = s[pos]
+            k = _CLASE.get(c)
+            if k is None:
+                k = _C_DIGITO if c.isdecimal() else _C_ERROR
+
+            if k == _C_IGNORAR:
+                pos += 1
+                continue
+
+            if k == _C_NL:
+                fin = _NLS.match(s, pos).end()
+                self.lineno += fin - pos
+                pos = fin
+                continue
+
+            if k == _C_OPERADOR:
+                tipo = _OPERADORES_2.get(s[pos:pos + 2])
+                if tipo is not None:
+                    self.lexpos = pos + 2
+                    return _tok(tipo, s[pos:pos + 2], self.lineno, pos)
+                tipo = _OPERADORES_1.get(c)
+                if tipo is not None:
+                    self.lexpos = pos + 1
+                    return _tok(tipo, c, self.lineno, pos)
+                pos = self._error(pos)              # '!', '&' o '|' sueltos
+                continue
+
+            if k == _C_BARRA:
+                sig = s[pos + 1:pos + 2]
+                if sig == "/":
+                    pos = _HASTA_NL.match(s, pos).end()
+                    continue
+                if sig == "*":
+                    m = _COMENTARIO.match(s, pos)
+                    if m is not None:
+                        self.lineno += m.group(0).count("\n")
+                        pos = m.end()
+                        continue
+                    if self._mas_texto:
+                        self.lexpos = pos
+                        return None
+                self.lexpos = pos + 1
+                return _tok("DIV", "/", self.lineno, pos)
+
+            if k == _C_LETRA:
+                for palabra, tipo in _RESERVADAS[c]:
+                    fin = pos + len(palabra)
+                    if s.startswith(palabra, pos) and (fin == n or not _PALABRA.match(s, fin)):
+                        self.lexpos = fin
+                        return _tok(tipo, palabra, self.lineno, pos)
+                pos = self._error(pos)
+                continue
+
+            if k == _C_DIGITO:
+                fin = _DIGITOS.match(s, pos).end()
+                # REAL: \d+\.\d+(?![A-Z$])  (el 2º \d+ puede ceder un dígito)
+                if fin < n and s[fin] == ".":
+                    m = _DIGITOS.match(s, fin + 1)
+                    if m is not None:
+                        f2 = m.end()
+                        if f2 == n or s[f2] not in _MAYUSC_O_PESO:
+                            self.lexpos = f2
+                            return _tok("REAL", float(s[pos:f2]), self.lineno, pos)
+                        if f2 - fin > 2:
+                            self.lexpos = f2 - 1
+                            return _tok("REAL", float(s[pos:f2 - 1]), self.lineno, pos)
+                # ENTERO: \d+(?![A-Z$])  (ídem)
+                if fin == n or s[fin] not in _MAYUSC_O_PESO:
+                    self.lexpos = fin
+                    return _tok("ENTERO", int(s[pos:fin]), self.lineno, pos)
+                if fin - pos > 1:
+                    self.lexpos = fin - 1
+                    return _tok("ENTERO", int(s[pos:fin - 1]), self.lineno, pos)
+                # BADID: \d+[A-Z][0-9A-Z]*  (aquí: un solo dígito seguido de letra)
+                if s[fin] != "$":
+                    f2 = _ALNUM.match(s, fin + 1).end()
+                    self.lexpos = f2
+                    return _tok("BADID", s[pos:f2], self.lineno, pos)
+                pos = self._error(pos)
+                continue
+
+            if k == _C_COMILLA:
+                m = _CADENA.match(s, pos)
+                if m is not None:
+                    self.lexpos = m.end()
+                    return _tok("CADENA", m.group(0), self.lineno, pos)
+                pos = self._error(pos)
+                continue
+
+            if k == _C_PESO:
+                m = _ID.match(s, pos)
+                if m is not None:
+                    self.lexpos = m.end()
+                    return _tok("ID", m.group(0), self.lineno, pos)
+                pos = self._error(pos)
+                continue
+
+            pos = self._error(pos)
+
+        self.lexpos = pos
+        return None
+
+
+def new_dfa_lexer(ctx):
+    """Equivalente a lexer.new_lexer(ctx) con el lexer escrito a mano."""
+    return DFALexer(ctx)
+
+
+# ---------------------------
+# Lexer en streaming (archivos grandes)
+# ---------------------------
+class StreamLexer(DFALexer):
+    """
+    DFALexer que lee la fuente por bloques en lugar de recibir todo el texto.
+
+    Solo tokeniza líneas COMPLETAS: ningún token cruza un '\n' (cadenas,
+    comentarios //, errores y lookaheads terminan antes), así que lo leído
+    hasta el último '\n' se puede lexear sin mirar más adelante. La única
+    excepción es un comentario /* */ que sigue abierto: se deja pendiente y
+    se reintenta con el siguiente bloque. Los renglones siguen contándose en
+    el lexer y lexpos es absoluto (posición en todo el texto), igual que con
+    el texto completo.
+
+    fuente: objeto con read(n) -> str (archivo abierto en modo texto).
+    """
+    BLOQUE = 1 << 16        # caracteres por lectura
+
+    def __init__(self, ctx, fuente):
+        super().__init__(ctx)
+        self._fuente = fuente
+        self._resto = ""    # leído pero sin '\n' final (línea incompleta)
+        self._base = 0      # posición absoluta de lexdata[0]
+        self._leido = False  # la fuente ya no tiene más texto
+        self._mas_texto = True
+
+    def clone(self):
+        raise TypeError("StreamLexer no se puede clonar (consume su fuente)")
+
+    def token(self):
+        while True:
+            tok = DFALexer.token(self)
+            if tok is not None:
+                tok.lexpos += self._base
+                return tok
+            if not self._rellenar():
+                return None
+
+    def _rellenar(self):
+        """Descarta lo ya lexeado y agrega las siguientes líneas completas."""
+        if self._leido:
+            return False
+        partes = [self._resto]
+        while True:
+            bloque = self._fuente.read(self.BLOQUE)
+            if not bloque:
+                self._leido = True
+                break
+            partes.append(bloque)
+            if "\n" in bloque:
+                break
+        texto = "".join(partes)
+        if self._leido:
+            self._resto = ""
+        else:
+            k = texto.rfind("\n") + 1
+            texto, self._resto = texto[:k], texto[k:]
+
+        pendiente = self.lexdata[self.lexpos:]      # p.ej. un '/*' abierto
+        self._base += self.lexpos
+        self.input(pendiente + texto)
+        self._mas_texto = not self._leido
+        return True
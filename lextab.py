@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'ASIGNACION', 'BADID', 'CADENA', 'COMA', 'DIF', 'DIV', 'DO', 'ELSE', 'ENTERO', 'FOR', 'ID', 'IF', 'IGUAL', 'LBRACE', 'LPAREN', 'MAS', 'MAYOR', 'MAYORIGUAL', 'MENOR', 'MENORIGUAL', 'MENOS', 'MOD', 'MULT', 'OR', 'PUNTOYCOMA', 'RBRACE', 'REAL', 'RPAREN', 'TIPO', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_comment_line>//[^\\n]*)|(?P<t_comment_block>/\\*[^*]*\\*+([^/*][^*]*\\*+)*/)|(?P<t_newline>\\n+)|(?P<t_TIPO>(cats|cat|meow)\\b)|(?P<t_FOR>for\\b)|(?P<t_IF>if\\b)|(?P<t_ELSE>else\\b)|(?P<t_WHILE>while\\b)|(?P<t_DO>do\\b)|(?P<t_REAL>\\d+\\.\\d+(?![A-Z$]))|(?P<t_ENTERO>\\d+(?![A-Z$]))|(?P<t_CADENA>"([^\\\\\\n]|(\\\\.))*?")|(?P<t_BADID>\\d+[A-Z][0-9A-Z]*)|(?P<t_ID>\\$[0-9]+[A-Z][0-9A-Z]*)|(?P<t_OR>\\|\\|)|(?P<t_MAYORIGUAL>>=)|(?P<t_MENORIGUAL><=)|(?P<t_IGUAL>==)|(?P<t_DIF>!=)|(?P<t_AND>&&)|(?P<t_MAS>\\+)|(?P<t_MULT>\\*)|(?P<t_LPAREN>\\()|(?P<t_RPAREN>\\))|(?P<t_LBRACE>\\{)|(?P<t_RBRACE>\\})|(?P<t_MAYOR>>)|(?P<t_MENOR><)|(?P<t_ASIGNACION>=)|(?P<t_MENOS>-)|(?P<t_DIV>/)|(?P<t_MOD>%)|(?P<t_COMA>,)|(?P<t_PUNTOYCOMA>;)', [None, ('t_comment_line', 'comment_line'), ('t_comment_block', 'comment_block'), None, ('t_newline', 'newline'), ('t_TIPO', 'TIPO'), None, ('t_FOR', 'FOR'), ('t_IF', 'IF'), ('t_ELSE', 'ELSE'), ('t_WHILE', 'WHILE'), ('t_DO', 'DO'), ('t_REAL', 'REAL'), ('t_ENTERO', 'ENTERO'), ('t_CADENA', 'CADENA'), None, None, ('t_BADID', 'BADID'), ('t_ID', 'ID'), (None, 'OR'), (None, 'MAYORIGUAL'), (None, 'MENORIGUAL'), (None, 'IGUAL'), (None, 'DIF'), (None, 'AND'), (None, 'MAS'), (None, 'MULT'), (None, 'LPAREN'), (None, 'RPAREN'), (None, 'LBRACE'), (None, 'RBRACE'), (None, 'MAYOR'), (None, 'MENOR'), (None, 'ASIGNACION'), (None, 'MENOS'), (None, 'DIV'), (None, 'MOD'), (None, 'COMA'), (None, 'PUNTOYCOMA')])]}
+_lexstateignore = {'INITIAL': ' \t\xa0'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -1,37 +1,180 @@
+import queue
+import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from tkinter import ttk
-from lexer import lexer as lex_inst
-from parser import parser
-from tables import symbol_table, error_table, lexeme_table
-from triplos_ui import get_triplos_table, reset_triplos_table, get_triplos_raw
-from optimizacion import optimizar_dependencias
-from ensamblador import generar_ensamblador
+
+# El compilador (PLY + tablas) NO se importa aquí: se precarga en el hilo de
+# trabajo cuando la ventana ya está visible (ver _precargar_compilador), y
+# las funciones que lo usan lo importan localmente (ya en sys.modules).
 
 
 # ---------------- Gutter (números de línea) ----------------
 class LineNumbers(tk.Canvas):
+    """
+    Números de línea del editor.
+
+    Se redibuja solo cuando cambia lo que se ve (primera/última línea visible,
+    desplazamiento vertical, total de líneas o alto del editor) y reutiliza
+    los items de texto del canvas en lugar de borrarlos y recrearlos.
+    """
+
     def __init__(self, master, textwidget, **kwargs):
         super().__init__(master, width=48, highlightthickness=0, **kwargs)
         self.textwidget = textwidget
+        self._items = []        # ids de texto (uno por línea visible)
+        self._textos = []       # texto mostrado en cada item
+        self._visibles = 0      # items en uso (el resto está oculto)
+        self._firma = None      # estado visible del último redibujado
+        self._pendiente = False
+
+    def schedule(self, *_):
+        """Agrupa varios eventos seguidos (tecla, scroll, resize) en un solo redraw."""
+        if not self._pendiente:
+            self._pendiente = True
+            self.after_idle(self._redraw_pendiente)
+
+    def _redraw_pendiente(self):
+        self._pendiente = False
+        self.redraw()
 
     def redraw(self, *_):
+        tw = self.textwidget
         try:
-            _ = self.textwidget.dlineinfo("1.0")
+            _ = tw.dlineinfo("1.0")
         except tk.TclError:
             self.after(16, self.redraw)
             return
 
-        self.delete("all")
-        i = self.textwidget.index("@0,0")
+        primera = tw.index("@0,0")
+        dline = tw.dlineinfo(primera)
+        firma = (primera, tw.index(f"@0,{tw.winfo_height()}"), tw.index("end"),
+                 dline[1] if dline else None, tw.winfo_height())
+        if firma == self._firma:
+            return
+        self._firma = firma
+
+        n = 0
+        i = primera
         while True:
-            dline = self.textwidget.dlineinfo(i)
+            dline = tw.dlineinfo(i)
             if dline is None:
                 break
             y = dline[1]
-            linenum = str(i).split(".")[0]
-            self.create_text(44, y, anchor="ne", text=linenum,
-                             font=("Consolas", 10), fill="#111827")
-            i = self.textwidget.index(f"{i}+1line")
+            linenum = i.split(".")[0]
+            if n < len(self._items):
+                item = self._items[n]
+                self.coords(item, 44, y)
+                if self._textos[n] != linenum:
+                    self.itemconfigure(item, text=linenum)
+                    self._textos[n] = linenum
+                if n >= self._visibles:
+                    self.itemconfigure(item, state="normal")
+            else:
+                self._items.append(self.create_text(44, y, anchor="ne", text=linenum,
+                                                    font=("Consolas", 10), fill="#111827"))
+                self._textos.append(linenum)
+            n += 1
+            i = tw.index(f"{i}+1line")
+
+        for item in self._items[n:self._visibles]:
+            self.itemconfigure(item, state="hidden")
+        self._visibles = n
+
+
+# ---------------- Tablas virtuales (Treeview) ----------------
+class VirtualTree:
+    """
+    Lista virtual sobre un Treeview.
+
+    Guarda todas las filas en memoria pero solo materializa las visibles: hay
+    un item por fila en pantalla y al hacer scroll se reutilizan cambiando sus
+    valores. Cada fila se formatea (fmt(i, fila) -> (values, tags)) recién
+    cuando se muestra, así que el costo de pintar no depende del tamaño.
+    """
+
+    def __init__(self, tv, yscroll):
+        self.tv = tv
+        self.yscroll = yscroll
+        self.rows = []
+        self.fmt = None
+        self.top = 0            # índice de la primera fila visible
+        self._iids = []         # items reutilizables del Treeview
+        style = ttk.Style(tv)
+        self._alto_fila = int(style.lookup(tv.cget("style"), "rowheight") or 20)
+        self._y0 = self._alto_fila + 8  # alto del encabezado (se corrige al pintar)
+
+        yscroll.config(command=self.yview)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tv.bind(seq, self._on_wheel)
+        tv.bind("<Configure>", lambda e: self.refresh())
+
+    # -------- datos --------
+    def set_rows(self, rows, fmt):
+        self.rows = list(rows)
+        self.fmt = fmt
+        self.top = 0
+        self.refresh()
+
+    def extend(self, rows):
+        self.rows.extend(rows)
+        self.refresh()
+
+    def clear(self):
+        self.set_rows([], self.fmt)
+
+    # -------- scroll --------
+    def yview(self, *args):
+        """command del Scrollbar: ('moveto', f) o ('scroll', n, 'units'|'pages')."""
+        n = self._capacidad()
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            paso = n if args[2] == "pages" else 1
+            self.top += int(args[1]) * paso
+        self.refresh()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.yview("scroll", -3, "units")
+        else:
+            self.yview("scroll", 3, "units")
+        return "break"
+
+    # -------- pintado --------
+    def _capacidad(self):
+        alto = self.tv.winfo_height()
+        if alto <= 1:
+            return int(self.tv.cget("height"))
+        return max(1, (alto - self._y0) // self._alto_fila)
+
+    def refresh(self):
+        n = self._capacidad()
+        total = len(self.rows)
+        self.top = max(0, min(self.top, total - n))
+        visibles = range(self.top, min(total, self.top + n))
+
+        tv = self.tv
+        while len(self._iids) < len(visibles):
+            self._iids.append(tv.insert('', 'end'))
+        while len(self._iids) > len(visibles):
+            tv.delete(self._iids.pop())
+        for iid, i in zip(self._iids, visibles):
+            values, tags = self.fmt(i, self.rows[i])
+            tv.item(iid, values=values, tags=tags)
+        if tv.selection():
+            tv.selection_remove(tv.selection())
+        tv.yview_moveto(0)
+
+        if self._iids:
+            bb = tv.bbox(self._iids[0])
+            if bb:
+                self._y0, self._alto_fila = bb[1], bb[3]
+        if total:
+            self.yscroll.set(self.top / total, (self.top + len(visibles)) / total)
+        else:
+            self.yscroll.set(0.0, 1.0)
 
 
 # ---------------- Util: OP visual + explicación ----------------
@@ -110,142 +253,128 @@ def _explain_op(op: str) -> str:
 _COMPARISON_MNEMONICS = {"GT", "GTE", "LT", "LTE", "EQ", "NEQ"}  # lo que emite tu parser
 
 
-def _augment_truth_rows(rows):
+def _iter_truth_rows(rows):
     """
     Inserta filas visuales con OP=TRUE y OP=FALSE después de cada comparación.
-    rows: lista de dicts con claves "#","OP","DO","DF"
+    rows: iterable de dicts con claves "#","OP","DO","DF"
     """
-    out = []
     for r in rows:
-        out.append(r)
+        yield r
         op = r.get("OP", "")
         if op in _COMPARISON_MNEMONICS:
             temp = r.get("DO", "")  # el temporal resultado de la comparación
-            out.append({"#": "", "OP": "TRUE", "DO": temp, "DF": ""})
-            out.append({"#": "", "OP": "FALSE", "DO": temp, "DF": ""})
-    return out
+            yield {"#": "", "OP": "TRUE", "DO": temp, "DF": ""}
+            yield {"#": "", "OP": "FALSE", "DO": temp, "DF": ""}
+
+
+# ---------------- Formato de filas (se llama solo para filas visibles) ----------------
+def _fila_lexema(i, fila):
+    lex, tipo = fila
+    return (lex, tipo if tipo else ""), ("odd" if i % 2 else "even",)
+
+
+def _fila_error(i, fila):
+    return fila, ("odd" if i % 2 else "even",)
+
+
+def _fila_triplo(i, row):
+    tag = "odd" if i % 2 else "even"
+
+    op_raw = row.get('OP', '')
+    do_val = row.get('DO', '')
+    op_disp = _display_op(op_raw, do_val)
+
+    # Clon para no mutar datos reales
+    row_disp = dict(row)
+    row_disp['OP'] = op_disp
+
+    # Presentación bonita de IF_FALSE_GOTO: IF NOT | cond | JUMP → ALIAS
+    if op_raw == "IF_FALSE_GOTO":
+        label_raw = row.get('DO', '')
+        cond_raw = row.get('DF', '')
+        label_nice = _pretty_label(label_raw)
+        row_disp['OP'] = "IF NOT"
+        row_disp['DO'] = cond_raw or ''
+        row_disp['DF'] = f"JUMP → {label_nice}" if label_nice else "JUMP"
+
+    # Para BEGIN/END/JUMP ocultamos DO/DF (solo presentación)
+    if row_disp['OP'] in {"BEGIN", "END", "JUMP → BEGIN", "JUMP → END"}:
+        row_disp['DO'] = ""
+        row_disp['DF'] = ""
+
+    # Guion visual si DO/DF vacíos (solo UI)
+    if row_disp.get('DF', '') == '':
+        row_disp['DF'] = '—'
+    if row_disp.get('DO', '') == '':
+        row_disp['DO'] = '—'
+
+    # Renumeración UI
+    row_disp['#'] = str(i + 1)
+
+    exp = _explain_op(row_disp['OP'])
+    values = [row_disp.get(h, "") for h in tri_headers] + [exp]
+
+    # Tag visual suave para filas BEGIN/END/JUMP/TRUE/FALSE/IF NOT
+    ghost = row_disp['OP'] in {"BEGIN", "END", "JUMP → BEGIN", "JUMP → END", "TRUE", "FALSE", "IF NOT"}
+    return values, ((tag, "ghost") if ghost else (tag,))
+
+
+# ---------------- Poblado por partes (root.after) ----------------
+POBLAR_CHUNK = 5000
+_poblar_job = None
+
+
+def _cancelar_poblado():
+    global _poblar_job
+    if _poblar_job is not None:
+        root.after_cancel(_poblar_job)
+        _poblar_job = None
+
+
+def _poblar_por_partes(vlist, filas, fmt):
+    """
+    Carga `filas` (iterable) en la lista virtual de POBLAR_CHUNK en
+    POBLAR_CHUNK, cediendo el control a Tk entre partes: la primera pantalla
+    aparece de inmediato y la UI sigue respondiendo con tablas enormes.
+    """
+    global _poblar_job
+    _cancelar_poblado()
+    filas = iter(filas)
+    vlist.set_rows(islice(filas, POBLAR_CHUNK), fmt)
+
+    def siguiente():
+        global _poblar_job
+        parte = list(islice(filas, POBLAR_CHUNK))
+        if parte:
+            vlist.extend(parte)
+            _poblar_job = root.after(1, siguiente)
+        else:
+            _poblar_job = None
+
+    _poblar_job = root.after(1, siguiente)
 
 
 # ---------------- Pipeline de análisis (reutilizable) ----------------
-def _analizar_codigo(codigo: str):
+def _analizar_codigo(codigo: str, res=None):
     """
     Pipeline completo de análisis para un código dado:
-    - limpia tablas/modelos
-    - vuelve a tokenizar y parsear
-    - rellena Lexemes, Errors, Triples
-    - genera ensamblador a partir de los triplos actuales
+    - compila con compile_source (léxico, sintáctico, triplos, ensamblador),
+      salvo que ya venga el resultado (análisis en vivo / incremental)
+    - limpia y rellena Lexemes, Errors, Triples y Ensamblador
     """
-    # Limpiar UI
-    for w in sym_table.get_children():
-        sym_table.delete(w)
-    for w in err_table.get_children():
-        err_table.delete(w)
-    for w in tri_table.get_children():
-        tri_table.delete(w)
-
-    # Limpiar modelos
-    symbol_table.clear()
-    error_table.clear()
-    lexeme_table.clear()
-    reset_triplos_table()  # limpia triplos y resetea #, temps, etc.
-
-    # PASO 1: tokenizar (Tabla de lexemas)
-    lex_inst.lineno = 1
-    lex_inst.input(codigo)
-    while True:
-        tok = lex_inst.token()
-        if not tok:
-            break
+    if res is None:
+        from compilador import compile_source
+        res = compile_source(codigo)
 
-        # OMITIR palabras reservadas: cat/cats/meow y for
-        if tok.type in ("TIPO", "FOR"):
-            continue
+    # Poblar UI - Lexemas / Errores (listas virtuales: solo se pintan las filas visibles)
+    sym_rows.set_rows(res.lexemes, _fila_lexema)
+    err_rows.set_rows(res.errors, _fila_error)
 
-        lex = tok.value if tok.type == 'CADENA' else str(tok.value)
-
-        t = None
-        if tok.type == 'CADENA':
-            t = 'meow'
-        elif tok.type == 'ENTERO':
-            t = 'cat'
-        elif tok.type == 'REAL':
-            t = 'cats'
-
-        lexeme_table.add(lex, t)
-
-    # PASO 2: parsear (símbolos/errores + triplos)
-    lex_inst.lineno = 1
-    lex_inst.input(codigo)
-    parser.parse(codigo, lexer=lex_inst)
-
-    # PASO 3: completar tipo de IDs en la tabla de lexemas
-    for lexema, tipo in symbol_table.rows():
-        lexeme_table.set_type_if_id(lexema, tipo)
-
-    # Poblar UI - Lexemas
-    for i, (lex, tipo) in enumerate(lexeme_table.rows()):
-        tag = "odd" if i % 2 else "even"
-        sym_table.insert('', 'end', values=(lex, tipo if tipo else ""), tags=(tag,))
-
-    # Poblar UI - Errores
-    for i, (token, lexema, renglon, desc) in enumerate(error_table.rows()):
-        tag = "odd" if i % 2 else "even"
-        err_table.insert('', 'end', values=(token, lexema, renglon, desc), tags=(tag,))
-
-    # Poblar UI - Triplos
-    tri_data = get_triplos_table()
-    # Forzamos los headers base para evitar desincronización
-    tri_headers = ["#", "OP", "DO", "DF"]
-    tri_headers_ui = ("#", "OP", "DO", "DF", "Explicación")
-
-    # Inyectar TRUE/FALSE visuales tras comparaciones
-    base_rows = _augment_truth_rows(tri_data["rows"])
-
-    for i, row in enumerate(base_rows):
-        tag = "odd" if i % 2 else "even"
-
-        op_raw = row.get('OP', '')
-        do_val = row.get('DO', '')
-        op_disp = _display_op(op_raw, do_val)
-
-        # Clon para no mutar datos reales
-        row_disp = dict(row)
-        row_disp['OP'] = op_disp
-
-        # Presentación bonita de IF_FALSE_GOTO: IF NOT | cond | JUMP → ALIAS
-        if op_raw == "IF_FALSE_GOTO":
-            label_raw = row.get('DO', '')
-            cond_raw = row.get('DF', '')
-            label_nice = _pretty_label(label_raw)
-            row_disp['OP'] = "IF NOT"
-            row_disp['DO'] = cond_raw or ''
-            row_disp['DF'] = f"JUMP → {label_nice}" if label_nice else "JUMP"
-
-        # Para BEGIN/END/JUMP ocultamos DO/DF (solo presentación)
-        if row_disp['OP'] in {"BEGIN", "END", "JUMP → BEGIN", "JUMP → END"}:
-            row_disp['DO'] = ""
-            row_disp['DF'] = ""
-
-        # Guion visual si DO/DF vacíos (solo UI)
-        if row_disp.get('DF', '') == '':
-            row_disp['DF'] = '—'
-        if row_disp.get('DO', '') == '':
-            row_disp['DO'] = '—'
-
-        # Renumeración UI
-        row_disp['#'] = str(i + 1)
-
-        exp = _explain_op(row_disp['OP'])
-        values = [row_disp.get(h, "") for h in tri_headers] + [exp]
-
-        # Tag visual suave para filas BEGIN/END/JUMP/TRUE/FALSE/IF NOT
-        ghost = row_disp['OP'] in {"BEGIN", "END", "JUMP → BEGIN", "JUMP → END", "TRUE", "FALSE", "IF NOT"}
-        tags = (tag, "ghost") if ghost else (tag,)
-        tri_table.insert('', 'end', values=values, tags=tags)
-
-    # --- Generar ensamblador desde los triplos actuales ---
-    raw_triplos = get_triplos_raw()
-    asm_lines = generar_ensamblador(raw_triplos)
+    # Poblar UI - Triplos (con TRUE/FALSE visuales), por partes
+    _poblar_por_partes(tri_rows, _iter_truth_rows(res.triplos.to_rows()), _fila_triplo)
+
+    # --- Ensamblador generado a partir de los triplos ---
+    asm_lines = res.asm
     asm_text.configure(state="normal")
     asm_text.delete("1.0", tk.END)
     asm_text.insert("1.0", "\n".join(asm_lines))
@@ -254,55 +383,156 @@ def _analizar_codigo(codigo: str):
     gutter.redraw()
 
 
+# ---------------- Compilación en segundo plano ----------------
+# Un solo hilo de trabajo: las compilaciones no se pisan (el compilador
+# incremental tampoco es reentrante) y el hilo de Tk nunca se bloquea.
+# El hilo solo compila; los resultados se aplican en el hilo de Tk, de una
+# vez, al revisar la cola de eventos.
+_FASES_UI = {"lexico": "léxico", "sintactico": "sintáctico",
+             "triplos": "triplos", "optimizacion": "optimización",
+             "ensamblador": "ensamblador"}
+_worker = ThreadPoolExecutor(max_workers=1)
+_eventos = queue.Queue()    # (trabajo, tipo, dato) desde el hilo de trabajo
+_trabajo = None             # compilación en curso (dict) o None
+
+
+def _compilar_en_fondo(fn, codigo, al_terminar):
+    """
+    Corre fn(codigo, progreso=..., cancelar=...) en el hilo de trabajo y
+    llama a al_terminar(resultado) en el hilo de Tk. Cancela la anterior.
+    """
+    global _trabajo
+    _cancelar_compilacion()
+    trabajo = {"cancelar": threading.Event(), "al_terminar": al_terminar}
+
+    def progreso(fase):
+        _eventos.put((trabajo, "fase", fase))
+
+    def tarea():
+        from compilador import CompilationCancelled
+        try:
+            res = fn(codigo, progreso=progreso, cancelar=trabajo["cancelar"])
+        except CompilationCancelled:
+            return
+        except Exception as e:  # no debe tumbar el hilo; se muestra en la barra
+            _eventos.put((trabajo, "error", e))
+            return
+        _eventos.put((trabajo, "listo", res))
+
+    _trabajo = trabajo
+    estado_var.set("Compilando…")
+    analizar_btn.configure(text="Cancelar")
+    _worker.submit(tarea)
+    root.after(30, _revisar_eventos)
+
+
+def _cancelar_compilacion():
+    """Cancela la compilación en curso (si la hay); su resultado se descarta."""
+    global _trabajo
+    if _trabajo is None:
+        return False
+    _trabajo["cancelar"].set()
+    _trabajo = None
+    estado_var.set("Cancelado")
+    analizar_btn.configure(text="Analizar")
+    return True
+
+
+def _revisar_eventos():
+    global _trabajo
+    while True:
+        try:
+            trabajo, tipo, dato = _eventos.get_nowait()
+        except queue.Empty:
+            break
+        if trabajo is not _trabajo:
+            continue    # evento de una compilación cancelada
+        if tipo == "fase":
+            estado_var.set(f"Compilando: {_FASES_UI.get(dato, dato)}…")
+            continue
+        _trabajo = None
+        analizar_btn.configure(text="Analizar")
+        if tipo == "error":
+            estado_var.set(f"Error interno: {dato}")
+        else:
+            estado_var.set("Listo")
+            trabajo["al_terminar"](dato)
+    if _trabajo is not None:
+        root.after(30, _revisar_eventos)
+
+
+def _precargar_compilador():
+    # Corre en el hilo de trabajo: importa lexer/parser (tablas de PLY) para
+    # que el primer Analizar no pague ese costo.
+    import compilador, incremental, optimizacion  # noqa: F401
+
+
 # ---------------- Acciones de botones ----------------
 def analizar():
+    # Segundo clic mientras compila = cancelar
+    if _cancelar_compilacion():
+        return
+    from compilador import compile_source
     codigo = editor.get("1.0", tk.END)
-    _analizar_codigo(codigo)
+    _compilar_en_fondo(compile_source, codigo, lambda res: _analizar_codigo(codigo, res))
 
 
 def optimizar():
     """
-    Toma el código de la caja de entrada, le aplica la técnica B,
-    lo muestra en la pestaña 'Optimizado' y vuelve a analizar
-    (incluyendo triplos y ensamblador) usando ese código optimizado.
+    Compila el código de la caja de entrada con los triplos optimizados
+    (propagación de copias, subexpresiones comunes, temporales muertos),
+    muestra el resultado en la pestaña 'Optimizado' y llena las tablas
+    (incluyendo triplos y ensamblador) con la versión optimizada.
     """
     codigo = editor.get("1.0", tk.END).rstrip()
     if not codigo.strip():
         return  # No hay nada que optimizar
 
-    # 1) Código optimizado a nivel fuente
-    codigo_opt = optimizar_dependencias(codigo)
+    def optimizar_y_compilar(codigo, **kw):
+        from dataclasses import replace
+        from compilador import compile_source
+        from ensamblador import generar_ensamblador
+        from mirilla_asm import optimizar_asm
+        from optimizacion import optimizar_triplos
 
-    # 2) Mostrar en la pestaña "Optimizado"
-    opt_text.configure(state="normal")
-    opt_text.delete("1.0", tk.END)
-    opt_text.insert("1.0", codigo_opt)
-    opt_text.configure(state="normal")  # si quieres solo lectura: "disabled"
+        # Se compila una vez y se optimizan esos triplos (en el hilo de
+        # trabajo), así también se sabe cuántos había antes
+        res = compile_source(codigo, **kw)
+        triplos = optimizar_triplos(res.triplos, dict(res.symbols))
+        asm, mirilla = optimizar_asm(generar_ensamblador(triplos.triplos, registros=True))
+        opt = replace(res, triplos=triplos, asm=asm, mirilla=mirilla)
+        return len(res.triplos.triplos), opt
+
+    def aplicar(resultado):
+        n_antes, res = resultado
+
+        # 1) Mostrar en la pestaña "Optimizado"
+        n_despues = len(res.triplos.triplos)
+        opt_text.configure(state="normal")
+        opt_text.delete("1.0", tk.END)
+        opt_text.insert("1.0", f"Triplos: {n_antes} -> {n_despues}\n"
+                               f"Ensamblador: {res.mirilla}\n\n{res.triplos.pretty()}")
+        opt_text.configure(state="normal")  # si quieres solo lectura: "disabled"
 
-    # 3) Re-analizar usando el código optimizado
-    _analizar_codigo(codigo_opt)
+        # 2) Tablas, triplos y ensamblador con el resultado optimizado
+        _analizar_codigo(codigo, res)
 
-    # 4) Cambiar a la pestaña Optimizado automáticamente
-    notebook.select(tab_opt)
+        # 3) Cambiar a la pestaña Optimizado automáticamente
+        notebook.select(tab_opt)
+
+    _compilar_en_fondo(optimizar_y_compilar, codigo, aplicar)
 
 def limpiar():
+    _cancelar_compilacion()
+
     # Limpiar editor
     editor.delete("1.0", tk.END)
 
     # Limpiar tablas
-    for w in sym_table.get_children():
-        sym_table.delete(w)
-    for w in err_table.get_children():
-        err_table.delete(w)
-    for w in tri_table.get_children():
-        tri_table.delete(w)
-
-    # Limpiar modelos internos
-    symbol_table.clear()
-    error_table.clear()
-    lexeme_table.clear()
-    reset_triplos_table()
-    lex_inst.lineno = 1
+    _cancelar_poblado()
+    sym_rows.clear()
+    err_rows.clear()
+    tri_rows.clear()
 
     # Forzar refresco del gutter
     gutter.redraw()
@@ -354,7 +584,7 @@ gutter.textwidget = editor
 
 def _sync_scroll(first, last):
     ys.set(first, last)
-    gutter.redraw()
+    gutter.schedule()
 
 
 editor.configure(yscrollcommand=_sync_scroll)
@@ -365,34 +595,59 @@ editor.configure(xscrollcommand=xs.set)
 xs.pack(fill='x')
 
 
-def _on_any_change(event=None):
-    gutter.redraw()
+# El gutter se actualiza por eventos (scroll, cambios, resize), sin sondeo
+for seq in ("<Configure>", "<Visibility>"):
+    editor.bind(seq, gutter.schedule)
 
 
-for seq in ("<KeyRelease>", "<MouseWheel>", "<Button-4>", "<Button-5>", "<Configure>", "<Visibility>"):
-    editor.bind(seq, _on_any_change)
+# ----- Análisis en vivo (incremental, con debounce) -----
+LIVE_DELAY_MS = 150
+incremental = None          # IncrementalCompiler (se crea en el primer uso)
+live_var = tk.BooleanVar(value=False)
+_live_job = None
 
 
-def _on_modified(event=None):
-    editor.edit_modified(False)
-    gutter.redraw()
+def _analisis_en_vivo():
+    global _live_job, incremental
+    _live_job = None
+    if incremental is None:
+        from incremental import IncrementalCompiler
+        incremental = IncrementalCompiler()
+    codigo = editor.get("1.0", tk.END)
+    _compilar_en_fondo(incremental.update, codigo, lambda res: _analizar_codigo(codigo, res))
 
 
-editor.bind("<<Modified>>", _on_modified)
+def _programar_analisis():
+    """Re-analiza cuando el usuario deja de escribir LIVE_DELAY_MS ms."""
+    global _live_job
+    if _live_job is not None:
+        root.after_cancel(_live_job)
+    _live_job = root.after(LIVE_DELAY_MS, _analisis_en_vivo)
 
 
-def _tick():
-    gutter.redraw()
-    root.after(120, _tick)
+def _on_modified(event=None):
+    if not editor.edit_modified():
+        return  # el propio edit_modified(False) vuelve a disparar el evento
+    editor.edit_modified(False)
+    gutter.schedule()
+    _cancelar_compilacion()  # el resultado ya no correspondería al texto
+    if live_var.get():
+        _programar_analisis()
 
 
-root.after(200, _tick)
+editor.bind("<<Modified>>", _on_modified)
+
 
 btns = ttk.Frame(left)
 btns.pack(anchor='e', pady=(2, 0))
-ttk.Button(btns, text="Analizar", command=analizar).pack(side='left', padx=(0, 8))
+estado_var = tk.StringVar(value="")
+ttk.Label(btns, textvariable=estado_var, foreground="#6b7280").pack(side='left', padx=(0, 12))
+analizar_btn = ttk.Button(btns, text="Analizar", command=analizar)
+analizar_btn.pack(side='left', padx=(0, 8))
 ttk.Button(btns, text="Optimizar", command=optimizar).pack(side='left', padx=(0, 8))
 ttk.Button(btns, text="Limpiar", command=limpiar).pack(side='left')
+ttk.Checkbutton(btns, text="En vivo", variable=live_var,
+                command=lambda: live_var.get() and _programar_analisis()).pack(side='left', padx=(8, 0))
 
 paned.add(left, weight=1)
 
@@ -404,25 +659,25 @@ notebook.pack(fill='both', expand=True)
 
 
 def make_scrolled_tree(parent, columns, height=14, style_name="Blue.Treeview"):
+    """Treeview con scrollbars; el scroll vertical lo maneja una VirtualTree."""
     frame = ttk.Frame(parent)
     yscroll = ttk.Scrollbar(frame, orient='vertical')
     xscroll = ttk.Scrollbar(frame, orient='horizontal')
     tv = ttk.Treeview(
         frame, columns=columns, show="headings", height=height,
-        style=style_name, yscrollcommand=yscroll.set, xscrollcommand=xscroll.set
+        style=style_name, xscrollcommand=xscroll.set
     )
-    yscroll.config(command=tv.yview)
     yscroll.pack(side='right', fill='y')
     xscroll.config(command=tv.xview)
     xscroll.pack(side='bottom', fill='x')
     tv.pack(side='left', fill='both', expand=True)
-    return frame, tv
+    return frame, tv, VirtualTree(tv, yscroll)
 
 
 # Lexemas
 tab_lex = ttk.Frame(notebook)
 notebook.add(tab_lex, text="Lexemes")
-sym_frame, sym_table = make_scrolled_tree(tab_lex, ("Lexema", "Tipo"), height=16)
+sym_frame, sym_table, sym_rows = make_scrolled_tree(tab_lex, ("Lexema", "Tipo"), height=16)
 sym_table.heading("Lexema", text="Lexema")
 sym_table.heading("Tipo", text="Tipo")
 sym_table.column("Lexema", width=360, anchor="w", stretch=True)
@@ -432,7 +687,7 @@ sym_frame.pack(fill='both', expand=True, padx=6, pady=6)
 # Errores
 tab_err = ttk.Frame(notebook)
 notebook.add(tab_err, text="Errors")
-err_frame, err_table = make_scrolled_tree(tab_err, ("Token", "Lexema", "Renglón", "Descripción"), height=16)
+err_frame, err_table, err_rows = make_scrolled_tree(tab_err, ("Token", "Lexema", "Renglón", "Descripción"), height=16)
 for col, w, anchor in (("Token", 90, "center"), ("Lexema", 260, "w"),
                        ("Renglón", 90, "center"), ("Descripción", 520, "w")):
     err_table.heading(col, text=col)
@@ -444,7 +699,7 @@ tab_tri = ttk.Frame(notebook)
 notebook.add(tab_tri, text="Triples")
 tri_headers = ["#", "OP", "DO", "DF"]
 tri_headers_ui = ("#", "OP", "DO", "DF", "Explicación")
-tri_frame, tri_table = make_scrolled_tree(tab_tri, tri_headers_ui, height=18)
+tri_frame, tri_table, tri_rows = make_scrolled_tree(tab_tri, tri_headers_ui, height=18)
 for col in tri_headers_ui:
     tri_table.heading(col, text=col)
 
@@ -499,4 +754,10 @@ tri_table.tag_configure("ghost", foreground="#6b7280")  # gris tenue para BEGIN/
 # Atajo y arranque
 root.bind("<Control-l>", lambda e: limpiar())
 root.after_idle(gutter.redraw)
-root.mainloop()
+root.after_idle(lambda: _worker.submit(_precargar_compilador))
+
+if __name__ == "__main__":
+    root.mainloop()
+    # Al cerrar la ventana: abortar la compilación en curso para no esperarla
+    if _trabajo is not None:
+        _trabajo["cancelar"].set()
@@ -0,0 +1,210 @@
+# mirilla_asm.py
+"""
+Optimización de mirilla sobre el ensamblador que produce ensamblador.py.
+
+    asm, reporte = optimizar_asm(generar_ensamblador(triplos))
+    print(reporte)      # instrucciones 120 -> 97 (-19%): carga_redundante 14, ...
+
+Cada triplo se traduce por separado, así que entre uno y otro quedan pares
+redundantes (MOV t1, AX seguido de MOV AX, t1, saltos a la línea siguiente,
+MOV de un registro a sí mismo...). Aquí se recorren las instrucciones con
+una ventana deslizante de reglas: cada regla mira las últimas k
+instrucciones emitidas y, si aplica, las reemplaza por menos (o más
+baratas). Tras cada cambio se vuelve a probar sobre la cola, así una
+sustitución puede habilitar otra con las instrucciones anteriores.
+
+Los comentarios (; ...) no cuentan para la ventana y se conservan.
+"""
+from collections import namedtuple
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from cfg import es_temporal
+
+# (texto, instrucción, destino, fuente); instrucción None = comentario (no
+# entra a la ventana), ":" = etiqueta (destino = su nombre)
+_Linea = namedtuple("_Linea", "texto inst dst src")
+
+_REG16 = frozenset(("AX", "BX", "CX", "DX", "SI", "DI"))
+_REG8 = frozenset(("AL", "AH", "BL", "BH", "CL", "CH", "DL", "DH"))
+
+# Registro -> nombres que se pisan con él (AX con AL/AH, AL con AX...)
+_FAMILIA = {}
+for _x in "ABCD":
+    _FAMILIA[_x + "X"] = frozenset((_x + "X", _x + "L", _x + "H"))
+    _FAMILIA[_x + "L"] = frozenset((_x + "X", _x + "L"))
+    _FAMILIA[_x + "H"] = frozenset((_x + "X", _x + "H"))
+_FAMILIA["SI"] = frozenset(("SI",))
+_FAMILIA["DI"] = frozenset(("DI",))
+
+
+def _linea(texto: str) -> _Linea:
+    if texto.startswith(";"):
+        return _Linea(texto, None, None, None)
+    if texto.endswith(":") and " " not in texto:
+        return _Linea(texto, ":", texto[:-1], None)
+    inst, _, resto = texto.partition(" ")
+    dst, _, src = resto.partition(", ")     # el destino nunca lleva comas
+    return _Linea(texto, inst, dst or None, src or None)
+
+
+def _mov(dst, src) -> _Linea:
+    return _Linea(f"MOV {dst}, {src}", "MOV", dst, src)
+
+
+def _tamano(x):
+    """16 u 8 para registros; None para memoria y literales."""
+    if x in _REG16:
+        return 16
+    if x in _REG8:
+        return 8
+    return None
+
+
+def _es_memoria(x) -> bool:
+    return bool(x) and (x[0] == "$" or es_temporal(x))
+
+
+# ---------------------------------------------------------------------------
+# Reglas: reciben las k últimas instrucciones y devuelven su reemplazo (o
+# None si no aplican)
+# ---------------------------------------------------------------------------
+def _mov_a_si_mismo(a):
+    # MOV X, X
+    if a.inst == "MOV" and a.dst == a.src:
+        return []
+    return None
+
+
+def _operacion_neutra(a):
+    # ADD X, 0 / SUB X, 0
+    if a.inst in ("ADD", "SUB") and a.src == "0":
+        return []
+    return None
+
+
+def _carga_redundante(a, b):
+    # MOV t1, AX / MOV AX, t1  (o MOV AX, $x / MOV $x, AX): el segundo ya
+    # se cumple
+    if a.inst == "MOV" and b.inst == "MOV" and a.dst == b.src and a.src == b.dst:
+        return [a]
+    return None
+
+
+def _carga_tras_guardado(a, b):
+    # MOV $x, AX / MOV BX, $x  ->  MOV $x, AX / MOV BX, AX
+    if (a.inst == "MOV" and b.inst == "MOV" and a.dst == b.src and _es_memoria(a.dst)
+            and _tamano(a.src) is not None and _tamano(a.src) == _tamano(b.dst)):
+        return [a, _mov(b.dst, a.src)]
+    return None
+
+
+def _escritura_muerta(a, b):
+    # MOV X, y / MOV X, z: nadie lee el primer valor (z no usa X)
+    if a.inst != "MOV" or b.inst != "MOV" or a.dst != b.dst:
+        return None
+    d = a.dst
+    if d in _FAMILIA:
+        if b.src in _FAMILIA[d]:
+            return None
+    elif b.src == d or _tamano(a.src) is None or _tamano(a.src) != _tamano(b.src):
+        return None         # en memoria, solo si se escribe el mismo tamaño
+    return [b]
+
+
+def _salto_al_siguiente(a, b):
+    # JMP L / L:  (o un salto condicional: llega a L de todos modos)
+    if a.inst is not None and a.inst[0] == "J" and b.inst == ":" and a.dst == b.dst:
+        return [b]
+    return None
+
+
+def _codigo_inalcanzable(a, b):
+    # JMP L / X: X no se ejecuta nunca si no tiene etiqueta
+    if a.inst == "JMP" and b.inst != ":":
+        return [a]
+    return None
+
+
+def _cmp_muerto(a, b):
+    # CMP x, y / CMP z, w: las banderas del primero no las lee nadie
+    if a.inst == "CMP" and b.inst == "CMP":
+        return [b]
+    return None
+
+
+def _cmp_cero_redundante(a, b, c):
+    # ADD BX, 1 / CMP BX, 0 / JE L: ADD y SUB ya dejan ZF según el resultado
+    if (a.inst in ("ADD", "SUB") and b.inst == "CMP" and b.dst == a.dst and b.src == "0"
+            and c.inst in ("JE", "JNE")):
+        return [a, c]
+    return None
+
+
+# (nombre, tamaño de la ventana, regla), en el orden en que se prueban
+REGLAS = (
+    ("mov_a_si_mismo", 1, _mov_a_si_mismo),
+    ("operacion_neutra", 1, _operacion_neutra),
+    ("carga_redundante", 2, _carga_redundante),
+    ("carga_tras_guardado", 2, _carga_tras_guardado),
+    ("escritura_muerta", 2, _escritura_muerta),
+    ("salto_al_siguiente", 2, _salto_al_siguiente),
+    ("codigo_inalcanzable", 2, _codigo_inalcanzable),
+    ("cmp_muerto", 2, _cmp_muerto),
+    ("cmp_cero_redundante", 3, _cmp_cero_redundante),
+)
+
+
+@dataclass
+class ReporteMirilla:
+    """Instrucciones antes/después (sin comentarios ni etiquetas) y veces que aplicó cada regla."""
+    antes: int = 0
+    despues: int = 0
+    reglas: Dict[str, int] = field(default_factory=dict)
+
+    def __str__(self):
+        ahorro = (self.antes - self.despues) / self.antes if self.antes else 0
+        texto = f"instrucciones {self.antes} -> {self.despues} (-{ahorro:.0%})"
+        aplicadas = [f"{n} {k}" for n, k in self.reglas.items() if k]
+        return texto + (": " + ", ".join(aplicadas) if aplicadas else "")
+
+
+def optimizar_asm(asm: List[str]):
+    """Devuelve (asm optimizado, ReporteMirilla). No modifica la lista recibida."""
+    conteo = {nombre: 0 for nombre, _, _ in REGLAS}
+    salida: List[_Linea] = []
+    ventana: List[int] = []         # posiciones en salida de las instrucciones
+    antes = 0
+    for texto in asm:
+        linea = _linea(texto)
+        if linea.inst is None:
+            salida.append(linea)
+            continue
+        antes += linea.inst != ":"
+        ventana.append(len(salida))
+        salida.append(linea)
+
+        # Probar las reglas sobre la cola hasta que ninguna aplique
+        cambio = True
+        while cambio:
+            cambio = False
+            for nombre, k, regla in REGLAS:
+                if len(ventana) < k:
+                    continue
+                nuevo = regla(*[salida[i] for i in ventana[-k:]])
+                if nuevo is None:
+                    continue
+                conteo[nombre] += 1
+                inicio = ventana[-k]
+                comentarios = [x for x in salida[inicio:] if x.inst is None]
+                del salida[inicio:]
+                del ventana[-k:]
+                salida.extend(comentarios)
+                for x in nuevo:
+                    ventana.append(len(salida))
+                    salida.append(x)
+                cambio = True
+                break
+
+    despues = sum(1 for i in ventana if salida[i].inst != ":")
+    return [x.texto for x in salida], ReporteMirilla(antes, despues, conteo)
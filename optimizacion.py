@@ -2,6 +2,13 @@
 """
 Módulo de optimización de código para el compilador de Autómatas II.
 
+  - optimizar_triplos(tabla): optimización sobre los triplos (mirilla,
+    constantes, subexpresiones comunes, ciclos). Es la que usa el botón "Optimizar" y
+    compile_source(..., optimizar=True).
+  - optimizar_dependencias(codigo): la técnica B original, sobre el texto
+    fuente (se conserva por compatibilidad; no respeta precedencia ni
+    reasignaciones y no entra a los for).
+
 Técnica B: Instrucciones dependientes susceptibles de reorganización.
 Idea (según los ejemplos de la unidad):
     - Si una asignación usa dentro de su expresión algo que ya se calculó antes
@@ -18,6 +25,8 @@ Ejemplo:
     b = w - a;
 """
 
+import math
+import operator
 import re
 
 
@@ -84,3 +93,562 @@ def optimizar_dependencias(codigo: str) -> str:
         nuevas_lineas.append(f"{var} = {expr_opt_final};")
 
     return "\n".join(nuevas_lineas)
+
+
+# ===========================================================================
+# Optimización sobre triplos (entre el parser y el ensamblador)
+# ===========================================================================
+#
+# El parser emite casi todo como copias:
+#
+#     $1A = $1B + 5;        :=   $1B        -> t1
+#                           ADD  t1, 5      -> t1
+#                           :=   t1         -> $1A
+#
+# La mirilla (peephole) de abajo lo deja en   ADD $1B, 5 -> $1A :
+#   - propagación de copias: cada uso de un temporal que es copia de otro
+#     operando (:= X -> tN) se reemplaza por X;
+#   - eliminación de temporales muertos: se borra el triplo que define un
+#     temporal que nadie lee después;
+#   - fusión operación + copia: "OP a, b -> tN ; := tN -> $ID" pasa a
+#     "OP a, b -> $ID" si tN no se vuelve a leer.
+#
+# Se trabaja por BLOQUE BÁSICO (ver cfg.py: se corta en LABEL y después de
+# GOTO, IF_FALSE_GOTO y HALT). Los temporales del parser viven dentro de una
+# sentencia, así que casi nunca cruzan bloques; los que sí (vivos a la
+# entrada de algún bloque) se tratan como vivos al final de todos.
+
+from bucles import optimizar_ciclos
+from cfg import PURAS as _PURAS, bloques_basicos, construir_cfg, destino, es_temporal, lecturas, resolver
+from icg import TriploTable
+
+_ARITMETICAS = frozenset(("ADD", "SUB", "MUL", "DIV", "MOD", "NEG"))
+
+
+def temporales_expuestos(bloques):
+    """Temporales que algún bloque lee antes de definirlos (cruzan bloques)."""
+    expuestos = set()
+    for bloque in bloques:
+        definidos = set()
+        for t in bloque:
+            for x in lecturas(t):
+                if x not in definidos and es_temporal(x):
+                    expuestos.add(x)
+            d = destino(t)
+            if d is not None:
+                definidos.add(d)
+    return expuestos
+
+
+def propagar_copias(bloque):
+    """Reemplaza (en el lugar) los usos de temporales que son copias."""
+    copias = {}         # temporal -> operando del que es copia
+    por_valor = {}      # operando -> temporales que lo copian
+    for t in bloque:
+        if t.op in _PURAS or t.op == "IF_FALSE_GOTO" or t.op == "PRINT":
+            if t.arg1 in copias and _cabe_operando(t.op, 1, copias[t.arg1]):
+                t.arg1 = copias[t.arg1]
+            if t.arg2 in copias and t.op in _PURAS and _cabe_operando(t.op, 2, copias[t.arg2]):
+                t.arg2 = copias[t.arg2]
+        d = destino(t)
+        if d is None:
+            continue
+        # d cambia: deja de ser copia de algo y nada sigue siendo copia de d
+        anterior = copias.pop(d, None)
+        if anterior is not None:
+            por_valor[anterior].discard(d)
+        for x in por_valor.pop(d, ()):
+            del copias[x]
+        if t.op == ":=" and es_temporal(d) and t.arg1 is not None and t.arg1 != d:
+            copias[d] = t.arg1
+            por_valor.setdefault(t.arg1, set()).add(d)
+
+
+def eliminar_muertos(bloque, vivos_al_salir):
+    """
+    Quita los triplos puros cuyo temporal destino nadie lee y fusiona
+    "OP -> tN ; := tN -> X". Devuelve la nueva lista del bloque.
+    """
+    vivos = set(vivos_al_salir)
+    salida = []          # en orden inverso
+    i = len(bloque) - 1
+    while i >= 0:
+        t = bloque[i]
+        d = destino(t)
+        if d is not None and t.op in _PURAS and es_temporal(d) and d not in vivos:
+            i -= 1
+            continue
+        if (t.op == ":=" and es_temporal(t.arg1) and t.arg1 not in vivos and i > 0
+                and bloque[i - 1].op in _ARITMETICAS and bloque[i - 1].res == t.arg1):
+            # OP a, b -> tN ; := tN -> X   =>   OP a, b -> X
+            previo = bloque[i - 1]
+            previo.res = t.res
+            t, d = previo, previo.res
+            i -= 1
+        if d is not None:
+            vivos.discard(d)
+        for x in lecturas(t):
+            if es_temporal(x):
+                vivos.add(x)
+        salida.append(t)
+        i -= 1
+    salida.reverse()
+    return salida
+
+
+def mirilla_triplos(triplos):
+    """Propagación de copias + temporales muertos + fusiones (lista nueva)."""
+    bloques = bloques_basicos(triplos)
+    expuestos = temporales_expuestos(bloques)
+    resultado = []
+    for bloque in bloques:
+        propagar_copias(bloque)
+        resultado.extend(eliminar_muertos(bloque, expuestos))
+    return resultado
+
+
+# ---------------------------------------------------------------------------
+# Constantes: plegado y propagación
+# ---------------------------------------------------------------------------
+#
+# Un operando es constante si es un literal ("5", "1.25", "\"hola\"") o un
+# nombre al que llega un solo valor constante por todos los caminos
+# (análisis hacia adelante sobre el CFG; en las uniones solo sobrevive lo
+# que coincide en todos los predecesores). Las variables se siguen entre
+# bloques; los temporales no cruzan bloques.
+#
+# Tipos: como en el parser, cat op cat -> cat y si interviene un cats el
+# resultado es cats; asignar un cat a una variable cats la ensancha (3 ->
+# 3.0 para plegar, el literal escrito no cambia). Las cadenas se propagan
+# pero no se pliegan.
+#
+# Enteros: se pliega solo cuando el resultado es el mismo que daría el
+# código 8086 que genera ensamblador.py, y si no, la operación se queda en
+# tiempo de ejecución:
+#   ADD/SUB/NEG  resultado que cabe en 16 bits con signo (-32768..32767)
+#   comparación  operandos enteros en -32768..32767: JG/JL comparan con
+#                signo, así que 200 * 200 = 40000 es negativo en el 8086
+#   MUL          MUL BL: ambos operandos en 0..255 (AL * BL -> AX)
+#   DIV/MOD      DIV BL: dividendo en 0..65535, divisor en 1..255 y cociente
+#                en 0..255 (si no, el 8086 lanza la excepción de división);
+#                AL = cociente (truncado), AH = residuo
+# Con los mismos límites se decide si una constante que no se pliega se
+# escribe como literal en un operando de MUL/DIV/MOD (MOV BL, 300 no
+# existe): si no cabe, el triplo sigue leyendo la variable.
+#
+# Una condición constante de IF_FALSE_GOTO se resuelve: verdadera (!= 0)
+# quita el salto, falsa lo cambia por GOTO. Luego se quitan los bloques a
+# los que ya no llega ningún camino y los GOTO a la etiqueta siguiente.
+
+_MIN_16, _MAX_16 = -0x8000, 0x7FFF
+_COMPARACIONES = {
+    "GT": operator.gt, "GTE": operator.ge, "LT": operator.lt,
+    "LTE": operator.le, "EQ": operator.eq, "NEQ": operator.ne,
+}
+
+
+def _numero(texto):
+    """Valor de un literal numérico (int o float), o None."""
+    if not texto or not (texto[0].isdigit() or texto[0] == "-"):
+        return None
+    try:
+        return int(texto)
+    except ValueError:
+        pass
+    try:
+        return float(texto)
+    except ValueError:
+        return None
+
+
+def _literal(valor) -> str:
+    return repr(valor) if isinstance(valor, float) else str(valor)
+
+
+def evaluar(op, a, b=None):
+    """
+    Resultado de OP a, b con valores constantes (int/float), o None si no se
+    puede plegar sin cambiar lo que hace el código generado.
+    """
+    if op in _COMPARACIONES:
+        for x in (a, b):
+            if isinstance(x, int) and not _MIN_16 <= x <= _MAX_16:
+                return None
+        return int(_COMPARACIONES[op](a, b))
+    if isinstance(a, float) or isinstance(b, float):
+        if op == "ADD":
+            r = a + b
+        elif op == "SUB":
+            r = a - b
+        elif op == "MUL":
+            r = a * b
+        elif op == "DIV" and b:
+            r = a / b
+        elif op == "NEG":
+            r = -a
+        else:
+            return None                 # % solo con cat
+        r = float(r)
+        return r if math.isfinite(r) else None
+    if op == "ADD":
+        r = a + b
+    elif op == "SUB":
+        r = a - b
+    elif op == "NEG":
+        r = -a
+    elif op == "MUL":
+        if not (0 <= a <= 0xFF and 0 <= b <= 0xFF):
+            return None
+        return a * b
+    elif op == "DIV" or op == "MOD":
+        if not (0 <= a <= 0xFFFF and 1 <= b <= 0xFF and a // b <= 0xFF):
+            return None
+        return a // b if op == "DIV" else a % b
+    else:
+        return None
+    return r if _MIN_16 <= r <= _MAX_16 else None
+
+
+def _cabe(op, operando, valor) -> bool:
+    """
+    ¿Se puede escribir la constante como literal en ese operando (1 o 2)
+    de OP? MUL y DIV/MOD cargan sus operandos en AL/AX y BL, así que el
+    literal tiene que caber ahí (si no, se deja la variable).
+    """
+    if op == "MUL":
+        return isinstance(valor, int) and 0 <= valor <= 0xFF
+    if op == "DIV" or op == "MOD":
+        if operando == 1:
+            return isinstance(valor, int) and 0 <= valor <= 0xFFFF
+        return isinstance(valor, int) and 1 <= valor <= 0xFF
+    return True
+
+
+def _cabe_operando(op, operando, x) -> bool:
+    """Como _cabe, para un operando de triplo: los nombres siempre caben."""
+    if x[0] != '"' and _numero(x) is None:
+        return True
+    return _cabe(op, operando, _numero(x))
+
+
+def _plegar_bloque(bloque, entrada, tipos, reescribir=False):
+    """
+    Recorre el bloque con las constantes conocidas a la entrada (nombre ->
+    (literal, valor)). Con reescribir=True además propaga y pliega en los
+    triplos y devuelve (lista nueva, constantes a la salida); si no, solo
+    devuelve (None, constantes a la salida).
+    """
+    env = dict(entrada)
+    salida = [] if reescribir else None
+
+    def constante(x):
+        c = env.get(x)
+        if c is None and x:
+            if x[0] == '"':
+                return x, None
+            v = _numero(x)
+            if v is not None:
+                return x, v
+        return c
+
+    def guardar(d, texto, valor):
+        if isinstance(valor, int) and tipos.get(d) == "cats":
+            valor = float(valor)        # widening cat -> cats
+        env[d] = (texto, valor)
+
+    for t in bloque:
+        op = t.op
+        if op in _PURAS:
+            d = t.res
+            ca = constante(t.arg1)
+            cb = constante(t.arg2) if t.arg2 is not None else None
+            if op == ":=":
+                if ca is not None:
+                    if reescribir:
+                        t.arg1 = ca[0]
+                    guardar(d, *ca)
+                else:
+                    env.pop(d, None)
+            else:
+                r = None
+                if ca is not None and ca[1] is not None and (op == "NEG" or (cb is not None and cb[1] is not None)):
+                    r = evaluar(op, ca[1], cb[1] if cb is not None else None)
+                if r is not None:
+                    texto = _literal(r)
+                    if reescribir:
+                        t.op, t.arg1, t.arg2 = ":=", texto, None
+                    guardar(d, texto, r)
+                else:
+                    if reescribir:
+                        if ca is not None and _cabe(op, 1, ca[1]):
+                            t.arg1 = ca[0]
+                        if cb is not None and _cabe(op, 2, cb[1]):
+                            t.arg2 = cb[0]
+                    env.pop(d, None)
+        elif op == "IF_FALSE_GOTO":
+            c = constante(t.arg1)
+            if reescribir and c is not None and c[1] is not None:
+                if c[1]:
+                    continue            # siempre verdadera: no salta nunca
+                t.op, t.arg1, t.res = "GOTO", t.res, "-"
+        else:
+            d = destino(t)
+            if d is not None:
+                env.pop(d, None)
+        if reescribir:
+            salida.append(t)
+    return salida, {k: v for k, v in env.items() if not es_temporal(k)}
+
+
+def constantes_a_la_entrada(bloques, tipos):
+    """
+    Constantes conocidas a la entrada de cada bloque (dict nombre ->
+    (literal, valor)); None para los bloques a los que no llega ningún camino.
+    """
+    n = len(bloques)
+    entrada = [None] * n
+    salida = [None] * n
+    pendientes = list(range(n - 1, -1, -1))
+    en_cola = [True] * n
+    while pendientes:
+        i = pendientes.pop()
+        en_cola[i] = False
+        if i == 0:
+            e = {}
+        else:
+            e = None
+            for p in bloques[i].predecesores:
+                s = salida[p]
+                if s is None:
+                    continue            # aún sin calcular: no restringe
+                if e is None:
+                    e = dict(s)
+                else:
+                    e = {k: v for k, v in e.items() if s.get(k) == v}
+            if e is None:
+                continue
+        entrada[i] = e
+        _, nueva = _plegar_bloque(bloques[i].triplos, e, tipos)
+        if nueva != salida[i]:
+            salida[i] = nueva
+            for s in bloques[i].sucesores:
+                if not en_cola[s]:
+                    en_cola[s] = True
+                    pendientes.append(s)
+    return entrada
+
+
+def quitar_inalcanzables(triplos):
+    """Quita los bloques sin camino desde la entrada y los GOTO a la etiqueta siguiente."""
+    bloques = construir_cfg(triplos)
+    alcanzado = [False] * len(bloques)
+    pila = [0] if bloques else []
+    while pila:
+        i = pila.pop()
+        if not alcanzado[i]:
+            alcanzado[i] = True
+            pila.extend(bloques[i].sucesores)
+    vivos = [t for b in bloques if alcanzado[b.id] for t in b.triplos]
+    resultado = []
+    for i, t in enumerate(vivos):
+        if (t.op == "GOTO" and i + 1 < len(vivos)
+                and vivos[i + 1].op == "LABEL" and vivos[i + 1].arg1 == t.arg1):
+            continue
+        resultado.append(t)
+    return resultado
+
+
+def plegar_constantes(triplos, tipos=None):
+    """Propagación y plegado de constantes + ramas muertas (lista nueva)."""
+    tipos = tipos or {}
+    bloques = construir_cfg(triplos)
+    entrada = constantes_a_la_entrada(bloques, tipos)
+    resultado = []
+    for bloque, e in zip(bloques, entrada):
+        nuevos, _ = _plegar_bloque(bloque.triplos, e or {}, tipos, reescribir=e is not None)
+        resultado.extend(bloque.triplos if nuevos is None else nuevos)
+    return quitar_inalcanzables(resultado)
+
+
+# ---------------------------------------------------------------------------
+# Subexpresiones comunes: numeración de valores local (LVN) + CSE global
+# ---------------------------------------------------------------------------
+#
+# LVN: dentro de un bloque, cada operando tiene un "número de valor"; dos
+# operaciones con el mismo opcode y los mismos números de valor calculan lo
+# mismo. Si un nombre todavía guarda ese valor, la segunda se cambia por una
+# copia (:= nombre -> destino), que la mirilla luego propaga. Asignar una
+# variable le da un número nuevo, así que lo que dependía de su valor
+# anterior deja de coincidir (y deja de valer como "guardado en" ella).
+#
+# CSE global: expresiones disponibles (análisis hacia adelante sobre el CFG,
+# intersección en las uniones). Un hecho es "OP a, b está guardado en $X";
+# se genera al calcular OP a, b -> $X y se mata al asignar a, b o $X. Lo
+# disponible a la entrada de un bloque siembra la tabla del LVN de ese bloque.
+# Se resuelve con cfg.resolver (conjuntos como enteros, vectores de bits).
+
+_CONMUTATIVAS = frozenset(("MUL", "EQ", "NEQ"))   # ADD no: también concatena cadenas
+_EXPRESIONES = _ARITMETICAS | frozenset(("GT", "GTE", "LT", "LTE", "EQ", "NEQ"))
+
+
+def _hechos_de(bloques):
+    """Universo de hechos (OP, a, b, $X) y, por nombre, la máscara de los que lo mencionan."""
+    indice, por_nombre = {}, {}
+    for bloque in bloques:
+        for t in bloque.triplos:
+            x = t.res
+            if t.op in _EXPRESIONES and not es_temporal(x) and x not in (t.arg1, t.arg2):
+                hecho = (t.op, t.arg1, t.arg2, x)
+                if hecho not in indice:
+                    bit = 1 << len(indice)
+                    indice[hecho] = bit
+                    for nombre in (t.arg1, t.arg2, x):
+                        if nombre is not None:
+                            por_nombre[nombre] = por_nombre.get(nombre, 0) | bit
+    return indice, por_nombre
+
+
+def expresiones_disponibles(bloques):
+    """Por bloque, la máscara de hechos disponibles a la entrada (y el índice de hechos)."""
+    indice, por_nombre = _hechos_de(bloques)
+    todos = (1 << len(indice)) - 1
+    gen, kill = [], []
+    for bloque in bloques:
+        g = k = 0
+        for t in bloque.triplos:
+            d = destino(t)
+            if d is None:
+                continue
+            mata = por_nombre.get(d, 0)
+            g &= ~mata
+            k |= mata
+            bit = indice.get((t.op, t.arg1, t.arg2, d))
+            if bit is not None:
+                g |= bit
+        gen.append(g)
+        kill.append(k)
+
+    entrada, _ = resolver(bloques, gen, kill, interseccion=True, todos=todos)
+    return entrada, indice
+
+
+def numerar_valores(bloque, disponibles=(), tipos=None):
+    """
+    LVN sobre un bloque (en el lugar). `disponibles`: hechos (OP, a, b, $X)
+    válidos a la entrada. Devuelve cuántas operaciones se reemplazaron.
+
+    tipos: dict variable -> tipo. Una variable cats guarda su valor
+    convertido a real, así que no comparte número de valor con lo que se le
+    asignó ni sirve para reusar en un destino que no es cats (3.0 en vez
+    de 3, y luego 3.0 / 2 = 1.5).
+    """
+    tipos = tipos or {}
+
+    def real(x):
+        return tipos.get(x) == "cats"
+    vn = {}             # nombre -> número de valor actual
+    tabla = {}          # (op, vn a, vn b) -> número de valor
+    guardado = {}       # número de valor -> nombres que lo han guardado
+    contador = [0]
+
+    def nuevo():
+        contador[0] += 1
+        return contador[0]
+
+    def valor(x):
+        if x is None:
+            return None
+        v = vn.get(x)
+        if v is None:
+            v = vn[x] = nuevo()
+        return v
+
+    def clave(op, a, b):
+        va, vb = valor(a), valor(b)
+        if op in _CONMUTATIVAS and vb is not None and vb < va:
+            va, vb = vb, va
+        return (op, va, vb)
+
+    for op, a, b, x in disponibles:
+        v = vn.get(x) or nuevo()
+        vn[x] = v
+        tabla[clave(op, a, b)] = v
+        guardado.setdefault(v, []).append(x)
+
+    reemplazos = 0
+    i = 0
+    while i < len(bloque):
+        t = bloque[i]
+        d = destino(t)
+        if d is None:
+            i += 1
+            continue
+        if t.op == ":=":
+            vn[d] = valor(t.arg1) if real(d) == real(t.arg1) else nuevo()
+            guardado.setdefault(vn[d], []).append(d)
+            i += 1
+            continue
+        if t.op not in _EXPRESIONES:
+            vn[d] = nuevo()
+            i += 1
+            continue
+        k = clave(t.op, t.arg1, t.arg2)
+        v = tabla.get(k)
+        quien = None
+        if v is not None:
+            quien = next((n for n in guardado.get(v, ())
+                          if vn.get(n) == v and (real(d) or not real(n))), None)
+        if quien is None:
+            v = nuevo()
+            tabla[k] = v
+            vn[d] = v
+            guardado.setdefault(v, []).append(d)
+            i += 1
+            continue
+        reemplazos += 1
+        if quien == d:
+            del bloque[i]          # d ya tiene ese valor
+            continue
+        t.op, t.arg1, t.arg2 = ":=", quien, None
+        vn[d] = v
+        guardado[v].append(d)
+        i += 1
+    return reemplazos
+
+
+def eliminar_subexpresiones(triplos, tipos=None):
+    """CSE local + global sobre la lista de triplos (en el lugar). Devuelve la lista."""
+    bloques = construir_cfg(triplos)
+    entrada, indice = expresiones_disponibles(bloques)
+    hechos = list(indice)
+    resultado = []
+    for bloque, mascara in zip(bloques, entrada):
+        disponibles = [hechos[k] for k in range(len(hechos)) if mascara >> k & 1] if mascara else ()
+        numerar_valores(bloque.triplos, disponibles, tipos)
+        resultado.extend(bloque.triplos)
+    return resultado
+
+
+def optimizar_triplos(tabla: TriploTable, tipos=None) -> TriploTable:
+    """
+    Tabla nueva con los triplos optimizados (la original no cambia). Los
+    triplos conservan su número (#), así se ve cuáles se eliminaron.
+
+    tipos: dict variable -> tipo (tabla de símbolos) para el widening cat ->
+    cats al plegar y para que la CSE no reuse en una variable cat un valor
+    guardado en una cats; sin él cada constante conserva el tipo de su
+    literal.
+
+    Orden: mirilla (deja las operaciones como "OP a, b -> x"), constantes,
+    CSE local y global, ciclos (bucles.py: invariantes y reducción de
+    fuerza) y otra vez la mirilla para propagar las copias que dejaron los
+    pases anteriores.
+    """
+    triplos = mirilla_triplos(list(tabla.triplos))
+    triplos = plegar_constantes(triplos, tipos)
+    triplos = eliminar_subexpresiones(triplos, tipos)
+    triplos = optimizar_ciclos(triplos)
+    triplos = mirilla_triplos(triplos)
+    nueva = TriploTable.from_triplos(triplos)
+    nueva._i, nueva._t, nueva._l = tabla._i, tabla._t, tabla._l
+    return nueva
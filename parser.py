@@ -1,11 +1,11 @@
+import copy
 import ply.yacc as yacc
 from lexer import tokens
-from tables import symbol_table, error_table
-from icg import TriploTable
+from contexto import default_context
 
-# ===== Triplos =====
-trip = TriploTable()
-for_stack = []
+# ===== Triplos (contexto por defecto, compatibilidad) =====
+trip = default_context.trip
+for_stack = default_context.for_stack
 
 # ===== Precedencias =====
 precedence = (
@@ -26,13 +26,18 @@ def es_cadena(t):
 def es_num(t):
     return t in ('cat', 'cats')
 
+def _ctx(p):
+    """Contexto de la compilación en curso (viaja en el lexer)."""
+    return p.lexer.ctx
+
 # ===== Gramática =====
 def p_programa(p):
     '''
     programa : lista_sentencias_opt
     '''
+    ctx = _ctx(p)
     # Marcar fin
-    trip.add('HALT', res='...')
+    ctx.trip.add('HALT', res='...')
 
 def p_lista_sentencias_opt(p):
     '''
@@ -54,22 +59,29 @@ def p_sentencia(p):
               | asignacion
               | ciclo_for
               | if_stmt
-              | expresion PUNTOYCOMA
     '''
     pass
 
+def p_sentencia_expresion(p):
+    '''
+    sentencia : expresion PUNTOYCOMA
+    '''
+    # El valor no se usa: su temporal queda libre
+    _ctx(p).trip.free_temp(p[1]['place'])
+
 # -------- Declaraciones --------
 def p_declaracion(p):
     '''
     declaracion : TIPO ID PUNTOYCOMA
     '''
+    ctx = _ctx(p)
     tipo = p[1]
     lex  = p[2]
-    if symbol_table.exists(lex):
-        error_table.add(None, lex, p.lineno(2), "Declaración duplicada")
-        trip.error(lex, "Declaración duplicada")
+    if ctx.symbol_table.exists(lex):
+        ctx.error_table.add(None, lex, p.lineno(2), "Declaración duplicada")
+        ctx.trip.error(lex, "Declaración duplicada")
     else:
-        symbol_table.add(lex, tipo)
+        ctx.symbol_table.add(lex, tipo)
 
 # -------- Expresiones base --------
 def p_expresion_group(p):
@@ -82,22 +94,24 @@ def p_expresion_id(p):
     '''
     expresion : ID
     '''
+    ctx = _ctx(p)
     nombre = p[1]
     ln     = p.lineno(1)
-    if not symbol_table.exists(nombre):
-        error_table.add(None, nombre, ln, "Variable indefinida")
-        trip.error(nombre, "Variable indefinida")
+    if not ctx.symbol_table.exists(nombre):
+        ctx.error_table.add(None, nombre, ln, "Variable indefinida")
+        ctx.trip.error(nombre, "Variable indefinida")
         p[0] = {'lexema': nombre, 'tipo': None, 'lineno': ln, 'place': nombre}
     else:
-        p[0] = {'lexema': nombre, 'tipo': symbol_table.get(nombre), 'lineno': ln, 'place': nombre}
+        p[0] = {'lexema': nombre, 'tipo': ctx.symbol_table.get(nombre), 'lineno': ln, 'place': nombre}
 
 def p_expresion_badid(p):
     '''
     expresion : BADID
     '''
+    ctx = _ctx(p)
     ln = p.lineno(1)
-    error_table.add(None, p[1], ln, "Variable indefinida")
-    trip.error(p[1], "Variable indefinida")
+    ctx.error_table.add(None, p[1], ln, "Variable indefinida")
+    ctx.trip.error(p[1], "Variable indefinida")
     p[0] = {'lexema': p[1], 'tipo': None, 'lineno': ln, 'place': p[1]}
 
 def p_expresion_entero(p):
@@ -126,14 +140,15 @@ def p_expresion_unaria(p):
     expresion : MAS expresion
               | MENOS expresion
     '''
+    ctx = _ctx(p)
     op = p[1]
     e  = p[2]
     if op == '-':
         # t = e ; t = NEG t
-        t = trip.new_temp()
-        trip.add(':=', arg1=e['place'], res=t)
-        trip.add('NEG', arg1=t, res=t)
-        trip.free_temp(e['place'])
+        t = ctx.trip.new_temp()
+        ctx.trip.add(':=', arg1=e['place'], res=t)
+        ctx.trip.add('NEG', arg1=t, res=t)
+        ctx.trip.free_temp(e['place'])
         p[0] = {
             'lexema': f'{op}{e["lexema"]}',
             'tipo': e['tipo'],
@@ -157,6 +172,7 @@ def p_expresion_binaria(p):
               | expresion DIV expresion
               | expresion MOD expresion
     '''
+    ctx = _ctx(p)
     izq, op, der = p[1], p[2], p[3]
     expr_str = f'{izq["lexema"]} {op} {der["lexema"]}'
     t1, t2   = izq['tipo'], der['tipo']
@@ -181,16 +197,16 @@ def p_expresion_binaria(p):
         else:
             tres = None
             if t1 is not None and t2 is not None and (t1 != 'cat' or t2 != 'cat'):
-                error_table.add(None, expr_str, izq['lineno'], "Operador % requiere enteros (cat)")
-                trip.error(expr_str, "Tipos no enteros en %")
+                ctx.error_table.add(None, expr_str, izq['lineno'], "Operador % requiere enteros (cat)")
+                ctx.trip.error(expr_str, "Tipos no enteros en %")
 
     op_map = {'+':'ADD', '-':'SUB', '*':'MUL', '/':'DIV', '%':'MOD'}
 
-    t = trip.new_temp()
-    trip.add(':=', arg1=izq['place'], res=t)
-    trip.add(op_map[op], arg1=t, arg2=der['place'], res=t)
-    trip.free_temp(izq['place'])
-    trip.free_temp(der['place'])
+    t = ctx.trip.new_temp()
+    ctx.trip.add(':=', arg1=izq['place'], res=t)
+    ctx.trip.add(op_map[op], arg1=t, arg2=der['place'], res=t)
+    ctx.trip.free_temp(izq['place'])
+    ctx.trip.free_temp(der['place'])
 
     p[0] = {'lexema': expr_str, 'tipo': tres, 'lineno': izq['lineno'], 'place': t}
 
@@ -203,67 +219,72 @@ def p_expresion_comparacion(p):
               | expresion IGUAL expresion
               | expresion DIF expresion
     '''
+    ctx = _ctx(p)
     izq, op, der = p[1], p[2], p[3]
     expr_str = f'{izq["lexema"]} {op} {der["lexema"]}'
 
     t1, t2 = izq['tipo'], der['tipo']
     if t1 is not None and t2 is not None and t1 != t2:
-        error_table.add(None, expr_str, izq['lineno'],
-                        f"Incompatibilidad de tipos en comparación ({t1} vs {t2})")
-        trip.error(expr_str, "Incompatibilidad de tipos")
+        ctx.error_table.add(None, expr_str, izq['lineno'],
+                            f"Incompatibilidad de tipos en comparación ({t1} vs {t2})")
+        ctx.trip.error(expr_str, "Incompatibilidad de tipos")
 
     op_map = {'>': 'GT', '>=': 'GTE', '<': 'LT', '<=': 'LTE', '==': 'EQ', '!=': 'NEQ'}
 
-    t = trip.new_temp()
-    trip.add(':=', arg1=izq['place'], res=t)
-    trip.add(op_map[op], arg1=t, arg2=der['place'], res=t)
-    trip.free_temp(izq['place'])
-    trip.free_temp(der['place'])
+    t = ctx.trip.new_temp()
+    ctx.trip.add(':=', arg1=izq['place'], res=t)
+    ctx.trip.add(op_map[op], arg1=t, arg2=der['place'], res=t)
+    ctx.trip.free_temp(izq['place'])
+    ctx.trip.free_temp(der['place'])
 
     p[0] = {'lexema': expr_str, 'tipo': 'boolean', 'lineno': izq['lineno'], 'place': t}
 
 # -------- If (con/sin else) --------
 def p_if_stmt(p):
     '''
-    if_stmt : IF LPAREN expresion RPAREN LBRACE lista_sentencias_opt RBRACE
-            | IF LPAREN expresion RPAREN LBRACE lista_sentencias_opt RBRACE ELSE LBRACE lista_sentencias_opt RBRACE
+    if_stmt : IF LPAREN expresion RPAREN m_hueco LBRACE lista_sentencias_opt RBRACE
+            | IF LPAREN expresion RPAREN m_hueco LBRACE lista_sentencias_opt RBRACE ELSE m_hueco LBRACE lista_sentencias_opt RBRACE
     '''
+    ctx = _ctx(p)
     cond = p[3]
 
-    L_else = trip.new_label("L_else")
-    L_end  = trip.new_label("L_end")
+    L_else = ctx.trip.new_label("L_else")
+    L_end  = ctx.trip.new_label("L_end")
 
-    trip.add('IF_FALSE_GOTO', arg1=cond['place'], res=L_else)
+    # El salto va antes del cuerpo (en el hueco que dejó m_hueco)
+    with ctx.trip.en(p[5]):
+        ctx.trip.add('IF_FALSE_GOTO', arg1=cond['place'], res=L_else)
+    ctx.trip.free_temp(cond['place'])
 
-    if len(p) == 8:
+    if len(p) == 9:
         # if sin else
-        trip.add('LABEL', arg1=L_else, res='-')
+        ctx.trip.add('LABEL', arg1=L_else, res='-')
     else:
-        # if con else
-        trip.add('GOTO', arg1=L_end, res='-')
-        trip.add('LABEL', arg1=L_else, res='-')
-        trip.add('LABEL', arg1=L_end, res='-')
+        # if con else: el salto al final y L_else van entre ambos cuerpos
+        with ctx.trip.en(p[10]):
+            ctx.trip.add('GOTO', arg1=L_end, res='-')
+            ctx.trip.add('LABEL', arg1=L_else, res='-')
+        ctx.trip.add('LABEL', arg1=L_end, res='-')
 
 # -------- Asignaciones --------
 def p_asignacion_id(p):
     '''
     asignacion : ID ASIGNACION expresion PUNTOYCOMA
     '''
+    ctx = _ctx(p)
     nombre = p[1]
     ln     = p.lineno(1)
 
-    if not symbol_table.exists(nombre):
-        error_table.add(None, nombre, ln, "Variable indefinida")
-        trip.error(nombre, "Variable indefinida")
+    if not ctx.symbol_table.exists(nombre):
+        ctx.error_table.add(None, nombre, ln, "Variable indefinida")
+        ctx.trip.error(nombre, "Variable indefinida")
         # Limpia errores colaterales de esa línea
-        error_table.errors = [
-            e for e in error_table.errors
-            if not (e.get('Renglón') == ln and e.get('Lexema') != nombre)
-        ]
+        ctx.error_table.remove_line_errors(ln, except_lexema=nombre)
+        ctx.trip.free_temp(p[3]['place'])
         p[0] = {'lexema': nombre, 'tipo': None, 'lineno': ln, 'place': nombre}
         return
 
-    tipo_izq = symbol_table.get(nombre)
+    tipo_izq = ctx.symbol_table.get(nombre)
     rhs      = p[3]
     tipo_der = rhs['tipo']               # puede ser None
     rhs_lex  = rhs['lexema']             # descriptivo
@@ -272,26 +293,26 @@ def p_asignacion_id(p):
     # Si el RHS no tiene tipo (expresión inválida), marca error
     if tipo_der is None:
         msg = f"Incompatibilidad de tipos (desconocido -----> {tipo_izq})"
-        error_table.add(None, rhs_lex, rhs_line, msg)
-        trip.error(rhs_lex, msg)
+        ctx.error_table.add(None, rhs_lex, rhs_line, msg)
+        ctx.trip.error(rhs_lex, msg)
     # Acepta widening cat -> cats; marca error para cats -> cat
     elif not (tipo_izq == tipo_der or (tipo_izq == 'cats' and tipo_der == 'cat')):
         msg = f"Incompatibilidad de tipos ({tipo_der} -----> {tipo_izq})"
-        error_table.add(None, rhs_lex, rhs_line, msg)
-        trip.error(rhs_lex, msg)
+        ctx.error_table.add(None, rhs_lex, rhs_line, msg)
+        ctx.trip.error(rhs_lex, msg)
 
     # Emisión de triplos de asignación
     rhs_place = rhs['place']
     is_complex_expr = (rhs_place and rhs_place.startswith('t'))
 
     if is_complex_expr:
-        trip.add(':=', arg1=rhs_place, res=nombre)
-        trip.free_temp(rhs_place)
+        ctx.trip.add(':=', arg1=rhs_place, res=nombre)
+        ctx.trip.free_temp(rhs_place)
     else:
-        t = trip.new_temp()
-        trip.add(':=', arg1=rhs_place, res=t)
-        trip.add(':=', arg1=t, res=nombre)
-        trip.free_temp(t)
+        t = ctx.trip.new_temp()
+        ctx.trip.add(':=', arg1=rhs_place, res=t)
+        ctx.trip.add(':=', arg1=t, res=nombre)
+        ctx.trip.free_temp(t)
 
     p[0] = {'lexema': nombre, 'tipo': tipo_izq, 'lineno': ln, 'place': nombre}
 
@@ -299,62 +320,56 @@ def p_asignacion_badid(p):
     '''
     asignacion : BADID ASIGNACION expresion PUNTOYCOMA
     '''
+    ctx = _ctx(p)
     ln = p.lineno(1)
     lhs = p[1]
-    error_table.add(None, lhs, ln, "Variable indefinida")
-    trip.error(lhs, "Variable indefinida")
-    error_table.errors = [
-        e for e in error_table.errors
-        if not (e.get('Renglón') == ln and e.get('Lexema') != lhs)
-    ]
-    trip.add(':=', arg1=p[3].get('place'), res=lhs)
+    ctx.error_table.add(None, lhs, ln, "Variable indefinida")
+    ctx.trip.error(lhs, "Variable indefinida")
+    ctx.error_table.remove_line_errors(ln, except_lexema=lhs)
+    ctx.trip.add(':=', arg1=p[3].get('place'), res=lhs)
+    ctx.trip.free_temp(p[3].get('place'))
     p[0] = {'lexema': lhs, 'tipo': None, 'lineno': ln, 'place': lhs}
 
 # -------- For (marcadores + reordenación) --------
 def p_ciclo_for(p):
     '''
-    ciclo_for : FOR LPAREN m_mark asignacion m_mark condicion_opt PUNTOYCOMA m_mark asignacion m_mark RPAREN LBRACE lista_sentencias_opt RBRACE
+    ciclo_for : FOR LPAREN asignacion m_hueco condicion_opt PUNTOYCOMA m_hueco asignacion m_hueco RPAREN LBRACE lista_sentencias_opt RBRACE
     '''
-    # Marcadores de posición
-    pos_start      = p[3]
-    pos_after_init = p[5]
-    pos_after_cond = p[8]
-    pos_after_incr = p[10]
-    pos_end        = len(trip.triplos)
-
-    # Segmentar
-    triplos_init = trip.triplos[pos_start:pos_after_init]
-    triplos_cond = trip.triplos[pos_after_init:pos_after_cond]
-    triplos_incr = trip.triplos[pos_after_cond:pos_after_incr]
-    triplos_body = trip.triplos[pos_after_incr:pos_end]
-
-    # Trunca hasta después del init
-    trip.rows = trip.rows[:pos_after_init]
+    ctx = _ctx(p)
+    # Emitido en orden de lectura:  init [h_cond] cond [h_incr] incr [h_body] body
+    h_cond = p[4]
+    h_incr = p[7]
+    h_body = p[9]
 
     # Condición
-    cond = p[6]
+    cond = p[5]
 
     # Etiquetas
-    L_begin = trip.new_label("L_for_begin")
-    L_end   = trip.new_label("L_for_end")
+    L_begin = ctx.trip.new_label("L_for_begin")
+    L_end   = ctx.trip.new_label("L_for_end")
 
     # Reensamble: LABEL + cond + IF_FALSE + body + incr + GOTO + LABEL_end
-    trip.add('LABEL', arg1=L_begin, res='-')
-    trip.insert_triplos(triplos_cond)
+    # (los triplos ya emitidos no se copian: se llenan huecos y se mueve el incr)
+    with ctx.trip.en(h_cond):
+        ctx.trip.add('LABEL', arg1=L_begin, res='-')
 
     if cond is not None and isinstance(cond, dict) and 'place' in cond:
-        trip.add('IF_FALSE_GOTO', arg1=cond['place'], res=L_end)
+        with ctx.trip.en(h_incr):
+            ctx.trip.add('IF_FALSE_GOTO', arg1=cond['place'], res=L_end)
+        # Libre hasta aquí: el cuerpo y el incremento no pueden pisarlo
+        ctx.trip.free_temp(cond['place'])
 
-    trip.insert_triplos(triplos_body)
-    trip.insert_triplos(triplos_incr)
-    trip.add('GOTO', arg1=L_begin, res='-')
-    trip.add('LABEL', arg1=L_end, res='-')
+    ctx.trip.mover_al_final(h_incr, h_body)
+    ctx.trip.add('GOTO', arg1=L_begin, res='-')
+    ctx.trip.add('LABEL', arg1=L_end, res='-')
 
-def p_m_mark(p):
+def p_m_hueco(p):
     '''
-    m_mark : empty
+    m_hueco : empty
     '''
-    p[0] = len(trip.triplos)
+    # Hueco en la tabla de triplos para emitir/mover código después
+    ctx = _ctx(p)
+    p[0] = ctx.trip.marca()
 
 def p_condicion_opt(p):
     '''
@@ -379,4 +394,28 @@ def p_error(p):
     pass
 
 # ===== Build =====
-parser = yacc.yacc(debug=False)
+# Tablas LALR precompiladas (parsetab.py, ver generar_tablas.py): con
+# optimize=True se cargan sin validar la gramática ni comparar firmas, y con
+# write_tables=False nunca se escribe nada junto al código (si parsetab.py
+# falta, las tablas se generan en memoria).
+parser = yacc.yacc(debug=False, optimize=True, write_tables=False)
+
+# yacc reduce "por defecto" (sin leer el siguiente token) en los estados con
+# una sola acción. Con producciones vacías (empty, m_hueco) eso cuelga la
+# recuperación de errores: al desapilar se vuelve a un estado que reduce
+# `empty`, se apila, se desapila... sin fin (p.ej. "for (...) {\n}{").
+# Reducir `empty` no tiene efectos, así que basta con no hacerlo por defecto.
+parser.defaulted_states = {
+    st: r for st, r in parser.defaulted_states.items() if parser.productions[-r].len
+}
+
+def new_parser(ctx=None):
+    """
+    Copia del parser para una compilación independiente. Comparte las tablas
+    LALR (solo lectura) pero no el estado de la pila de parseo. Si se da ctx,
+    los errores sintácticos se cuentan en ctx.syntax_errors.
+    """
+    pc = copy.copy(parser)
+    if ctx is not None:
+        pc.errorfunc = ctx.syntax_error
+    return pc
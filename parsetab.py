@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'leftMAYORMENORMAYORIGUALMENORIGUALIGUALDIFleftMASMENOSleftMULTDIVMODAND ASIGNACION BADID CADENA COMA DIF DIV DO ELSE ENTERO FOR ID IF IGUAL LBRACE LPAREN MAS MAYOR MAYORIGUAL MENOR MENORIGUAL MENOS MOD MULT OR PUNTOYCOMA RBRACE REAL RPAREN TIPO WHILE\nprograma : lista_sentencias_opt\n\nlista_sentencias_opt : lista_sentencias\n                     | empty\n\nlista_sentencias : lista_sentencias sentencia\n                 | sentencia\n\nsentencia : declaracion\n          | asignacion\n          | ciclo_for\n          | if_stmt\n          | expresion PUNTOYCOMA\n\ndeclaracion : TIPO ID PUNTOYCOMA\n\nexpresion : LPAREN expresion RPAREN\n\nexpresion : ID\n\nexpresion : BADID\n\nexpresion : ENTERO\n\nexpresion : REAL\n\nexpresion : CADENA\n\nexpresion : MAS expresion\n          | MENOS expresion\n\nexpresion : expresion MAS expresion\n          | expresion MENOS expresion\n          | expresion MULT expresion\n          | expresion DIV expresion\n          | expresion MOD expresion\n\nexpresion : expresion MAYOR expresion\n          | expresion MENOR expresion\n          | expresion MAYORIGUAL expresion\n          | expresion MENORIGUAL expresion\n          | expresion IGUAL expresion\n          | expresion DIF expresion\n\nif_stmt : IF LPAREN expresion RPAREN LBRACE lista_sentencias_opt RBRACE\n        | IF LPAREN expresion RPAREN LBRACE lista_sentencias_opt RBRACE ELSE LBRACE lista_sentencias_opt RBRACE\n\nasignacion : ID ASIGNACION expresion PUNTOYCOMA\n\nasignacion : BADID ASIGNACION expresion PUNTOYCOMA\n\nciclo_for : FOR LPAREN m_mark asignacion m_mark condicion_opt PUNTOYCOMA m_mark asignacion m_mark RPAREN LBRACE lista_sentencias_opt RBRACE\n\nm_mark : empty\n\ncondicion_opt : expresion\n              | empty\n\nempty :\n'
+_lr_signature = 'leftMAYORMENORMAYORIGUALMENORIGUALIGUALDIFleftMASMENOSleftMULTDIVMODAND ASIGNACION BADID CADENA COMA DIF DIV DO ELSE ENTERO FOR ID IF IGUAL LBRACE LPAREN MAS MAYOR MAYORIGUAL MENOR MENORIGUAL MENOS MOD MULT OR PUNTOYCOMA RBRACE REAL RPAREN TIPO WHILE\n    programa : lista_sentencias_opt\n    \n    lista_sentencias_opt : lista_sentencias\n                         | empty\n    \n    lista_sentencias : lista_sentencias sentencia\n                     | sentencia\n    \n    sentencia : declaracion\n              | asignacion\n              | ciclo_for\n              | if_stmt\n    \n    sentencia : expresion PUNTOYCOMA\n    \n    declaracion : TIPO ID PUNTOYCOMA\n    \n    expresion : LPAREN expresion RPAREN\n    \n    expresion : ID\n    \n    expresion : BADID\n    \n    expresion : ENTERO\n    \n    expresion : REAL\n    \n    expresion : CADENA\n    \n    expresion : MAS expresion\n              | MENOS expresion\n    \n    expresion : expresion MAS expresion\n              | expresion MENOS expresion\n              | expresion MULT expresion\n              | expresion DIV expresion\n              | expresion MOD expresion\n    \n    expresion : expresion MAYOR expresion\n              | expresion MENOR expresion\n              | expresion MAYORIGUAL expresion\n              | expresion MENORIGUAL expresion\n              | expresion IGUAL expresion\n              | expresion DIF expresion\n    \n    if_stmt : IF LPAREN expresion RPAREN m_hueco LBRACE lista_sentencias_opt RBRACE\n            | IF LPAREN expresion RPAREN m_hueco LBRACE lista_sentencias_opt RBRACE ELSE m_hueco LBRACE lista_sentencias_opt RBRACE\n    \n    asignacion : ID ASIGNACION expresion PUNTOYCOMA\n    \n    asignacion : BADID ASIGNACION expresion PUNTOYCOMA\n    \n    ciclo_for : FOR LPAREN asignacion m_hueco condicion_opt PUNTOYCOMA m_hueco asignacion m_hueco RPAREN LBRACE lista_sentencias_opt RBRACE\n    \n    m_hueco : empty\n    \n    condicion_opt : expresion\n                  | empty\n    \n    empty :\n    '
     
-_lr_action_items = {'$end':([0,1,2,3,4,5,6,7,8,9,22,23,56,63,64,76,84,87,],[-39,0,-1,-2,-3,-5,-6,-7,-8,-9,-4,-10,-11,-33,-34,-31,-32,-35,]),'TIPO':([0,3,5,6,7,8,9,22,23,56,63,64,70,76,80,84,85,87,],[11,11,-5,-6,-7,-8,-9,-4,-10,-11,-33,-34,11,-31,11,-32,11,-35,]),'ID':([0,3,5,6,7,8,9,11,15,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,38,42,56,59,60,63,64,65,69,70,75,76,77,80,84,85,87,],[12,12,-5,-6,-7,-8,-9,35,40,40,40,-4,-10,40,40,40,40,40,40,40,40,40,40,40,40,40,-39,40,-11,66,-36,-33,-34,-39,40,12,-39,-31,66,12,-32,12,-35,]),'BADID':([0,3,5,6,7,8,9,15,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,38,42,56,59,60,63,64,65,69,70,75,76,77,80,84,85,87,],[13,13,-5,-6,-7,-8,-9,41,41,41,-4,-10,41,41,41,41,41,41,41,41,41,41,41,41,41,-39,41,-11,67,-36,-33,-34,-39,41,13,-39,-31,67,13,-32,13,-35,]),'FOR':([0,3,5,6,7,8,9,22,23,56,63,64,70,76,80,84,85,87,],[14,14,-5,-6,-7,-8,-9,-4,-10,-11,-33,-34,14,-31,14,-32,14,-35,]),'IF':([0,3,5,6,7,8,9,22,23,56,63,64,70,76,80,84,85,87,],[16,16,-5,-6,-7,-8,-9,-4,-10,-11,-33,-34,16,-31,16,-32,16,-35,]),'LPAREN':([0,3,5,6,7,8,9,14,15,16,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,42,56,60,63,64,65,69,70,76,80,84,85,87,],[15,15,-5,-6,-7,-8,-9,38,15,42,15,15,-4,-10,15,15,15,15,15,15,15,15,15,15,15,15,15,15,-11,-36,-33,-34,-39,15,15,-31,15,-32,15,-35,]),'ENTERO':([0,3,5,6,7,8,9,15,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,42,56,60,63,64,65,69,70,76,80,84,85,87,],[17,17,-5,-6,-7,-8,-9,17,17,17,-4,-10,17,17,17,17,17,17,17,17,17,17,17,17,17,17,-11,-36,-33,-34,-39,17,17,-31,17,-32,17,-35,]),'REAL':([0,3,5,6,7,8,9,15,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,42,56,60,63,64,65,69,70,76,80,84,85,87,],[18,18,-5,-6,-7,-8,-9,18,18,18,-4,-10,18,18,18,18,18,18,18,18,18,18,18,18,18,18,-11,-36,-33,-34,-39,18,18,-31,18,-32,18,-35,]),'CADENA':([0,3,5,6,7,8,9,15,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,42,56,60,63,64,65,69,70,76,80,84,85,87,],[19,19,-5,-6,-7,-8,-9,19,19,19,-4,-10,19,19,19,19,19,19,19,19,19,19,19,19,19,19,-11,-36,-33,-34,-39,19,19,-31,19,-32,19,-35,]),'MAS':([0,3,5,6,7,8,9,10,12,13,15,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,60,61,62,63,64,65,69,70,72,76,80,84,85,87,],[20,20,-5,-6,-7,-8,-9,24,-13,-14,20,-15,-16,-17,20,20,-4,-10,20,20,20,20,20,20,20,20,20,20,20,20,20,24,-13,-14,20,-18,-19,-20,-21,-22,-23,-24,24,24,24,24,24,24,-11,24,24,-36,-12,24,-33,-34,-39,20,20,24,-31,20,-32,20,-35,]),'MENOS':([0,3,5,6,7,8,9,10,12,13,15,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,60,61,62,63,64,65,69,70,72,76,80,84,85,87,],[21,21,-5,-6,-7,-8,-9,25,-13,-14,21,-15,-16,-17,21,21,-4,-10,21,21,21,21,21,21,21,21,21,21,21,21,21,25,-13,-14,21,-18,-19,-20,-21,-22,-23,-24,25,25,25,25,25,25,-11,25,25,-36,-12,25,-33,-34,-39,21,21,25,-31,21,-32,21,-35,]),'RBRACE':([3,4,5,6,7,8,9,22,23,56,63,64,70,74,76,80,82,84,85,86,87,],[-2,-3,-5,-6,-7,-8,-9,-4,-10,-11,-33,-34,-39,76,-31,-39,84,-32,-39,87,-35,]),'PUNTOYCOMA':([10,12,13,17,18,19,35,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,60,61,63,64,65,69,71,72,73,],[23,-13,-14,-15,-16,-17,56,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,63,64,-36,-12,-33,-34,-39,-39,75,-37,-38,]),'MULT':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,61,62,72,],[26,-13,-14,-15,-16,-17,26,-13,-14,26,26,26,26,-22,-23,-24,26,26,26,26,26,26,26,26,-12,26,26,]),'DIV':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,61,62,72,],[27,-13,-14,-15,-16,-17,27,-13,-14,27,27,27,27,-22,-23,-24,27,27,27,27,27,27,27,27,-12,27,27,]),'MOD':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,61,62,72,],[28,-13,-14,-15,-16,-17,28,-13,-14,28,28,28,28,-22,-23,-24,28,28,28,28,28,28,28,28,-12,28,28,]),'MAYOR':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,61,62,72,],[29,-13,-14,-15,-16,-17,29,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,29,29,-12,29,29,]),'MENOR':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,61,62,72,],[30,-13,-14,-15,-16,-17,30,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,30,30,-12,30,30,]),'MAYORIGUAL':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,61,62,72,],[31,-13,-14,-15,-16,-17,31,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,31,31,-12,31,31,]),'MENORIGUAL':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,61,62,72,],[32,-13,-14,-15,-16,-17,32,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,32,32,-12,32,32,]),'IGUAL':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,61,62,72,],[33,-13,-14,-15,-16,-17,33,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,33,33,-12,33,33,]),'DIF':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,61,62,72,],[34,-13,-14,-15,-16,-17,34,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,34,34,-12,34,34,]),'ASIGNACION':([12,13,66,67,],[36,37,36,37,]),'RPAREN':([17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,60,61,62,63,64,79,81,],[-15,-16,-17,61,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-36,-12,68,-33,-34,-39,83,]),'LBRACE':([68,78,83,],[70,80,85,]),'ELSE':([76,],[78,]),}
+_lr_action_items = {'$end':([0,1,2,3,4,5,6,7,8,9,22,23,56,64,65,78,87,88,],[-39,0,-1,-2,-3,-5,-6,-7,-8,-9,-4,-10,-11,-33,-34,-31,-35,-32,]),'TIPO':([0,3,5,6,7,8,9,22,23,56,64,65,74,78,83,84,87,88,],[11,11,-5,-6,-7,-8,-9,-4,-10,-11,-33,-34,11,-31,11,11,-35,-32,]),'ID':([0,3,5,6,7,8,9,11,15,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,38,42,56,59,64,65,66,67,73,74,75,78,83,84,87,88,],[12,12,-5,-6,-7,-8,-9,35,40,40,40,-4,-10,40,40,40,40,40,40,40,40,40,40,40,40,40,60,40,-11,-39,-33,-34,40,-36,-39,12,60,-31,12,12,-35,-32,]),'BADID':([0,3,5,6,7,8,9,15,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,38,42,56,59,64,65,66,67,73,74,75,78,83,84,87,88,],[13,13,-5,-6,-7,-8,-9,41,41,41,-4,-10,41,41,41,41,41,41,41,41,41,41,41,41,41,61,41,-11,-39,-33,-34,41,-36,-39,13,61,-31,13,13,-35,-32,]),'FOR':([0,3,5,6,7,8,9,22,23,56,64,65,74,78,83,84,87,88,],[14,14,-5,-6,-7,-8,-9,-4,-10,-11,-33,-34,14,-31,14,14,-35,-32,]),'IF':([0,3,5,6,7,8,9,22,23,56,64,65,74,78,83,84,87,88,],[16,16,-5,-6,-7,-8,-9,-4,-10,-11,-33,-34,16,-31,16,16,-35,-32,]),'LPAREN':([0,3,5,6,7,8,9,14,15,16,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,42,56,59,64,65,66,67,74,78,83,84,87,88,],[15,15,-5,-6,-7,-8,-9,38,15,42,15,15,-4,-10,15,15,15,15,15,15,15,15,15,15,15,15,15,15,-11,-39,-33,-34,15,-36,15,-31,15,15,-35,-32,]),'ENTERO':([0,3,5,6,7,8,9,15,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,42,56,59,64,65,66,67,74,78,83,84,87,88,],[17,17,-5,-6,-7,-8,-9,17,17,17,-4,-10,17,17,17,17,17,17,17,17,17,17,17,17,17,17,-11,-39,-33,-34,17,-36,17,-31,17,17,-35,-32,]),'REAL':([0,3,5,6,7,8,9,15,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,42,56,59,64,65,66,67,74,78,83,84,87,88,],[18,18,-5,-6,-7,-8,-9,18,18,18,-4,-10,18,18,18,18,18,18,18,18,18,18,18,18,18,18,-11,-39,-33,-34,18,-36,18,-31,18,18,-35,-32,]),'CADENA':([0,3,5,6,7,8,9,15,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,42,56,59,64,65,66,67,74,78,83,84,87,88,],[19,19,-5,-6,-7,-8,-9,19,19,19,-4,-10,19,19,19,19,19,19,19,19,19,19,19,19,19,19,-11,-39,-33,-34,19,-36,19,-31,19,19,-35,-32,]),'MAS':([0,3,5,6,7,8,9,10,12,13,15,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,62,63,64,65,66,67,70,74,78,83,84,87,88,],[20,20,-5,-6,-7,-8,-9,24,-13,-14,20,-15,-16,-17,20,20,-4,-10,20,20,20,20,20,20,20,20,20,20,20,20,20,24,-13,-14,20,-18,-19,-20,-21,-22,-23,-24,24,24,24,24,24,24,-11,24,24,-39,-12,24,-33,-34,20,-36,24,20,-31,20,20,-35,-32,]),'MENOS':([0,3,5,6,7,8,9,10,12,13,15,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,36,37,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,62,63,64,65,66,67,70,74,78,83,84,87,88,],[21,21,-5,-6,-7,-8,-9,25,-13,-14,21,-15,-16,-17,21,21,-4,-10,21,21,21,21,21,21,21,21,21,21,21,21,21,25,-13,-14,21,-18,-19,-20,-21,-22,-23,-24,25,25,25,25,25,25,-11,25,25,-39,-12,25,-33,-34,21,-36,25,21,-31,21,21,-35,-32,]),'RBRACE':([3,4,5,6,7,8,9,22,23,56,64,65,74,76,78,83,84,85,86,87,88,],[-2,-3,-5,-6,-7,-8,-9,-4,-10,-11,-33,-34,-39,78,-31,-39,-39,87,88,-35,-32,]),'PUNTOYCOMA':([10,12,13,17,18,19,35,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,59,62,64,65,66,67,69,70,71,],[23,-13,-14,-15,-16,-17,56,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,64,65,-39,-12,-33,-34,-39,-36,73,-37,-38,]),'MULT':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,62,63,70,],[26,-13,-14,-15,-16,-17,26,-13,-14,26,26,26,26,-22,-23,-24,26,26,26,26,26,26,26,26,-12,26,26,]),'DIV':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,62,63,70,],[27,-13,-14,-15,-16,-17,27,-13,-14,27,27,27,27,-22,-23,-24,27,27,27,27,27,27,27,27,-12,27,27,]),'MOD':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,62,63,70,],[28,-13,-14,-15,-16,-17,28,-13,-14,28,28,28,28,-22,-23,-24,28,28,28,28,28,28,28,28,-12,28,28,]),'MAYOR':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,62,63,70,],[29,-13,-14,-15,-16,-17,29,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,29,29,-12,29,29,]),'MENOR':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,62,63,70,],[30,-13,-14,-15,-16,-17,30,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,30,30,-12,30,30,]),'MAYORIGUAL':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,62,63,70,],[31,-13,-14,-15,-16,-17,31,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,31,31,-12,31,31,]),'MENORIGUAL':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,62,63,70,],[32,-13,-14,-15,-16,-17,32,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,32,32,-12,32,32,]),'IGUAL':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,62,63,70,],[33,-13,-14,-15,-16,-17,33,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,33,33,-12,33,33,]),'DIF':([10,12,13,17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,62,63,70,],[34,-13,-14,-15,-16,-17,34,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,34,34,-12,34,34,]),'ASIGNACION':([12,13,60,61,],[36,37,36,37,]),'RPAREN':([17,18,19,39,40,41,43,44,45,46,47,48,49,50,51,52,53,54,55,62,63,64,65,67,77,79,],[-15,-16,-17,62,-13,-14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-12,68,-33,-34,-36,-39,81,]),'LBRACE':([67,68,72,80,81,82,],[-36,-39,74,-39,83,84,]),'ELSE':([78,],[80,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'programa':([0,],[1,]),'lista_sentencias_opt':([0,70,80,85,],[2,74,82,86,]),'lista_sentencias':([0,70,80,85,],[3,3,3,3,]),'empty':([0,38,65,69,70,75,79,80,85,],[4,60,60,73,4,60,60,4,4,]),'sentencia':([0,3,70,80,85,],[5,22,5,5,5,]),'declaracion':([0,3,70,80,85,],[6,6,6,6,6,]),'asignacion':([0,3,59,70,77,80,85,],[7,7,65,7,79,7,7,]),'ciclo_for':([0,3,70,80,85,],[8,8,8,8,8,]),'if_stmt':([0,3,70,80,85,],[9,9,9,9,9,]),'expresion':([0,3,15,20,21,24,25,26,27,28,29,30,31,32,33,34,36,37,42,69,70,80,85,],[10,10,39,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,62,72,10,10,10,]),'m_mark':([38,65,75,79,],[59,69,77,81,]),'condicion_opt':([69,],[71,]),}
+_lr_goto_items = {'programa':([0,],[1,]),'lista_sentencias_opt':([0,74,83,84,],[2,76,85,86,]),'lista_sentencias':([0,74,83,84,],[3,3,3,3,]),'empty':([0,59,66,68,73,74,77,80,83,84,],[4,67,71,67,67,4,67,67,4,4,]),'sentencia':([0,3,74,83,84,],[5,22,5,5,5,]),'declaracion':([0,3,74,83,84,],[6,6,6,6,6,]),'asignacion':([0,3,38,74,75,83,84,],[7,7,59,7,77,7,7,]),'ciclo_for':([0,3,74,83,84,],[8,8,8,8,8,]),'if_stmt':([0,3,74,83,84,],[9,9,9,9,9,]),'expresion':([0,3,15,20,21,24,25,26,27,28,29,30,31,32,33,34,36,37,42,66,74,83,84,],[10,10,39,43,44,45,46,47,48,49,50,51,52,53,54,55,57,58,63,70,10,10,10,]),'m_hueco':([59,68,73,77,80,],[66,72,75,79,82,]),'condicion_opt':([66,],[69,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -27,43 +27,43 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> programa","S'",1,None,None,None),
-  ('programa -> lista_sentencias_opt','programa',1,'p_programa','parser.py',32),
-  ('lista_sentencias_opt -> lista_sentencias','lista_sentencias_opt',1,'p_lista_sentencias_opt','parser.py',39),
-  ('lista_sentencias_opt -> empty','lista_sentencias_opt',1,'p_lista_sentencias_opt','parser.py',40),
-  ('lista_sentencias -> lista_sentencias sentencia','lista_sentencias',2,'p_lista_sentencias','parser.py',46),
-  ('lista_sentencias -> sentencia','lista_sentencias',1,'p_lista_sentencias','parser.py',47),
-  ('sentencia -> declaracion','sentencia',1,'p_sentencia','parser.py',53),
-  ('sentencia -> asignacion','sentencia',1,'p_sentencia','parser.py',54),
-  ('sentencia -> ciclo_for','sentencia',1,'p_sentencia','parser.py',55),
-  ('sentencia -> if_stmt','sentencia',1,'p_sentencia','parser.py',56),
-  ('sentencia -> expresion PUNTOYCOMA','sentencia',2,'p_sentencia','parser.py',57),
-  ('declaracion -> TIPO ID PUNTOYCOMA','declaracion',3,'p_declaracion','parser.py',64),
-  ('expresion -> LPAREN expresion RPAREN','expresion',3,'p_expresion_group','parser.py',77),
-  ('expresion -> ID','expresion',1,'p_expresion_id','parser.py',83),
-  ('expresion -> BADID','expresion',1,'p_expresion_badid','parser.py',96),
-  ('expresion -> ENTERO','expresion',1,'p_expresion_entero','parser.py',105),
-  ('expresion -> REAL','expresion',1,'p_expresion_real','parser.py',112),
-  ('expresion -> CADENA','expresion',1,'p_expresion_cadena','parser.py',119),
-  ('expresion -> MAS expresion','expresion',2,'p_expresion_unaria','parser.py',126),
-  ('expresion -> MENOS expresion','expresion',2,'p_expresion_unaria','parser.py',127),
-  ('expresion -> expresion MAS expresion','expresion',3,'p_expresion_binaria','parser.py',154),
-  ('expresion -> expresion MENOS expresion','expresion',3,'p_expresion_binaria','parser.py',155),
-  ('expresion -> expresion MULT expresion','expresion',3,'p_expresion_binaria','parser.py',156),
-  ('expresion -> expresion DIV expresion','expresion',3,'p_expresion_binaria','parser.py',157),
-  ('expresion -> expresion MOD expresion','expresion',3,'p_expresion_binaria','parser.py',158),
-  ('expresion -> expresion MAYOR expresion','expresion',3,'p_expresion_comparacion','parser.py',199),
-  ('expresion -> expresion MENOR expresion','expresion',3,'p_expresion_comparacion','parser.py',200),
-  ('expresion -> expresion MAYORIGUAL expresion','expresion',3,'p_expresion_comparacion','parser.py',201),
-  ('expresion -> expresion MENORIGUAL expresion','expresion',3,'p_expresion_comparacion','parser.py',202),
-  ('expresion -> expresion IGUAL expresion','expresion',3,'p_expresion_comparacion','parser.py',203),
-  ('expresion -> expresion DIF expresion','expresion',3,'p_expresion_comparacion','parser.py',204),
-  ('if_stmt -> IF LPAREN expresion RPAREN LBRACE lista_sentencias_opt RBRACE','if_stmt',7,'p_if_stmt','parser.py',228),
-  ('if_stmt -> IF LPAREN expresion RPAREN LBRACE lista_sentencias_opt RBRACE ELSE LBRACE lista_sentencias_opt RBRACE','if_stmt',11,'p_if_stmt','parser.py',229),
-  ('asignacion -> ID ASIGNACION expresion PUNTOYCOMA','asignacion',4,'p_asignacion_id','parser.py',250),
-  ('asignacion -> BADID ASIGNACION expresion PUNTOYCOMA','asignacion',4,'p_asignacion_badid','parser.py',300),
-  ('ciclo_for -> FOR LPAREN m_mark asignacion m_mark condicion_opt PUNTOYCOMA m_mark asignacion m_mark RPAREN LBRACE lista_sentencias_opt RBRACE','ciclo_for',14,'p_ciclo_for','parser.py',316),
-  ('m_mark -> empty','m_mark',1,'p_m_mark','parser.py',355),
-  ('condicion_opt -> expresion','condicion_opt',1,'p_condicion_opt','parser.py',361),
-  ('condicion_opt -> empty','condicion_opt',1,'p_condicion_opt','parser.py',362),
-  ('empty -> <empty>','empty',0,'p_empty','parser.py',371),
+  ('programa -> lista_sentencias_opt','programa',1,'p_programa','parser.py',36),
+  ('lista_sentencias_opt -> lista_sentencias','lista_sentencias_opt',1,'p_lista_sentencias_opt','parser.py',44),
+  ('lista_sentencias_opt -> empty','lista_sentencias_opt',1,'p_lista_sentencias_opt','parser.py',45),
+  ('lista_sentencias -> lista_sentencias sentencia','lista_sentencias',2,'p_lista_sentencias','parser.py',51),
+  ('lista_sentencias -> sentencia','lista_sentencias',1,'p_lista_sentencias','parser.py',52),
+  ('sentencia -> declaracion','sentencia',1,'p_sentencia','parser.py',58),
+  ('sentencia -> asignacion','sentencia',1,'p_sentencia','parser.py',59),
+  ('sentencia -> ciclo_for','sentencia',1,'p_sentencia','parser.py',60),
+  ('sentencia -> if_stmt','sentencia',1,'p_sentencia','parser.py',61),
+  ('sentencia -> expresion PUNTOYCOMA','sentencia',2,'p_sentencia_expresion','parser.py',67),
+  ('declaracion -> TIPO ID PUNTOYCOMA','declaracion',3,'p_declaracion','parser.py',75),
+  ('expresion -> LPAREN expresion RPAREN','expresion',3,'p_expresion_group','parser.py',89),
+  ('expresion -> ID','expresion',1,'p_expresion_id','parser.py',95),
+  ('expresion -> BADID','expresion',1,'p_expresion_badid','parser.py',109),
+  ('expresion -> ENTERO','expresion',1,'p_expresion_entero','parser.py',119),
+  ('expresion -> REAL','expresion',1,'p_expresion_real','parser.py',126),
+  ('expresion -> CADENA','expresion',1,'p_expresion_cadena','parser.py',133),
+  ('expresion -> MAS expresion','expresion',2,'p_expresion_unaria','parser.py',140),
+  ('expresion -> MENOS expresion','expresion',2,'p_expresion_unaria','parser.py',141),
+  ('expresion -> expresion MAS expresion','expresion',3,'p_expresion_binaria','parser.py',169),
+  ('expresion -> expresion MENOS expresion','expresion',3,'p_expresion_binaria','parser.py',170),
+  ('expresion -> expresion MULT expresion','expresion',3,'p_expresion_binaria','parser.py',171),
+  ('expresion -> expresion DIV expresion','expresion',3,'p_expresion_binaria','parser.py',172),
+  ('expresion -> expresion MOD expresion','expresion',3,'p_expresion_binaria','parser.py',173),
+  ('expresion -> expresion MAYOR expresion','expresion',3,'p_expresion_comparacion','parser.py',215),
+  ('expresion -> expresion MENOR expresion','expresion',3,'p_expresion_comparacion','parser.py',216),
+  ('expresion -> expresion MAYORIGUAL expresion','expresion',3,'p_expresion_comparacion','parser.py',217),
+  ('expresion -> expresion MENORIGUAL expresion','expresion',3,'p_expresion_comparacion','parser.py',218),
+  ('expresion -> expresion IGUAL expresion','expresion',3,'p_expresion_comparacion','parser.py',219),
+  ('expresion -> expresion DIF expresion','expresion',3,'p_expresion_comparacion','parser.py',220),
+  ('if_stmt -> IF LPAREN expresion RPAREN m_hueco LBRACE lista_sentencias_opt RBRACE','if_stmt',8,'p_if_stmt','parser.py',245),
+  ('if_stmt -> IF LPAREN expresion RPAREN m_hueco LBRACE lista_sentencias_opt RBRACE ELSE m_hueco LBRACE lista_sentencias_opt RBRACE','if_stmt',13,'p_if_stmt','parser.py',246),
+  ('asignacion -> ID ASIGNACION expresion PUNTOYCOMA','asignacion',4,'p_asignacion_id','parser.py',272),
+  ('asignacion -> BADID ASIGNACION expresion PUNTOYCOMA','asignacion',4,'p_asignacion_badid','parser.py',321),
+  ('ciclo_for -> FOR LPAREN asignacion m_hueco condicion_opt PUNTOYCOMA m_hueco asignacion m_hueco RPAREN LBRACE lista_sentencias_opt RBRACE','ciclo_for',13,'p_ciclo_for','parser.py',336),
+  ('m_hueco -> empty','m_hueco',1,'p_m_hueco','parser.py',368),
+  ('condicion_opt -> expresion','condicion_opt',1,'p_condicion_opt','parser.py',376),
+  ('condicion_opt -> empty','condicion_opt',1,'p_condicion_opt','parser.py',377),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',386),
 ]
@@ -0,0 +1,255 @@
+# registros.py
+"""
+Asignación de registros para los temporales del ensamblador (linear scan).
+
+    triplos = asignar_registros(triplos)     # copia: los tN pasan a BX, CX...
+    asm = generar_ensamblador(triplos)       # o generar_ensamblador(t, registros=True)
+
+Sin esto cada temporal se guarda en memoria (MOV t1, AX) y se vuelve a
+cargar en el triplo siguiente. Aquí los temporales van en BX, CX, DX, SI
+y DI; AX queda libre como acumulador de ensamblador.py.
+
+  1. Redes: el parser reusa t1, t2... en cada sentencia, así que no se
+     asigna por nombre sino por red (definiciones unidas por los usos a
+     los que llegan). Los usos expuestos de un bloque (temporales que
+     vienen de otro, p.ej. los que dejó bucles.py) se unen con las
+     definiciones que llegan (flujo de datos de cfg.py).
+  2. Intervalos: de la primera a la última aparición de la red en el orden
+     de los triplos, extendidos a los bloques donde está viva (así una red
+     viva en todo un for ocupa el for completo, incluido el regreso).
+  3. Linear scan por inicio de intervalo. MUL/DIV/MOD se traducen con
+     MUL BL / DIV BL (AX, AL y AH son fijos y BL se sobreescribe), así que
+     una red viva a través de una de ellas no puede ir en BX. Si no queda
+     registro libre, se manda a memoria el intervalo que termina más tarde
+     (el actual o uno activo): la red conserva su nombre tN.
+
+Las variables ($...) siguen en memoria.
+"""
+from cfg import construir_cfg, destino, elementos, es_temporal, lecturas, resolver
+from ensamblador import REGISTROS
+from icg import Triplo
+
+_USAN_BL = frozenset(("MUL", "DIV", "MOD"))
+
+
+def _campos_leidos(t):
+    n = len(lecturas(t))
+    return ("arg1", "arg2")[:n]
+
+
+class _Redes:
+    """Union-find sobre las definiciones de temporales (un nodo por definición)."""
+
+    def __init__(self):
+        self.padre = []
+
+    def nuevo(self) -> int:
+        self.padre.append(len(self.padre))
+        return len(self.padre) - 1
+
+    def raiz(self, x) -> int:
+        padre = self.padre
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]
+            x = padre[x]
+        return x
+
+    def unir(self, a, b):
+        a, b = self.raiz(a), self.raiz(b)
+        if a != b:
+            self.padre[b] = a
+
+
+def _redes(bloques):
+    """
+    Devuelve (redes, definicion, usos, expuestas, limites):
+    definicion[pos] = nodo que define el triplo pos; usos[(pos, campo)] =
+    nodo de la red que lee; expuestas = nodos de redes que cruzan bloques;
+    limites[b] = (primera, última posición del bloque b).
+    """
+    redes = _Redes()
+    definicion = {}
+    usos = {}
+    pendientes = []         # (bloque, pos, campo, nombre): usos expuestos
+    nombre_de = []          # nodo -> temporal
+    limites = []
+    pos = 0
+    por_bloque = []         # nodos definidos en cada bloque, en orden
+    for b in bloques:
+        inicio = pos
+        ultimo = {}
+        propios = []
+        for t in b.triplos:
+            for campo in _campos_leidos(t):
+                x = getattr(t, campo)
+                if es_temporal(x):
+                    if x in ultimo:
+                        usos[(pos, campo)] = ultimo[x]
+                    else:
+                        pendientes.append((b.id, pos, campo, x))
+            d = destino(t)
+            if es_temporal(d):
+                n = redes.nuevo()
+                nombre_de.append(d)
+                definicion[pos] = n
+                ultimo[d] = n
+                propios.append(n)
+            pos += 1
+        limites.append((inicio, pos - 1))
+        por_bloque.append(propios)
+
+    expuestas = set()
+    if pendientes:
+        # Definiciones que llegan, solo de los temporales con usos expuestos
+        nombres = {x for _, _, _, x in pendientes}
+        cruzan = [n for n in range(len(nombre_de)) if nombre_de[n] in nombres]
+        bit = {n: 1 << k for k, n in enumerate(cruzan)}
+        mascara = {}
+        for n in cruzan:
+            mascara[nombre_de[n]] = mascara.get(nombre_de[n], 0) | bit[n]
+        gen, kill = [], []
+        for propios in por_bloque:
+            g = k = 0
+            for n in propios:
+                m = mascara.get(nombre_de[n])
+                if m is not None:
+                    g = (g & ~m) | bit[n]
+                    k |= m
+            gen.append(g)
+            kill.append(k)
+        entrada, _ = resolver(bloques, gen, kill)
+        for b, pos, campo, x in pendientes:
+            llegan = elementos(entrada[b] & mascara[x], cruzan)
+            if not llegan:
+                continue                # sin definición: se queda en memoria
+            for n in llegan[1:]:
+                redes.unir(llegan[0], n)
+            usos[(pos, campo)] = llegan[0]
+            expuestas.add(llegan[0])
+    return redes, definicion, usos, {redes.raiz(n) for n in expuestas}, limites
+
+
+def _intervalos(bloques, redes, definicion, usos, expuestas, limites):
+    """
+    red -> [inicio, fin, empieza_definiendo, termina_leyendo] (posiciones
+    de triplos). Los dos indicadores dicen si la red nace en un triplo que
+    la escribe y muere en uno que solo la lee: entonces otra red puede
+    tomar su registro en ese mismo triplo (se lee antes de escribir).
+    """
+    intervalo = {}
+    definida_en = {}        # red -> posiciones donde se escribe
+    for pos, n in definicion.items():
+        r = redes.raiz(n)
+        definida_en.setdefault(r, set()).add(pos)
+        iv = intervalo.get(r)
+        if iv is None:
+            intervalo[r] = [pos, pos, True, False]
+        else:
+            iv[0] = min(iv[0], pos)
+            iv[1] = max(iv[1], pos)
+    leida_en = {}
+    for (pos, _), n in usos.items():
+        r = redes.raiz(n)
+        leida_en.setdefault(r, set()).add(pos)
+        iv = intervalo[r]
+        iv[0] = min(iv[0], pos)
+        iv[1] = max(iv[1], pos)
+
+    if expuestas:
+        # Liveness de las redes que cruzan bloques
+        cruzan = sorted(expuestas)
+        bit = {r: 1 << k for k, r in enumerate(cruzan)}
+        gen, kill = [], []
+        for b, (inicio, fin) in zip(bloques, limites):
+            usa = define = 0
+            for pos in range(inicio, fin + 1):
+                for campo in ("arg1", "arg2"):
+                    n = usos.get((pos, campo))
+                    if n is not None:
+                        k = bit.get(redes.raiz(n), 0)
+                        if not define & k:
+                            usa |= k
+                n = definicion.get(pos)
+                if n is not None:
+                    define |= bit.get(redes.raiz(n), 0)
+            gen.append(usa)
+            kill.append(define)
+        entrada, salida = resolver(bloques, gen, kill, adelante=False)
+        for b, (inicio, fin) in enumerate(limites):
+            for r in elementos(entrada[b], cruzan):
+                intervalo[r][0] = min(intervalo[r][0], inicio)
+            for r in elementos(salida[b], cruzan):
+                intervalo[r][1] = max(intervalo[r][1], fin + 1)    # sigue viva después
+
+    for r, iv in intervalo.items():
+        leida = leida_en.get(r, ())
+        definida = definida_en.get(r, ())
+        iv[2] = iv[0] in definida and iv[0] not in leida
+        iv[3] = iv[1] in leida and iv[1] not in definida
+    return intervalo
+
+
+def _linear_scan(intervalo, usan_bl):
+    """
+    red -> registro (las que no están quedan en memoria). usan_bl[p]:
+    cuántos MUL/DIV/MOD hay antes de la posición p.
+    """
+    asignado = {}
+    activos = []            # (fin, red)
+    libres = list(reversed(REGISTROS))     # pila: se reusa el último liberado
+    for r, (inicio, fin, nace, _) in sorted(intervalo.items(), key=lambda kv: (kv[1][0], kv[1][1])):
+        quedan = []
+        for f, a in activos:
+            if f < inicio or (f == inicio and nace and intervalo[a][3]):
+                libres.append(asignado[a])
+            else:
+                quedan.append((f, a))
+        activos = quedan
+
+        cruza_bl = usan_bl[max(fin, inicio + 1)] - usan_bl[inicio + 1] > 0
+        permitidos = [x for x in libres if not (cruza_bl and x == "BX")]
+        if permitidos:
+            reg = permitidos[-1]
+            libres.remove(reg)
+        else:
+            # Sin registro: a memoria el que termine más tarde
+            candidatos = [(f, a) for f, a in activos if not (cruza_bl and asignado[a] == "BX")]
+            if not candidatos:
+                continue
+            f, a = max(candidatos)
+            if f <= fin:
+                continue
+            reg = asignado.pop(a)
+            activos.remove((f, a))
+        asignado[r] = reg
+        activos.append((fin, r))
+    return asignado
+
+
+def asignar_registros(triplos):
+    """Copia de los triplos con los temporales en registros donde se pudo."""
+    triplos = list(triplos)
+    bloques = construir_cfg(triplos)
+    redes, definicion, usos, expuestas, limites = _redes(bloques)
+    intervalo = _intervalos(bloques, redes, definicion, usos, expuestas, limites)
+
+    usan_bl = [0]
+    for t in triplos:
+        usan_bl.append(usan_bl[-1] + (t.op in _USAN_BL))
+    usan_bl.append(usan_bl[-1])
+    asignado = _linear_scan(intervalo, usan_bl)
+
+    resultado = []
+    for pos, t in enumerate(triplos):
+        a1, a2, res = t.arg1, t.arg2, t.res
+        n = usos.get((pos, "arg1"))
+        if n is not None:
+            a1 = asignado.get(redes.raiz(n), a1)
+        n = usos.get((pos, "arg2"))
+        if n is not None:
+            a2 = asignado.get(redes.raiz(n), a2)
+        n = definicion.get(pos)
+        if n is not None:
+            res = asignado.get(redes.raiz(n), res)
+        resultado.append(Triplo(t.idx, t.op, a1, a2, res))
+    return resultado
@@ -0,0 +1,333 @@
+# simulador.py
+"""
+Simulador 8086 del ensamblador que genera ensamblador.py, con el costo en
+ciclos de reloj de cada instrucción.
+
+    asm = compile_source(codigo, optimizar=True).asm
+    sim = simular(asm)
+    sim.variables       # {"$1A": 7, ...} (palabras de 16 bits, con signo)
+    sim.ciclos          # ciclos de reloj estimados
+    sim.instrucciones   # instrucciones ejecutadas
+    sim.por_instruccion # {"MOV": 812, "ADD": 120, ...}
+
+    python -m compilador programa.txt -O --simular
+
+Cubre lo que emite el backend: MOV, ADD, SUB, CMP, MUL, DIV, JMP y los
+saltos condicionales, etiquetas y variables en memoria ($1A, t1: una
+palabra cada una, en direcciones pares). Los comentarios se ignoran.
+Un acceso de 8 bits a memoria (MOV $x, AL) toca el byte bajo, como en el
+8086. Los reales y las cadenas no existen en el 8086: un programa que los
+usa no se puede simular (ErrorSimulacion).
+
+Ciclos: los del manual de Intel (8086 Family User's Manual, tabla de
+tiempos de instrucción), con direccionamiento directo (EA = 6 ciclos):
+
+    MOV  reg,reg 2 | reg,inm 4 | reg,mem 8+EA | mem,reg 9+EA
+         AX/AL <-> mem 10 (forma del acumulador)
+    ADD/SUB  reg,reg 3 | reg,inm 4 | reg,mem 9+EA | mem,reg 16+EA | mem,inm 17+EA
+    CMP  reg,reg 3 | reg,inm 4 | reg,mem 9+EA | mem,reg 9+EA | mem,inm 10+EA
+    MUL  reg8 70-77 | mem8 (76-83)+EA | reg16 118-133
+    DIV  reg8 80-90 | mem8 (86-96)+EA | reg16 144-162
+    Jcc  16 si salta, 4 si no | JMP 15
+
+MUL y DIV dependen de los datos; se usa el punto medio de cada rango.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+EA = 6
+
+_REG16 = ("AX", "BX", "CX", "DX", "SI", "DI")
+# registro de 8 bits -> (índice del de 16, parte: 1 = bajo, 2 = alto)
+_REG8 = {x + s: (i, 1 if s == "L" else 2) for i, x in enumerate("ABCD") for s in "LH"}
+
+_CONDICIONES = {
+    "JE": lambda z, s, c, o: z, "JZ": lambda z, s, c, o: z,
+    "JNE": lambda z, s, c, o: not z, "JNZ": lambda z, s, c, o: not z,
+    "JG": lambda z, s, c, o: not z and s == o, "JNLE": lambda z, s, c, o: not z and s == o,
+    "JGE": lambda z, s, c, o: s == o, "JNL": lambda z, s, c, o: s == o,
+    "JL": lambda z, s, c, o: s != o, "JNGE": lambda z, s, c, o: s != o,
+    "JLE": lambda z, s, c, o: z or s != o, "JNG": lambda z, s, c, o: z or s != o,
+    "JA": lambda z, s, c, o: not c and not z, "JAE": lambda z, s, c, o: not c,
+    "JB": lambda z, s, c, o: c, "JBE": lambda z, s, c, o: c or z,
+}
+
+
+class ErrorSimulacion(Exception):
+    """Instrucción u operando que el 8086 no puede ejecutar, INT 0, límite de pasos..."""
+
+
+@dataclass
+class Simulacion:
+    variables: Dict[str, int] = field(default_factory=dict)
+    registros: Dict[str, int] = field(default_factory=dict)
+    instrucciones: int = 0
+    ciclos: int = 0
+    por_instruccion: Dict[str, int] = field(default_factory=dict)
+    segundos: float = 0.0
+
+
+class _Operando:
+    """Registro, memoria o inmediato. casilla/parte: dónde vive (parte 0 = palabra)."""
+    __slots__ = ("tipo", "casilla", "parte", "valor", "texto")
+
+    def __init__(self, tipo, casilla=0, parte=0, valor=0, texto=""):
+        self.tipo, self.casilla, self.parte, self.valor, self.texto = tipo, casilla, parte, valor, texto
+
+    def leer(self, m):
+        if self.tipo == "inm":
+            return self.valor
+        v = m[self.casilla]
+        if self.parte == 0:
+            return v
+        return v & 0xFF if self.parte == 1 else v >> 8
+
+    def escribir(self, m, v):
+        i = self.casilla
+        if self.parte == 0:
+            m[i] = v
+        elif self.parte == 1:
+            m[i] = (m[i] & 0xFF00) | v
+        else:
+            m[i] = (m[i] & 0x00FF) | (v << 8)
+
+
+def _signo(v, bits=16):
+    return v - (1 << bits) if v >> (bits - 1) else v
+
+
+class Programa8086:
+    """El asm decodificado una vez (etiquetas resueltas, costo por instrucción)."""
+
+    def __init__(self, asm: List[str]):
+        self._casilla = {x: i for i, x in enumerate(_REG16)}
+        lineas = []
+        destinos = {}
+        for texto in asm:
+            texto = texto.strip()
+            if not texto or texto.startswith(";"):
+                continue
+            if texto.endswith(":") and " " not in texto:
+                destinos[texto[:-1]] = len(lineas)
+                continue
+            lineas.append(texto)
+
+        self.m: List[int] = []              # registros + variables (se llena al final)
+        self.banderas = [False, False, False, False]     # ZF, SF, CF, OF
+        self.codigo = []
+        self.costo: List[int] = []
+        self.mnemonico: List[str] = []
+        self.saltos: List[int] = []         # veces que se tomó cada salto condicional
+        for texto in lineas:
+            inst, _, resto = texto.partition(" ")
+            ops = resto.split(", ") if resto else []
+            pc = len(self.codigo)
+            f, costo = self._decodificar(inst, ops, pc, destinos, texto)
+            self.codigo.append(f)
+            self.costo.append(costo)
+            self.mnemonico.append(inst)
+        self.saltos.extend([0] * len(self.codigo))
+        self.m.extend([0] * len(self._casilla))
+
+    # -- operandos -------------------------------------------------------
+    def _operando(self, texto, bits):
+        if texto in _REG16:
+            return _Operando("reg", self._casilla[texto], 0, texto=texto)
+        if texto in _REG8:
+            i, parte = _REG8[texto]
+            return _Operando("reg", i, parte, texto=texto)
+        if texto[0] == "$" or (texto[0] == "t" and texto[1:].isdigit()):
+            i = self._casilla.setdefault(texto, len(self._casilla))
+            return _Operando("mem", i, 0 if bits == 16 else 1, texto=texto)
+        try:
+            v = int(texto)
+        except ValueError:
+            raise ErrorSimulacion(f"el 8086 no tiene este tipo de dato: {texto}") from None
+        if not -(1 << (bits - 1)) <= v < (1 << bits):
+            raise ErrorSimulacion(f"el inmediato {v} no cabe en {bits} bits")
+        return _Operando("inm", valor=v & ((1 << bits) - 1), texto=texto)
+
+    @staticmethod
+    def _bits(ops):
+        return 8 if any(x in _REG8 for x in ops) else 16
+
+    def _decodificar(self, inst, ops, pc, destinos, texto):
+        m = self.m
+        sig = pc + 1
+        if inst == "JMP" or inst in _CONDICIONES:
+            if len(ops) != 1 or ops[0] not in destinos:
+                raise ErrorSimulacion(f"etiqueta no definida: {texto}")
+            salto = destinos[ops[0]]
+            if inst == "JMP":
+                return (lambda: salto), 15
+            cond, b, tomados = _CONDICIONES[inst], self.banderas, self.saltos
+
+            def f():
+                if cond(*b):
+                    tomados[pc] += 1
+                    return salto
+                return sig
+            return f, 4
+
+        bits = self._bits(ops)
+        if inst == "MOV" and len(ops) == 2:
+            d, s = self._operando(ops[0], bits), self._operando(ops[1], bits)
+            costo = _costo_mov(d, s)
+            if d.tipo == "inm":
+                raise ErrorSimulacion(f"destino inválido: {texto}")
+            if d.parte == 0 and s.tipo == "inm":
+                i, v = d.casilla, s.valor
+
+                def f():
+                    m[i] = v
+                    return sig
+            elif d.parte == 0 and s.parte == 0:
+                i, j = d.casilla, s.casilla
+
+                def f():
+                    m[i] = m[j]
+                    return sig
+            else:
+                def f():
+                    d.escribir(m, s.leer(m))
+                    return sig
+            return f, costo
+
+        if inst in ("ADD", "SUB", "CMP") and len(ops) == 2:
+            d, s = self._operando(ops[0], bits), self._operando(ops[1], bits)
+            if d.tipo == "inm":
+                raise ErrorSimulacion(f"destino inválido: {texto}")
+            mascara, signo = (1 << bits) - 1, 1 << (bits - 1)
+            b = self.banderas
+            suma, guarda = inst == "ADD", inst != "CMP"
+
+            def f():
+                x, y = d.leer(m), s.leer(m)
+                if suma:
+                    r = x + y
+                    b[2] = r > mascara
+                    r &= mascara
+                    b[3] = bool((x ^ r) & (y ^ r) & signo)
+                else:
+                    r = (x - y) & mascara
+                    b[2] = x < y
+                    b[3] = bool((x ^ y) & (x ^ r) & signo)
+                b[0] = r == 0
+                b[1] = bool(r & signo)
+                if guarda:
+                    d.escribir(m, r)
+                return sig
+            return f, _costo_alu(inst, d, s)
+
+        if inst in ("MUL", "DIV") and len(ops) == 1:
+            s = self._operando(ops[0], bits)
+            if s.tipo == "inm":
+                raise ErrorSimulacion(f"{inst} no acepta inmediatos: {texto}")
+            b = self.banderas
+            if inst == "MUL":
+                if bits == 8:
+                    def f():
+                        r = (m[0] & 0xFF) * s.leer(m)
+                        m[0] = r
+                        b[2] = b[3] = r > 0xFF
+                        return sig
+                else:
+                    def f():
+                        r = m[0] * s.leer(m)
+                        m[0], m[3] = r & 0xFFFF, r >> 16
+                        b[2] = b[3] = r > 0xFFFF
+                        return sig
+            else:
+                if bits == 8:
+                    def f():
+                        y = s.leer(m)
+                        if y == 0 or m[0] // y > 0xFF:
+                            raise ErrorSimulacion(f"INT 0 (división) en: {texto}")
+                        q, r = divmod(m[0], y)
+                        m[0] = (r << 8) | q
+                        return sig
+                else:
+                    def f():
+                        y = s.leer(m)
+                        x = (m[3] << 16) | m[0]
+                        if y == 0 or x // y > 0xFFFF:
+                            raise ErrorSimulacion(f"INT 0 (división) en: {texto}")
+                        m[0], m[3] = divmod(x, y)
+                        return sig
+            return f, _costo_muldiv(inst, s, bits)
+
+        raise ErrorSimulacion(f"instrucción no soportada: {texto}")
+
+    # -- ejecución -------------------------------------------------------
+    def simular(self, limite=None) -> Simulacion:
+        """Ejecuta desde el principio con registros, memoria y banderas en 0."""
+        m = self.m
+        m[:] = [0] * len(m)
+        self.banderas[:] = [False] * 4
+        tomados = self.saltos
+        tomados[:] = [0] * len(tomados)
+        codigo = self.codigo
+        fin = len(codigo)
+        veces = [0] * (fin + 1)
+        pc = 0
+        inicio = time.perf_counter()
+        if limite is None:
+            while pc < fin:
+                veces[pc] += 1
+                pc = codigo[pc]()
+        else:
+            pasos = 0
+            while pc < fin:
+                veces[pc] += 1
+                pasos += 1
+                if pasos > limite:
+                    raise ErrorSimulacion(f"se pasó el límite de {limite} instrucciones")
+                pc = codigo[pc]()
+        segundos = time.perf_counter() - inicio
+
+        ciclos = 0
+        por_instruccion: Dict[str, int] = {}
+        for k, (n, costo, inst) in enumerate(zip(veces, self.costo, self.mnemonico)):
+            if n:
+                ciclos += n * costo + tomados[k] * 12     # salto tomado: 16 en vez de 4
+                por_instruccion[inst] = por_instruccion.get(inst, 0) + n
+        variables = {x: _signo(m[i]) for x, i in self._casilla.items() if x[0] == "$"}
+        registros = {x: m[i] for i, x in enumerate(_REG16)}
+        return Simulacion(variables, registros, sum(veces), ciclos, por_instruccion, segundos)
+
+
+def _costo_mov(d, s) -> int:
+    if d.tipo == "reg" and s.tipo == "reg":
+        return 2
+    if s.tipo == "inm":
+        return 4 if d.tipo == "reg" else 10 + EA
+    acumulador = (d if d.tipo == "reg" else s).texto in ("AX", "AL")
+    if acumulador:
+        return 10
+    return 8 + EA if d.tipo == "reg" else 9 + EA
+
+
+def _costo_alu(inst, d, s) -> int:
+    if d.tipo == "reg":
+        if s.tipo == "reg":
+            return 3
+        return 4 if s.tipo == "inm" else 9 + EA
+    if s.tipo == "inm":
+        return (10 if inst == "CMP" else 17) + EA
+    return (9 if inst == "CMP" else 16) + EA
+
+
+def _costo_muldiv(inst, s, bits) -> int:
+    if inst == "MUL":
+        base = 74 if bits == 8 else 126          # 70-77 / 118-133
+        memoria = 80 if bits == 8 else 132       # (76-83) / (124-139)
+    else:
+        base = 85 if bits == 8 else 153          # 80-90 / 144-162
+        memoria = 91 if bits == 8 else 159       # (86-96) / (150-168)
+    return base if s.tipo == "reg" else memoria + EA
+
+
+def simular(asm: List[str], limite=None) -> Simulacion:
+    """Decodifica y simula una vez (ver Programa8086 para simular varias)."""
+    return Programa8086(asm).simular(limite)
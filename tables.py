@@ -41,39 +41,90 @@ def _normalize_arrows(desc: str) -> str:
     return _ARROW_IN_PATTERN.sub(_flip, desc or "")
 
 class ErrorTable:
+    """
+    Índices para que nada sea cuadrático con muchos errores:
+      - _errors : serial -> error (dict, preserva orden de inserción)
+      - _keys   : (Lexema, Renglón, Descripción) -> serial   (dedup O(1))
+      - _lines  : Renglón -> [serial, ...]                 (borrado por línea)
+    """
     def __init__(self):
-        self.errors = []
+        self._errors = {}
+        self._keys = {}
+        self._lines = {}
+        self._serial = 0
         self.counter = 0
 
     def clear(self):
-        self.errors.clear()
+        self._errors.clear()
+        self._keys.clear()
+        self._lines.clear()
+        self._serial = 0
         self.counter = 0
 
     def _next_code(self):
         self.counter += 1
         return f"ES{self.counter}"
 
+    def _index(self, e):
+        self._serial += 1
+        self._errors[self._serial] = e
+        self._keys[(e['Lexema'], e['Renglón'], e['Descripción'])] = self._serial
+        self._lines.setdefault(e['Renglón'], []).append(self._serial)
+
+    @property
+    def errors(self):
+        # Tupla en orden de inserción (compatibilidad con código que la lee).
+        # Es de solo lectura a propósito: un .append()/.remove() sobre una
+        # copia no cambiaría la tabla, así falla en vez de no hacer nada.
+        # Para modificar: add(), remove_line_errors() o asignar errors = [...]
+        return tuple(self._errors.values())
+
+    @errors.setter
+    def errors(self, errors):
+        # Reemplazo completo (compatibilidad): reconstruye índices, conserva counter
+        self._errors.clear()
+        self._keys.clear()
+        self._lines.clear()
+        for e in errors:
+            self._index(e)
+
     def add(self, token, lexema, renglon, descripcion):
         # Normaliza flechas en la descripción
         descripcion = _normalize_arrows(descripcion)
 
         # Evitar duplicados exactos
-        for e in self.errors:
-            if (e['Lexema'] == lexema and
-                e['Renglón'] == renglon and
-                e['Descripción'] == descripcion):
-                return
+        if (lexema, renglon, descripcion) in self._keys:
+            return
         code = token or self._next_code()
-        self.errors.append({
+        self._index({
             "Token": code,
             "Lexema": lexema,
             "Renglón": renglon,
             "Descripción": descripcion
         })
 
+    def remove_line_errors(self, renglon, except_lexema=None):
+        """
+        Quita los errores del renglón cuyo Lexema sea distinto de except_lexema
+        (errores colaterales). Solo recorre los errores de esa línea.
+        """
+        serials = self._lines.pop(renglon, None)
+        if not serials:
+            return
+        keep = []
+        for serial in serials:
+            e = self._errors[serial]
+            if e['Lexema'] == except_lexema:
+                keep.append(serial)
+            else:
+                del self._errors[serial]
+                del self._keys[(e['Lexema'], e['Renglón'], e['Descripción'])]
+        if keep:
+            self._lines[renglon] = keep
+
     def rows(self):
         return [(e['Token'], e['Lexema'], e['Renglón'], e['Descripción'])
-                for e in self.errors]
+                for e in self._errors.values()]
 
 
 # ---------------------------
@@ -91,6 +142,23 @@ class LexemeTable:
         if lexema not in self.items:
             self.items[lexema] = tipo
 
+    def add_token(self, tok):
+        """Registra un token del lexer (omite reservadas cat/cats/meow y for)."""
+        if tok.type in ("TIPO", "FOR"):
+            return
+
+        lex = tok.value if tok.type == 'CADENA' else str(tok.value)
+
+        t = None
+        if tok.type == 'CADENA':
+            t = 'meow'
+        elif tok.type == 'ENTERO':
+            t = 'cat'
+        elif tok.type == 'REAL':
+            t = 'cats'
+
+        self.add(lex, t)
+
     def set_type_if_id(self, lexema, tipo):
         if lexema in self.items:
             self.items[lexema] = tipo
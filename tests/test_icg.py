@@ -0,0 +1,18 @@
+# tests/test_icg.py
+import pytest
+
+from icg import OPCODES, TriploTable, opcode
+
+
+def test_opcode_fijo():
+    assert OPCODES[opcode("MUL")] == "MUL"
+    with pytest.raises(ValueError):
+        opcode("XOR")
+    assert "XOR" not in OPCODES
+
+
+def test_append_opcode_desconocido():
+    tabla = TriploTable()
+    with pytest.raises(ValueError):
+        tabla.add("XOR", arg1="1", arg2="2", res="T1")
+    assert len(tabla.triplos) == 0
@@ -0,0 +1,25 @@
+# tests/test_optimizacion.py
+"""-O no cambia lo que hace el programa (ver verificar_optimizacion.py)."""
+import pytest
+
+from generador import generar_programa
+from verificar_optimizacion import CASOS, VARIANTES, diferencias
+
+SEMILLAS = range(50)
+
+
+@pytest.mark.parametrize("codigo", CASOS)
+def test_casos(codigo):
+    sin_comparar = []
+    assert diferencias(codigo, True, sin_comparar) == []
+    # Las regresiones tienen que ejecutarse de verdad, no saltarse
+    assert sin_comparar == []
+
+
+@pytest.mark.parametrize("semilla", SEMILLAS)
+@pytest.mark.parametrize("simulando, parametros",
+                         [v[1:] for v in VARIANTES], ids=[v[0].strip() or "todos" for v in VARIANTES])
+def test_generados(semilla, simulando, parametros):
+    codigo = generar_programa(40, semilla=semilla, **parametros)
+    assert diferencias(codigo, simulando) == []
+
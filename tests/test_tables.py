@@ -0,0 +1,15 @@
+# tests/test_tables.py
+import pytest
+
+from tables import ErrorTable
+
+
+def test_errors_solo_lectura():
+    tabla = ErrorTable()
+    tabla.add(None, "$1A", 1, "Variable indefinida")
+    with pytest.raises(AttributeError):
+        tabla.errors.append(("x", "y", 2, "z"))
+    assert len(tabla.errors) == 1
+    # Reemplazar la tabla sí se puede
+    tabla.errors = []
+    assert tabla.errors == ()
@@ -0,0 +1,144 @@
+# verificar_optimizacion.py
+"""
+Verificación diferencial de -O: el programa optimizado tiene que hacer lo
+mismo que el original.
+
+    python verificar_optimizacion.py                   # 200 semillas
+    python verificar_optimizacion.py --programas 2000 --semilla 500
+
+Para cada semilla se generan dos programas (generador.py) y se compilan
+sin y con -O:
+
+  - uno con cat, cats y meow: los triplos de ambos se ejecutan en
+    interprete.py y las variables finales tienen que ser iguales, también
+    en el tipo (3 no es lo mismo que 3.0);
+  - dos solo con cat: además el ensamblador de ambos se ejecuta en
+    simulador.py (los registros de 16 bits, MUL BL, DIV BL...) y también
+    tiene que dar las mismas variables. Un ensamblador que el 8086 no
+    puede ejecutar (MOV BL, 300) cuenta como diferencia. El segundo usa
+    literales hasta 255, así los productos pasan de 32767 (en el 8086 ya
+    son negativos), y no divide (DIV BL se desbordaría con INT 0).
+Los programas con / llevan divisiones repetidas guardadas en una cats y
+en una cat (generador.py, mezclas).
+
+Si el programa sin -O no termina (límite de pasos, INT 0...), no hay con
+qué comparar y se cuenta aparte ("sin comparar").
+
+Antes se corren los programas de CASOS (regresiones conocidas).
+Código de salida 1 si algún programa no coincide.
+"""
+import argparse
+import sys
+
+from compilador import compile_source
+from generador import generar_programa
+from interprete import ErrorEjecucion, ejecutar
+from simulador import ErrorSimulacion, simular
+
+LIMITE = 1_000_000      # instrucciones por ejecución
+
+# Regresiones: programas que alguna vez dieron otro resultado con -O
+CASOS = (
+    # constante 300 propagada a MUL: MOV BL, 300 (no cabe en BL)
+    "cat $1A; cat $2B; cat $3C; $1A = 300; $3C = $2B + 2; $2B = $3C * $1A;",
+    # copia del literal 1704 (71 * 24 plegado) propagada a MUL: MOV AL, 1704
+    "cat $1A; $1A = 71 * 24 * 45;",
+    # MOD guardado como byte (MOV t2, AH): el byte alto dependía de la casilla
+    "cat $1B; cat $4E; $1B = 7 * 55; $4E = $1B % 6;",
+    # OP directo a una variable cats (sin :=): tiene que quedar real
+    "cat $2C; cats $6G; $6G = $2C + 3; $6G = $6G / 2;",
+    # CSE: $4Y (cat) reusaba el 3.0 guardado en $1X (cats)
+    "cats $1X; cat $2A; cat $3B; cat $4Y; cat $5I; cat $6Z; $3B = 1;"
+    " for ($5I = 1; $5I < 4; $5I = $5I + 1;) { $2A = $5I; }"
+    " $1X = $2A / $3B; $4Y = $2A / $3B; $6Z = $4Y / 2;",
+    # comparación plegada sin signo: 40000 > 5, pero en el 8086 es -25536
+    "cat $1A; cat $2B; $1A = 200 * 200; if ($1A > 5) { $2B = 1; } else { $2B = 2; }",
+)
+
+# Parámetros del generador para cada programa de una semilla: (nombre, se
+# simula, parámetros)
+VARIANTES = (
+    ("", False, {"mezclas": 0.1}),
+    (" (cat)", True, {"tipos": ("cat",), "mezclas": 0.1}),
+    (" (cat, grandes)", True, {"tipos": ("cat",), "literales": 256, "divisiones": False}),
+)
+
+
+def _interpretar(res):
+    try:
+        return ejecutar(res.triplos.triplos, dict(res.symbols), limite=LIMITE).variables
+    except ErrorEjecucion as e:
+        return e
+
+
+def _simular(res):
+    try:
+        return simular(res.asm, limite=LIMITE).variables
+    except ErrorSimulacion as e:
+        return e
+
+
+def diferencias(codigo: str, simulando: bool, sin_comparar=None) -> list:
+    """Descripciones de lo que cambia con -O (lista vacía si nada).
+
+    Si se da la lista `sin_comparar`, se le agrega el nombre de cada
+    ejecución ("interprete", "simulador") que no se pudo comparar.
+    """
+    sin = compile_source(codigo, lexico="dfa")
+    con = compile_source(codigo, lexico="dfa", optimizar=True)
+    if sin.errors:
+        return []               # con errores no se ejecuta
+    salida = []
+    comparaciones = [("interprete", _interpretar)]
+    if simulando:
+        comparaciones.append(("simulador", _simular))
+    for nombre, correr in comparaciones:
+        a, b = correr(sin), correr(con)
+        if isinstance(a, Exception):
+            # El original no termina (p.ej. el límite): no hay con qué comparar
+            if sin_comparar is not None:
+                sin_comparar.append(nombre)
+            continue
+        if isinstance(b, Exception):
+            salida.append(f"{nombre}: con -O falla: {b}")
+            continue
+        for x in sorted(a):
+            # -O puede quitar todas las referencias a una variable: en el
+            # 8086 se queda con el 0 inicial de la memoria
+            valor = b.get(x, 0)
+            if (type(a[x]), a[x]) != (type(valor), valor):
+                salida.append(f"{nombre}: {x} = {a[x]!r} sin -O, {valor!r} con -O")
+    return salida
+
+
+def verificar(programas: int, semilla: int, asignaciones: int) -> int:
+    """Corre CASOS y las semillas; imprime las diferencias y devuelve cuántos programas fallaron."""
+    malos = 0
+    sin_comparar = []
+    pruebas = [(f"caso {k + 1}", codigo, True) for k, codigo in enumerate(CASOS)]
+    for s in range(semilla, semilla + programas):
+        for sufijo, simulando, parametros in VARIANTES:
+            codigo = generar_programa(asignaciones, semilla=s, **parametros)
+            pruebas.append((f"semilla {s}{sufijo}", codigo, simulando))
+    for nombre, codigo, simulando in pruebas:
+        detalle = diferencias(codigo, simulando, sin_comparar)
+        if detalle:
+            malos += 1
+            print(f"{nombre}: " + "; ".join(detalle[:3]))
+    print(f"{len(pruebas)} programas, {malos} con diferencias "
+          f"({len(sin_comparar)} ejecuciones sin comparar)")
+    return malos
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python verificar_optimizacion.py",
+                                 description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--programas", type=int, default=200, help="semillas a probar")
+    ap.add_argument("--semilla", type=int, default=0, help="primera semilla")
+    ap.add_argument("--asignaciones", type=int, default=40, help="asignaciones por programa")
+    args = ap.parse_args(argv)
+    return 1 if verificar(args.programas, args.semilla, args.asignaciones) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())